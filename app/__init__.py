@@ -6,6 +6,9 @@ Input data: N/A
 Output data: Instance d'application Flask configurée
 Business constraints:
 - Utilise SQLite comme base de données stockée dans le dossier instance
+- Applique un profil de PRAGMA SQLite par environnement (SEMAINIER_ENV) à chaque connexion
+- Applique un profil Jinja par environnement (production : cache de bytecode dans instance,
+  sans rechargement des templates, précompilés au démarrage)
 - Initialise SQLAlchemy et Flask-Migrate pour la gestion de la base de données
 - Importe tous les modèles pour que Flask-Migrate puisse détecter les changements
 - Utilise un routeur central 
@@ -13,13 +16,25 @@ Business constraints:
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy import inspect as sa_inspect
 import os
 
 # Initialisation de la base de données
 db = SQLAlchemy()
 migrate = Migrate()
 
-def create_app():
+def create_app(config_name=None, test_config=None):
+    """
+    Crée et configure l'application.
+    
+    Args:
+        config_name (str, optional): Environnement (défaut : SEMAINIER_ENV, sinon 'development')
+        test_config (dict, optional): Surcharges de configuration appliquées avant
+                                      l'initialisation des extensions (ex. base en mémoire)
+    
+    Returns:
+        Flask: L'application configurée
+    """
     # Création de l'instance Flask
     app = Flask(__name__, instance_relative_config=True)
     
@@ -30,22 +45,68 @@ def create_app():
         pass
     
     # Configuration
+    from app.utils.db_utils import get_sqlite_pragmas, register_sqlite_pragmas, read_effective_pragmas
+    from app.utils.template_utils import get_template_profile, configure_templates, precompile_templates
+    
+    env_name = config_name or os.environ.get('SEMAINIER_ENV', 'development')
     app.config.from_mapping(
         SECRET_KEY='dev',
         SQLALCHEMY_DATABASE_URI=f'sqlite:///{os.path.join(app.instance_path, "semainier.sqlite")}',
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        SEMAINIER_ENV=env_name,
+        SQLITE_PRAGMAS=get_sqlite_pragmas(env_name),
+        TEMPLATE_PROFILE=get_template_profile(env_name),
+        TEMPLATE_BYTECODE_CACHE_DIR=os.path.join(app.instance_path, 'jinja_cache'),
+        # Délai (s) avant de revérifier la version des paramètres en cache (None = jamais)
+        SETTINGS_CACHE_TTL=5,
+        # Délai (s) avant de revérifier l'empreinte du catalogue listes/sous-listes (None = jamais)
+        CATALOG_CACHE_TTL=5,
+        # Ancienneté (semaines) de réalisation au-delà de laquelle une activité terminée
+        # est archivée, et nombre d'activités déplacées par transaction (flask activities archive)
+        ARCHIVE_AFTER_WEEKS=8,
+        ARCHIVE_BATCH_SIZE=500,
+        # Taille maximale (octets, par processus) du cache des rendus de listes (0 = désactivé)
+        FRAGMENT_CACHE_MAX_BYTES=32 * 1024 * 1024,
     )
+    # Surcharges locales éventuelles (instance/config.py)
+    app.config.from_pyfile('config.py', silent=True)
+    if test_config:
+        app.config.from_mapping(test_config)
+    
+    # Environnement Jinja (avant tout calcul dépendant du rechargement des templates)
+    configure_templates(app)
     
     # Initialisation des extensions avec l'application
     db.init_app(app)
     migrate.init_app(app, db)
+    
+    # Réglage de chaque nouvelle connexion SQLite
+    with app.app_context():
+        register_sqlite_pragmas(db.engine, app.config['SQLITE_PRAGMAS'])
+        if db.engine.dialect.name == 'sqlite':
+            effective = read_effective_pragmas(db.engine)
+            app.logger.info("SQLite [%s]: %s", env_name,
+                            ", ".join(f"{name}={value}" for name, value in effective.items()))
 
     # Import des modèles pour que Flask-Migrate les détecte
-    from app.models import List, Sublist, Activity, Settings, WeeklyGoal
+    from app.models import List, Sublist, Activity, Settings, WeeklyGoal, WeeklyLoad, ArchivedActivity, ActivitySearch, ListVersion
+    
+    # Réponses conditionnelles (ETag) des fragments HTML
+    from app.utils.http_cache_utils import init_http_cache
+    init_http_cache(app)
+    
+    # Cache des rendus de listes (fragments HTML)
+    from app.utils.fragment_cache_utils import init_fragment_cache
+    init_fragment_cache(app)
     
     # Enregistrement des routes centralisées via le routeur
     from app.routes import register_routes
     register_routes(app)
+    
+    # Enregistrement des commandes CLI (flask weekly-load ..., flask activities ..., flask search ...,
+    # flask templates ...)
+    from app.commands import register_commands
+    register_commands(app)
     """
     # Enregistrement des filtres personnalisés
     from app.utils.date_utils import format_time
@@ -56,10 +117,12 @@ def create_app():
     """
 
     # Initialisation des paramètres par défaut au démarrage de l'application
+    # (sauf si le schéma n'est pas encore créé : base neuve avant `flask db upgrade`)
     with app.app_context():
         # Vérifier si des paramètres existent déjà
-        settings = db.session.query(Settings).first()
-        if not settings:
+        schema_ready = sa_inspect(db.engine).has_table(Settings.__tablename__)
+        settings = db.session.query(Settings).first() if schema_ready else None
+        if schema_ready and not settings:
             # Créer des paramètres par défaut
             settings = Settings(
                 time_unit_minutes=30,
@@ -82,4 +145,8 @@ def create_app():
             'server_date_info': get_server_date_info()
         }
     
+    # Précompilation des templates : aucun template compilé lors du premier rendu du worker
+    if app.config['TEMPLATE_PROFILE'].get('precompile'):
+        precompile_templates(app)
+    
     return app
@@ -0,0 +1,116 @@
+"""
+File: app/commands.py
+Role: Commandes en ligne de commande de l'application (flask ...)
+Description: Enregistre les commandes de maintenance exécutées via la CLI Flask
+Input data: Application Flask
+Output data: Messages de console, code de sortie non nul en cas d'échec
+Business constraints:
+- Les commandes s'exécutent dans le contexte d'application (base configurée)
+- Aucune logique métier ici : les commandes délèguent aux modèles
+"""
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+weekly_load_cli = AppGroup('weekly-load', help="Maintenance des compteurs de charge hebdomadaire.")
+activities_cli = AppGroup('activities', help="Maintenance des activités.")
+search_cli = AppGroup('search', help="Maintenance de l'index de recherche des activités.")
+templates_cli = AppGroup('templates', help="Compilation des templates Jinja.")
+
+
+@weekly_load_cli.command('rebuild')
+def rebuild_weekly_load():
+    """Régénère la table weekly_load depuis les activités."""
+    from app.models.weekly_load import WeeklyLoad
+
+    weeks = WeeklyLoad.rebuild()
+    if weeks is None:
+        raise click.ClickException("Échec de la reconstruction de la charge hebdomadaire")
+    click.echo(f"Charge hebdomadaire reconstruite : {weeks} semaine(s)")
+
+
+@weekly_load_cli.command('check')
+def check_weekly_load():
+    """Compare la table weekly_load aux activités (code de sortie 1 si écart)."""
+    from app.models.weekly_load import WeeklyLoad
+
+    mismatches = WeeklyLoad.check()
+    if not mismatches:
+        click.echo("Charge hebdomadaire cohérente")
+        return
+
+    for mismatch in mismatches:
+        click.echo(f"{mismatch['week_start'].isoformat()}: enregistré {mismatch['stored']}, "
+                   f"attendu {mismatch['expected']}")
+    raise click.ClickException(f"{len(mismatches)} semaine(s) incohérente(s), "
+                               "lancer `flask weekly-load rebuild`")
+
+
+@activities_cli.command('archive')
+@click.option('--weeks', type=click.IntRange(min=0), default=None,
+              help="Ancienneté de réalisation en semaines (défaut : ARCHIVE_AFTER_WEEKS).")
+@click.option('--batch-size', type=click.IntRange(min=1), default=None,
+              help="Activités déplacées par transaction (défaut : ARCHIVE_BATCH_SIZE).")
+def archive_activities(weeks, batch_size):
+    """Archive les activités terminées depuis plus de N semaines (à planifier, ex. cron)."""
+    from app.models.archived_activity import ArchivedActivity
+
+    if weeks is None:
+        weeks = current_app.config['ARCHIVE_AFTER_WEEKS']
+    if batch_size is None:
+        batch_size = current_app.config['ARCHIVE_BATCH_SIZE']
+
+    archived = ArchivedActivity.archive_completed(ArchivedActivity.cutoff(weeks), batch_size)
+    if archived is None:
+        raise click.ClickException("Échec de l'archivage des activités terminées")
+    click.echo(f"{archived} activité(s) terminée(s) depuis plus de {weeks} semaine(s) archivée(s)")
+
+
+@search_cli.command('rebuild')
+def rebuild_search_index():
+    """Régénère l'index plein texte activities_fts depuis les activités, listes et sous-listes."""
+    from app.models.activity_search import ActivitySearch
+
+    indexed = ActivitySearch.rebuild()
+    if indexed is None:
+        raise click.ClickException("Échec de la reconstruction de l'index de recherche")
+    click.echo(f"Index de recherche reconstruit : {indexed} activité(s)")
+
+
+@templates_cli.command('compile')
+@click.option('--clear', is_flag=True, help="Vide le cache de bytecode avant la compilation.")
+def compile_templates(clear):
+    """Compile tous les templates (et remplit le cache de bytecode du profil, à lancer au déploiement)."""
+    from jinja2 import TemplateSyntaxError
+    from app.utils.template_utils import precompile_templates
+
+    env = current_app.jinja_env
+    bytecode_cache = env.bytecode_cache
+    if clear:
+        # Templates déjà chargés au démarrage (profil de production) : recompilés aussi
+        if env.cache is not None:
+            env.cache.clear()
+        if bytecode_cache is not None:
+            bytecode_cache.clear()
+
+    try:
+        compiled = precompile_templates(current_app)
+    except TemplateSyntaxError as e:
+        raise click.ClickException(f"{e.filename}:{e.lineno}: {e.message}")
+
+    target = current_app.config['TEMPLATE_BYTECODE_CACHE_DIR'] if bytecode_cache else "sans cache de bytecode"
+    click.echo(f"{compiled} template(s) compilé(s) ({target})")
+
+
+def register_commands(app):
+    """
+    Enregistre les commandes CLI de l'application.
+
+    Args:
+        app: L'application Flask
+    """
+    app.cli.add_command(weekly_load_cli)
+    app.cli.add_command(activities_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(templates_cli)
@@ -22,9 +22,73 @@ Contraintes:
 """
 
 from app.models.activity import Activity, DurationSize
+from app.models.activity_search import ActivitySearch
 from app.models.list import List
+from app.models.settings import Settings
 from app.models.sublist import Sublist
-from datetime import date, time
+from app.models.weekly_load import WeeklyLoad
+from app.utils.date_utils import get_week_bounds
+from app.utils.pagination_utils import decode_cursor, encode_cursor
+from app.utils.wip_utils import evaluate_wip_limit_status, get_wip_status_color
+from datetime import date, datetime, time, timedelta
+
+# Nombre maximal d'activités acceptées par création groupée
+MAX_BULK_ACTIVITIES = 500
+
+# Taille par défaut et taille maximale d'une page de la liste paginée
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Nombre par défaut et nombre maximal de résultats de recherche
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
+
+def _normalize_activity_data(data):
+    """
+    Convertit la durée et retire les dates vides des données d'une activité.
+    
+    Args:
+        data (dict): Données de l'activité (modifiées en place)
+    
+    Returns:
+        str: Message d'erreur, ou None si les données sont valides
+    """
+    if 'duration' in data:
+        try:
+            data['duration'] = DurationSize(data['duration'])
+        except ValueError:
+            return "Valeur de durée invalide (doit être S, M ou L)"
+    
+    if 'due_date' in data and (data['due_date'] == '' or data['due_date'] is None):
+        data.pop('due_date')
+        
+    if 'start_time' in data and (data['start_time'] == '' or data['start_time'] is None):
+        data.pop('start_time')
+    
+    return None
+
+def _parse_temporal_fields(data):
+    """
+    Convertit la date d'échéance et l'heure de début restées sous forme de chaîne.
+    
+    Args:
+        data (dict): Données de l'activité (modifiées en place)
+    
+    Returns:
+        str: Message d'erreur, ou None si les valeurs sont valides
+    """
+    for field, kind, error in (('due_date', date, "Date d'échéance invalide (format AAAA-MM-JJ)"),
+                               ('start_time', time, "Heure de début invalide (format HH:MM)")):
+        value = data.get(field)
+        if isinstance(value, str):
+            try:
+                data[field] = kind.fromisoformat(value)
+            except ValueError:
+                return error
+        elif value is not None and not isinstance(value, kind):
+            return error
+    
+    return None
 
 def get_activity(id):
     """
@@ -57,6 +121,213 @@ def get_activities(list_id=None, sublist_id=None, is_completed=None):
     """
     return Activity.get_filtered(list_id, sublist_id, is_completed)
 
+def get_activities_page(list_id=None, sublist_id=None, is_completed=None, cursor=None, limit=None):
+    """
+    Récupère une page d'activités filtrées, triées par échéance puis position.
+    
+    Le curseur est opaque pour le client : il suffit de renvoyer `next_cursor` pour
+    obtenir la page suivante, avec les mêmes filtres.
+    
+    Args:
+        list_id (int, optional): Filtre par liste parente
+        sublist_id (int, optional): Filtre par sous-liste
+        is_completed (bool, optional): Filtre par statut de complétion
+        cursor (str, optional): Curseur de continuation reçu avec la page précédente
+        limit (int, optional): Taille de page (DEFAULT_PAGE_SIZE par défaut, MAX_PAGE_SIZE au plus)
+        
+    Returns:
+        tuple: (succès, données/message)
+            - Si succès: (True, dict)
+                - activities: objets Activity de la page
+                - next_cursor: curseur de la page suivante ou None
+            - Si échec: (False, message d'erreur)
+    """
+    if limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        return False, "Taille de page invalide"
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return False, f"La taille de page doit être comprise entre 1 et {MAX_PAGE_SIZE}"
+    
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, (date, int, int))
+        except ValueError as e:
+            return False, str(e)
+    
+    activities, last_key = Activity.get_page(list_id, sublist_id, is_completed, after, limit)
+    
+    return True, {
+        "activities": activities,
+        "next_cursor": encode_cursor(last_key) if last_key else None
+    }
+
+def get_completed_history(list_id=None, date_from=None, date_to=None, include_archived=False, limit=None):
+    """
+    Récupère l'historique des activités terminées, les plus récentes en premier.
+    
+    Par défaut seules les activités courantes sont lues ; l'archive (activités terminées
+    depuis plus de ARCHIVE_AFTER_WEEKS semaines) n'est incluse que sur demande.
+    
+    Args:
+        list_id (int, optional): Filtre par liste parente
+        date_from (date, optional): Premier jour de réalisation inclus
+        date_to (date, optional): Dernier jour de réalisation inclus
+        include_archived (bool, optional): Inclut les activités archivées
+        limit (int, optional): Nombre maximal d'entrées (DEFAULT_PAGE_SIZE par défaut,
+                               MAX_PAGE_SIZE au plus)
+        
+    Returns:
+        tuple: (succès, données/message)
+            - Si succès: (True, liste de CompletedActivity)
+            - Si échec: (False, message d'erreur)
+    """
+    if limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        return False, "Nombre d'entrées invalide"
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return False, f"Le nombre d'entrées doit être compris entre 1 et {MAX_PAGE_SIZE}"
+    
+    bounds = []
+    for day in (date_from, date_to):
+        if day is not None and not isinstance(day, date):
+            return False, "Format de date invalide"
+        bounds.append(datetime.combine(day, time.min) if day is not None else None)
+    completed_from, completed_to = bounds
+    if completed_to is not None:
+        completed_to += timedelta(days=1)
+    
+    return True, Activity.get_completed(list_id, completed_from, completed_to,
+                                        bool(include_archived), limit)
+
+def search_activities(query, limit=None):
+    """
+    Recherche les activités courantes par mots du titre, de la sous-liste ou de la liste.
+    
+    Chaque mot saisi est cherché comme préfixe ; les résultats sont classés par pertinence
+    (index plein texte activities_fts). Les activités archivées ne sont pas cherchées.
+    
+    Args:
+        query (str): Saisie de l'utilisateur
+        limit (int, optional): Nombre maximal de résultats (DEFAULT_SEARCH_LIMIT par défaut,
+                               MAX_SEARCH_LIMIT au plus)
+        
+    Returns:
+        tuple: (succès, données/message)
+            - Si succès: (True, liste de SearchResult, vide si la saisie ne contient aucun mot)
+            - Si échec: (False, message d'erreur)
+    """
+    if limit is None:
+        limit = DEFAULT_SEARCH_LIMIT
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        return False, "Nombre de résultats invalide"
+    if not 1 <= limit <= MAX_SEARCH_LIMIT:
+        return False, f"Le nombre de résultats doit être compris entre 1 et {MAX_SEARCH_LIMIT}"
+    
+    return True, ActivitySearch.search(query, limit)
+
+def get_week_activities(reference_date=None):
+    """
+    Récupère les activités de la semaine réparties en sections prioritaire et standard.
+    
+    Args:
+        reference_date (date, optional): Date dans la semaine visée (aujourd'hui par défaut)
+        
+    Returns:
+        tuple: (succès, données/message)
+            - Si succès: (True, dict)
+                - week_start, week_end: bornes de la semaine (lundi, dimanche)
+                - priority: activités prioritaires (projections ActivityCard)
+                - standard: autres activités de la semaine
+            - Si échec: (False, message d'erreur)
+    """
+    try:
+        week_start, week_end = get_week_bounds(reference_date)
+    except ValueError:
+        return False, "Format de date invalide"
+    
+    priority, standard = [], []
+    for activity in Activity.get_week_cards(week_start, week_end):
+        (priority if activity.is_priority else standard).append(activity)
+    
+    return True, {
+        "week_start": week_start,
+        "week_end": week_end,
+        "priority": priority,
+        "standard": standard
+    }
+
+def get_week_stats(reference_date=None, include_archived=False):
+    """
+    Calcule les statistiques de charge des activités de la semaine (unités de temps, complétion).
+    
+    Les compteurs sont lus dans weekly_load (une lecture sur clé primaire), qui ne compte
+    que les activités courantes. Avec include_archived, les activités archivées de la
+    semaine sont ajoutées par une requête d'agrégation sur les deux tables. Le résultat
+    a le format de wip_utils.calculate_activities_stats et peut être passé à
+    wip_utils.evaluate_wip_limit_status.
+    
+    Args:
+        reference_date (date, optional): Date dans la semaine visée (aujourd'hui par défaut)
+        include_archived (bool, optional): Inclut les activités archivées (historique)
+        
+    Returns:
+        tuple: (succès, données/message)
+            - Si succès: (True, dict de statistiques)
+            - Si échec: (False, message d'erreur)
+    """
+    try:
+        week_start, week_end = get_week_bounds(reference_date)
+    except ValueError:
+        return False, "Format de date invalide"
+    
+    if include_archived:
+        return True, Activity.get_stats(week_start, week_end, include_archived=True)
+    return True, WeeklyLoad.get_stats(week_start)
+
+def get_wip_status(reference_date=None):
+    """
+    Évalue la charge de la semaine par rapport à la WIP limit des paramètres.
+    
+    Args:
+        reference_date (date, optional): Date dans la semaine visée (aujourd'hui par défaut)
+        
+    Returns:
+        tuple: (succès, données/message)
+            - Si succès: (True, dict)
+                - week_start, week_end: bornes de la semaine
+                - stats: statistiques de la semaine (voir get_week_stats)
+                - wip_limit: limite définie dans les paramètres
+                - status, percentage, color: évaluation (wip_utils.evaluate_wip_limit_status)
+            - Si échec: (False, message d'erreur)
+    """
+    try:
+        week_start, week_end = get_week_bounds(reference_date)
+    except ValueError:
+        return False, "Format de date invalide"
+    
+    stats = WeeklyLoad.get_stats(week_start)
+    wip_limit = Settings.get_cached().wip_limit
+    evaluation = evaluate_wip_limit_status(stats["total_time_units"], wip_limit)
+    
+    return True, {
+        "week_start": week_start,
+        "week_end": week_end,
+        "stats": stats,
+        "wip_limit": wip_limit,
+        "status": evaluation["status"],
+        "percentage": evaluation["percentage"],
+        "color": get_wip_status_color(evaluation["status"])
+    }
+
 def create_activity(data):
     """
     Crée une nouvelle activité.
@@ -92,19 +363,10 @@ def create_activity(data):
         if not Activity.validate_sublist_belongs_to_list(data['list_id'], data['sublist_id']):
             return False, "La sous-liste n'appartient pas à la liste spécifiée"
     
-    # Traitement de la durée
-    if 'duration' in data:
-        try:
-            data['duration'] = DurationSize(data['duration'])
-        except ValueError:
-            return False, "Valeur de durée invalide (doit être S, M ou L)"
-    
-    # Traitement des dates vides
-    if 'due_date' in data and (data['due_date'] == '' or data['due_date'] is None):
-        data.pop('due_date')
-        
-    if 'start_time' in data and (data['start_time'] == '' or data['start_time'] is None):
-        data.pop('start_time')
+    # Traitement de la durée et des dates vides
+    error = _normalize_activity_data(data)
+    if error:
+        return False, error
     
     # Création de l'activité
     activity = Activity.create(data)
@@ -113,6 +375,142 @@ def create_activity(data):
     
     return True, activity
 
+def create_activities(items):
+    """
+    Crée plusieurs activités en une seule transaction.
+    
+    Les couples liste/sous-liste de tout le lot sont validés avec une seule requête
+    par table, les dates et heures sont converties élément par élément. Les éléments
+    invalides sont signalés individuellement sans empêcher la création des autres.
+    
+    Args:
+        items (list): Dictionnaires de données (mêmes clés que create_activity)
+            
+    Returns:
+        tuple: (succès, données/message)
+            - Si succès: (True, liste de résultats dans l'ordre de `items`)
+                chaque résultat: {"index", "success", "activity" ou "error"}
+            - Si échec: (False, message d'erreur)
+    """
+    if not isinstance(items, list) or not items:
+        return False, "Une liste non vide d'activités est requise"
+    
+    if len(items) > MAX_BULK_ACTIVITIES:
+        return False, f"Un lot est limité à {MAX_BULK_ACTIVITIES} activités"
+    
+    # Chargement en une requête des listes et sous-listes référencées
+    dicts = [item for item in items if isinstance(item, dict)]
+    list_ids = {item.get('list_id') for item in dicts if isinstance(item.get('list_id'), int)}
+    sublist_ids = {item.get('sublist_id') for item in dicts if isinstance(item.get('sublist_id'), int)}
+    existing_lists = List.get_existing_ids(list_ids)
+    sublist_owners = Sublist.get_owners(sublist_ids)
+    
+    results = [None] * len(items)
+    valid_indexes = []
+    valid_items = []
+    for index, data in enumerate(items):
+        if not isinstance(data, dict):
+            error = "Format d'activité invalide"
+        elif not data.get('title') or 'list_id' not in data:
+            error = "Le titre et l'ID de la liste sont requis"
+        elif not isinstance(data['list_id'], int) or data['list_id'] not in existing_lists:
+            error = "La liste spécifiée n'existe pas"
+        elif data.get('sublist_id') and (not isinstance(data['sublist_id'], int)
+                                         or sublist_owners.get(data['sublist_id']) != data['list_id']):
+            error = "La sous-liste n'appartient pas à la liste spécifiée"
+        else:
+            data['sublist_id'] = data.get('sublist_id') or 0
+            error = _normalize_activity_data(data) or _parse_temporal_fields(data)
+        
+        if error:
+            results[index] = {"index": index, "success": False, "error": error}
+        else:
+            valid_indexes.append(index)
+            valid_items.append(data)
+    
+    if valid_items:
+        activities = Activity.create_many(valid_items)
+        if activities is None:
+            return False, "Erreur lors de la création des activités"
+        
+        for index, activity in zip(valid_indexes, activities):
+            results[index] = {"index": index, "success": True, "activity": activity}
+    
+    return True, results
+
+def reorder_activities(containers):
+    """
+    Applique le nouvel ordre d'un ou plusieurs conteneurs (glisser-déposer).
+    
+    Les déplacements entre sous-listes et entre listes sont appliqués en une seule
+    transaction. Les listes et la propriété des sous-listes cibles sont vérifiées avec
+    une seule requête pour tout le lot ; l'opération est annulée entièrement si un
+    élément est invalide.
+    
+    Args:
+        containers (list): Dictionnaires décrivant chaque conteneur cible
+            - list_id: ID de la liste cible (requis)
+            - sublist_id: ID de la sous-liste cible (0 ou absent = sans sous-liste)
+            - activity_ids: IDs des activités dans leur nouvel ordre (requis)
+            
+    Returns:
+        tuple: (succès, données/message)
+            - Si succès: (True, {"updated": nombre, "list_ids": listes concernées,
+                                 "containers": conteneurs [list_id, sublist_id] à rafraîchir})
+            - Si échec: (False, message d'erreur)
+    """
+    if not isinstance(containers, list) or not containers:
+        return False, "Une liste non vide de conteneurs est requise"
+    
+    targets = []
+    seen_containers = set()
+    seen_ids = set()
+    for container in containers:
+        if not isinstance(container, dict) or not isinstance(container.get('list_id'), int):
+            return False, "Chaque conteneur doit indiquer un ID de liste"
+        
+        sublist_id = container.get('sublist_id') or 0
+        activity_ids = container.get('activity_ids')
+        if not isinstance(sublist_id, int) or not isinstance(activity_ids, list) \
+                or not all(isinstance(id, int) for id in activity_ids):
+            return False, "Format de conteneur invalide"
+        
+        if (container['list_id'], sublist_id) in seen_containers:
+            return False, "Un conteneur ne peut apparaître qu'une seule fois"
+        if seen_ids.intersection(activity_ids) or len(set(activity_ids)) != len(activity_ids):
+            return False, "Une activité ne peut apparaître qu'une seule fois"
+        
+        seen_containers.add((container['list_id'], sublist_id))
+        seen_ids.update(activity_ids)
+        targets.append((container['list_id'], sublist_id, activity_ids))
+    
+    # Vérification groupée des listes et des sous-listes cibles
+    existing_lists = List.get_existing_ids(list_id for list_id, _, _ in targets)
+    sublist_owners = Sublist.get_owners(sublist_id for _, sublist_id, _ in targets if sublist_id)
+    for list_id, sublist_id, _ in targets:
+        if list_id not in existing_lists:
+            return False, "La liste spécifiée n'existe pas"
+        if sublist_id and sublist_owners.get(sublist_id) != list_id:
+            return False, "La sous-liste n'appartient pas à la liste spécifiée"
+    
+    activities = Activity.get_by_ids(seen_ids)
+    if len(activities) != len(seen_ids):
+        return False, "Activité non trouvée"
+    
+    # Listes et conteneurs à rafraîchir : cibles et origines des activités déplacées
+    list_ids = existing_lists | {activity.list_id for activity in activities.values()}
+    refreshed = {(list_id, sublist_id) for list_id, sublist_id, _ in targets}
+    refreshed.update((activity.list_id, activity.sublist_id or 0) for activity in activities.values())
+    
+    orderings = [(list_id, sublist_id, [activities[id] for id in activity_ids])
+                 for list_id, sublist_id, activity_ids in targets]
+    updated = Activity.apply_orderings(orderings)
+    if updated is None:
+        return False, "Erreur lors de la réorganisation des activités"
+    
+    return True, {"updated": updated, "list_ids": sorted(list_ids),
+                  "containers": [list(container) for container in sorted(refreshed)]}
+
 def update_activity(id, data):
     """
     Met à jour une activité existante.
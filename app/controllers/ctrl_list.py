@@ -27,6 +27,7 @@ from app import db
 from app.models.list import List
 from app.models.sublist import Sublist
 from app.models.activity import Activity
+from app.models.list_version import ListVersion
 
 def get_all_lists():
     """
@@ -37,6 +38,65 @@ def get_all_lists():
     """
     return List.query.order_by(List.name).all()
 
+def get_catalog():
+    """
+    Récupère le catalogue des listes et de leurs sous-listes pour les formulaires.
+    
+    Le catalogue est servi depuis un cache mémoire et ne charge aucune activité.
+    
+    Returns:
+        tuple: Entrées CatalogList (id, name, color_code, sublists) triées par nom
+    """
+    return List.get_catalog()
+
+def get_catalog_sublists(list_id):
+    """
+    Récupère les sous-listes d'une liste depuis le catalogue.
+    
+    Args:
+        list_id (int): Identifiant unique de la liste
+    
+    Returns:
+        tuple: (succès, données/message)
+            - Si succès: (True, sous-listes CatalogSublist, sous-liste virtuelle en tête)
+            - Si échec: (False, message d'erreur)
+    """
+    for entry in List.get_catalog():
+        if entry.id == list_id:
+            return True, entry.sublists
+    return False, "Liste non trouvée"
+
+def get_content_version(list_id=None):
+    """
+    Récupère le signal de version du contenu des listes (une requête, aucun rendu).
+    
+    Les versions sont tenues à jour par des déclencheurs SQLite sur les listes,
+    sous-listes et activités (voir ListVersion).
+    
+    Args:
+        list_id (int, optional): Identifiant d'une liste ; sans identifiant, version
+                                 globale de toutes les listes
+    
+    Returns:
+        int: Numéro de version, ou None si aucune version n'est enregistrée
+             (ex. liste inexistante)
+    """
+    if list_id is None:
+        return ListVersion.get_global() or None
+    return ListVersion.get_for_list(list_id) or None
+
+def get_content_versions(list_ids):
+    """
+    Récupère en une requête les versions du contenu de plusieurs listes.
+    
+    Args:
+        list_ids (iterable): Identifiants des listes
+    
+    Returns:
+        dict: {list_id: version, ou None si aucune version n'est enregistrée}
+    """
+    return {list_id: version or None for list_id, version in ListVersion.get_for_lists(list_ids).items()}
+
 def get_list(id):
     """
     Récupère une liste par son ID.
@@ -132,8 +192,10 @@ def delete_list(id):
         id (int): Identifiant unique de la liste à supprimer
     
     Returns:
-        tuple: (succès, message)
-            - Si succès: (True, message de confirmation)
+        tuple: (succès, données/message)
+            - Si succès: (True, {'message': confirmation,
+                                 'deleted': {'lists', 'sublists', 'activities',
+                                             'archived_activities'}})
             - Si échec: (False, message d'erreur)
     """
     list_obj = db.session.get(List, id)
@@ -143,16 +205,24 @@ def delete_list(id):
     # Récupérer le nom pour le message de confirmation
     list_name = list_obj.name
     
-    # Suppression de la liste (les sous-listes et activités seront supprimées en cascade)
+    # Lignes supprimées en cascade, comptées dans la même transaction que la suppression
+    deleted = {'lists': 1, **list_obj.count_content()}
+    
+    # Suppression de la liste (sous-listes et activités supprimées en cascade par SQLite)
     db.session.delete(list_obj)
     db.session.commit()
     
-    return True, f"Liste '{list_name}' supprimée avec succès"
+    return True, {'message': f"Liste '{list_name}' supprimée avec succès", 'deleted': deleted}
 
 def get_list_with_content(list_id):
     """
     Récupère une liste avec ses sous-listes et activités.
     
+    L'arborescence est chargée en un nombre fixe de requêtes : chaque sous-liste
+    (y compris la sous-liste virtuelle) expose ses activités triées par position
+    sans déclencher de requête supplémentaire lors du rendu. Les sous-listes et
+    activités sont des projections en lecture seule (SublistContent, ActivityCard).
+    
     Args:
         id (int): Identifiant unique de la liste
     
@@ -161,16 +231,63 @@ def get_list_with_content(list_id):
             - Si succès: (True, dict contenant la liste, ses sous-listes et activités)
             - Si échec: (False, message d'erreur)
     """
-    list_obj = db.session.get(List, list_id)
-    if not list_obj:
+    tree = List.get_with_content(list_id)
+    if not tree:
         return False, "Liste non trouvée"
     
-    # Récupérer les sous-listes et activités associées
-    sublists = Sublist.get_by_list_id(list_id)
-    activities = Activity.get_by_list_id(list_id)
+    list_obj, sublists, activities = tree
     
     return True, {
         "list": list_obj,
         "sublists": sublists,
         "activities": activities
     }
+
+def get_sublist_content(list_id, sublist_id):
+    """
+    Récupère une seule sous-liste d'une liste avec ses activités.
+    
+    Seules les activités de la sous-liste sont chargées (projections ActivityCard).
+    
+    Args:
+        list_id (int): Identifiant unique de la liste
+        sublist_id (int): Identifiant de la sous-liste (0 = sous-liste virtuelle)
+    
+    Returns:
+        tuple: (succès, données/message)
+            - Si succès: (True, dict contenant la liste et la sous-liste SublistContent)
+            - Si échec: (False, message d'erreur)
+    """
+    content = List.get_sublist_content(list_id, sublist_id)
+    if not content:
+        return False, "Sous-liste non trouvée dans cette liste"
+    
+    list_obj, sublist = content
+    return True, {
+        "list": list_obj,
+        "sublist": sublist
+    }
+
+def get_lists_content(lists):
+    """
+    Récupère le contenu (sous-listes et activités) de listes déjà chargées.
+    
+    Les sous-listes et activités de toutes les listes demandées sont chargées en lot, en
+    un nombre fixe de requêtes quel que soit le nombre de listes ; les listes dont le
+    rendu est déjà en cache ne sont pas demandées.
+    
+    Args:
+        lists (list): Objets List (voir get_all_lists)
+    
+    Returns:
+        list: Dictionnaires (liste, sous-listes, activités) dans l'ordre de `lists`,
+              au même format que get_list_with_content
+    """
+    return [
+        {
+            "list": list_obj,
+            "sublists": sublists,
+            "activities": activities
+        }
+        for list_obj, sublists, activities in List.load_content(lists)
+    ]
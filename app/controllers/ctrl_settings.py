@@ -35,13 +35,16 @@ def get_settings():
     """
     Récupère les paramètres actuels de l'application.
     
+    Les paramètres sont lus depuis le cache du processus (aucune requête SQL tant
+    qu'ils n'ont pas été modifiés), voir Settings.get_cached.
+    
     Returns:
         tuple: (succès, données/message)
-            - Si succès: (True, objet Settings)
+            - Si succès: (True, instantané SettingsSnapshot en lecture seule)
             - Si échec: (False, message d'erreur)
     """
     try:
-        settings = Settings.get_settings()
+        settings = Settings.get_cached()
         if not settings:
             return False, "Aucun paramètre trouvé, la base de données n'a pas été correctement initialisée"
         return True, settings
@@ -61,7 +64,7 @@ def update_settings(data):
     
     Returns:
         tuple: (succès, données/message)
-            - Si succès: (True, objet Settings mis à jour)
+            - Si succès: (True, instantané SettingsSnapshot mis à jour)
             - Si échec: (False, message d'erreur ou dict d'erreurs)
     """
     # Valider les données
@@ -78,7 +81,8 @@ def update_settings(data):
         if not updated_settings:
             return False, "Erreur lors de la mise à jour des paramètres"
         
-        return True, updated_settings
+        # Le cache a été invalidé par la mise à jour : relecture du nouvel instantané
+        return True, Settings.get_cached()
     except Exception as e:
         return False, f"Erreur lors de la mise à jour des paramètres: {str(e)}"
 
@@ -62,6 +62,26 @@ def get_sublists_for_list(list_id):
     
     return Sublist.get_by_list_id(list_id)
 
+def get_previous_sublist_id(list_id, sublist_id):
+    """
+    Récupère la sous-liste affichée juste avant une sous-liste dans sa liste.
+    
+    Permet d'insérer le rendu d'une sous-liste à sa place sans recharger la liste.
+    
+    Args:
+        list_id (int): Identifiant de la liste parente
+        sublist_id (int): Identifiant de la sous-liste
+    
+    Returns:
+        int: ID de la sous-liste précédente (0 = sous-liste virtuelle, toujours en tête)
+    """
+    previous_id = 0
+    for sublist in Sublist.get_by_list_id(list_id):
+        if sublist.id == sublist_id:
+            break
+        previous_id = sublist.id
+    return previous_id
+
 def create_sublist(data):
     """
     Crée une nouvelle sous-liste.
@@ -172,8 +192,9 @@ def delete_sublist(id):
         id (int): Identifiant unique de la sous-liste à supprimer
         
     Returns:
-        tuple: (succès, message)
-            - Si succès: (True, message de confirmation)
+        tuple: (succès, données/message)
+            - Si succès: (True, {'message': confirmation,
+                                 'deleted': {'sublists', 'activities', 'archived_activities'}})
             - Si échec: (False, message d'erreur)
     """
     # Récupération de la sous-liste
@@ -184,8 +205,11 @@ def delete_sublist(id):
     # Récupérer le nom pour le message de confirmation
     sublist_name = sublist.name
     
+    # Activités supprimées en cascade, comptées avant la suppression
+    deleted = {'sublists': 1, **sublist.count_content()}
+    
     # Suppression de la sous-liste
     if not Sublist.delete(id):
         return False, "Erreur lors de la suppression de la sous-liste"
     
-    return True, f"Sous-liste '{sublist_name}' supprimée avec succès"
\ No newline at end of file
+    return True, {'message': f"Sous-liste '{sublist_name}' supprimée avec succès", 'deleted': deleted}
\ No newline at end of file
@@ -5,6 +5,11 @@ from app.models.sublist import Sublist
 from app.models.activity import Activity
 from app.models.settings import Settings 
 from app.models.weekly_goals import WeeklyGoal
+from app.models.weekly_load import WeeklyLoad
+from app.models.archived_activity import ArchivedActivity
+from app.models.activity_search import ActivitySearch
+from app.models.list_version import ListVersion
 
 # Cette ligne permet de spécifier quels noms seront importés lors d'un 'from app.models import *'
-__all__ = ['List', 'Sublist', 'Activity', 'Settings', 'WeeklyGoal']
+__all__ = ['List', 'Sublist', 'Activity', 'Settings', 'WeeklyGoal', 'WeeklyLoad', 'ArchivedActivity',
+           'ActivitySearch', 'ListVersion']
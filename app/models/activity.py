@@ -6,22 +6,81 @@ Input data: Titre, liste parente, sous-liste optionnelle, durée, date d'échéa
 Output data: Objet Activity avec méthodes pour gérer les échéances et le statut
 Business constraints:
 - La durée peut être S (small), M (medium) ou L (large)
-- Une activité doit toujours appartenir à une liste
+- Une activité doit toujours appartenir à une liste ; la suppression d'une liste ou d'une
+  sous-liste supprime ses activités en base (ON DELETE CASCADE, déclencheur), sans les charger
 - Si une sous-liste est spécifiée, elle doit appartenir à la liste parente
 - La date d'échéance par défaut est fixée au 31/12/2099
 - L'heure de début par défaut est fixée à 23:59
 - Les activités peuvent être marquées comme prioritaires ou terminées
+- Les positions sont clairsemées (écart POSITION_GAP) : une insertion ou un déplacement
+  n'écrit que la ligne concernée, la renumérotation n'a lieu que lorsque l'écart est épuisé
+- Les rendus en lecture (listes, tableau, objectifs) utilisent la projection ActivityCard ;
+  les objets ORM sont réservés aux écritures
+- Les activités terminées depuis longtemps sont déplacées dans archived_activities ; les
+  lectures ne couvrent l'archive que sur demande (include_archived)
 """
 
 from app import db
 from datetime import datetime, timezone, date, timedelta, time
 from enum import Enum
+from typing import NamedTuple, Optional
+from sqlalchemy import case, func, insert, inspect, literal, or_, select, tuple_, union_all
+from app.utils.pagination_utils import keyset_after
+from app.utils.position_utils import renumber_positions, sparse_positions
 
 class DurationSize(Enum):
     SMALL = 'S'
     MEDIUM = 'M'
     LARGE = 'L'
 
+class ActivityCard(NamedTuple):
+    """
+    Projection en lecture seule d'une activité, limitée aux colonnes du rendu en carte.
+    
+    Construite directement depuis une requête sur colonnes : ni identity map, ni suivi
+    des modifications, ni relations. list_color n'est renseigné que si la requête
+    joint la liste parente.
+    """
+    id: int
+    title: str
+    duration: DurationSize
+    due_date: Optional[date]
+    start_time: Optional[time]
+    is_priority: bool
+    is_completed: bool
+    list_id: int
+    sublist_id: int
+    position: int
+    list_color: Optional[str] = None
+
+class CompletedActivity(NamedTuple):
+    """
+    Entrée de l'historique des activités terminées (Activity.get_completed).
+    
+    id est l'identifiant dans la table d'origine : activities, ou archived_activities
+    si is_archived.
+    """
+    id: int
+    title: str
+    list_id: int
+    sublist_id: int
+    duration: DurationSize
+    due_date: Optional[date]
+    completed_at: datetime
+    is_archived: bool
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'list_id': self.list_id,
+            'sublist_id': self.sublist_id,
+            'duration': self.duration.value if self.duration else None,
+            'due_date': self.due_date.isoformat() if self.due_date else None,
+            'completed_at': self.completed_at.isoformat(),
+            'is_archived': self.is_archived
+        }
+
 class Activity(db.Model):
     
     # ==================================================================
@@ -30,10 +89,15 @@ class Activity(db.Model):
     
     __tablename__ = 'activities'
     
+    # Écart entre deux positions consécutives après renumérotation
+    POSITION_GAP = 1024
+    
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
     list_id = db.Column(db.Integer, db.ForeignKey('lists.id', ondelete='CASCADE'), nullable=False)
-    sublist_id = db.Column(db.Integer, db.ForeignKey('sublists.id', ondelete='SET DEFAULT'), default=0, nullable=False)
+    # Pas de clé étrangère : 0 (aucune sous-liste) ne correspond à aucune ligne de sublists.
+    # La cascade est faite par le déclencheur trg_sublists_delete_activities (voir sublist.py)
+    sublist_id = db.Column(db.Integer, default=0, nullable=False)
     
     # Durée et échéance
     duration = db.Column(db.Enum(DurationSize), default=DurationSize.SMALL)
@@ -54,21 +118,56 @@ class Activity(db.Model):
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), 
                           onupdate=lambda: datetime.now(timezone.utc))
     
+    # Index correspondant aux chemins d'accès (voir migration b7d41c2e9a10)
+    __table_args__ = (
+        # Contenu d'une liste / d'un conteneur trié par position (get_by_list_id, reorder_positions)
+        db.Index('ix_activities_list_sublist_position', 'list_id', 'sublist_id', 'position'),
+        # Activités d'une sous-liste
+        db.Index('ix_activities_sublist_id', 'sublist_id'),
+        # Tri par échéance (get_filtered, get_page)
+        db.Index('ix_activities_due_date_position', 'due_date', 'position'),
+        # Activités d'une liste par échéance (get_page filtré par liste, migration d8a3f61c27e5)
+        db.Index('ix_activities_list_due_date_position', 'list_id', 'due_date', 'position'),
+        # Activités non terminées par échéance (index partiel)
+        db.Index('ix_activities_open_due_date', 'due_date', 'position',
+                 sqlite_where=db.text('is_completed = 0')),
+        # Activités terminées par date de réalisation (archivage, historique)
+        db.Index('ix_activities_completed_at', 'completed_at',
+                 sqlite_where=db.text('is_completed = 1')),
+    )
+    
+    # Clé de tri de la pagination (servie par ix_activities_due_date_position, id = rowid)
+    PAGE_KEY = (due_date, position, id)
+    
     # Contrainte pour vérifier que sublist_id appartient à list_id
     @staticmethod
     def validate_sublist_belongs_to_list(list_id, sublist_id):
-        """Vérifie que la sous-liste appartient bien à la liste parente."""
+        """
+        Vérifie que la sous-liste appartient bien à la liste parente.
+        
+        Une requête par clé primaire (Sublist.get_owners) ; save() ne l'appelle que si
+        list_id ou sublist_id a changé.
+        """
         if sublist_id == 0:
             return True
         
         from app.models.sublist import Sublist
-        sublist = Sublist.query.filter_by(id=sublist_id).first()
-        
-        return sublist is not None and sublist.list_id == list_id
+        return Sublist.get_owners([sublist_id]).get(sublist_id) == list_id
+
+    def ownership_changed(self):
+        """Indique si list_id ou sublist_id a changé depuis le dernier chargement (toujours vrai si nouvelle)."""
+        state = inspect(self)
+        if not state.persistent:
+            return True
+        return any(state.attrs[name].history.has_changes() for name in ('list_id', 'sublist_id'))
 
     def save(self):
-        """Sauvegarde l'activité après validation."""
-        if not self.validate_sublist_belongs_to_list(self.list_id, self.sublist_id):
+        """
+        Sauvegarde l'activité après validation (si la liste ou la sous-liste a changé).
+        
+        Un seul commit : chaque action utilisateur sur une activité est une transaction.
+        """
+        if self.ownership_changed() and not self.validate_sublist_belongs_to_list(self.list_id, self.sublist_id):
             raise ValueError("La sous-liste sélectionnée n'appartient pas à la liste parente.")
         
         db.session.add(self)
@@ -159,20 +258,15 @@ class Activity(db.Model):
             due_date=date(2099, 12, 31),  # Date par défaut pour la duplication
             start_time=time(23, 59),      # Heure par défaut pour la duplication
             is_priority=self.is_priority,
-            position=0,   # Positionner au début par défaut
+            # Positionner au début du conteneur
+            position=Activity.top_position(self.list_id, self.sublist_id),
             is_active=True
         )
         # La nouvelle activité n'est jamais complétée par défaut
         new_activity.is_completed = False
         new_activity.completed_at = None
-            
-        db.session.add(new_activity)
-        db.session.commit()
-
-        # Réinitialiser les positions après duplication
-        Activity.reorder_positions(new_activity.list_id, new_activity.sublist_id)
         
-        return new_activity
+        return new_activity.save()
     
     def get_duration_in_minutes(self, unit_time=30):
         """Calcule la durée en minutes selon la taille du bloc"""
@@ -191,6 +285,22 @@ class Activity(db.Model):
         """Récupère une activité par son ID."""
         return db.session.get(cls, id)
     
+    @classmethod
+    def get_by_ids(cls, ids):
+        """
+        Récupère plusieurs activités en une seule requête.
+        
+        Args:
+            ids (iterable): IDs des activités
+        
+        Returns:
+            dict: {id: Activity} pour les activités existantes
+        """
+        ids = set(ids)
+        if not ids:
+            return {}
+        return {activity.id: activity for activity in cls.query.filter(cls.id.in_(ids))}
+    
     @classmethod
     def get_by_list_id(cls, list_id):
         """Récupère toutes les activités d'une liste."""
@@ -214,6 +324,44 @@ class Activity(db.Model):
         Returns:
             list: Liste des activités correspondant aux critères
         """
+        query = cls._filtered_query(list_id, sublist_id, is_completed)
+        
+        return query.order_by(cls.due_date, cls.position).all()
+    
+    @classmethod
+    def get_page(cls, list_id=None, sublist_id=None, is_completed=None, after=None, limit=50):
+        """
+        Récupère une page d'activités filtrées, paginée par clé (due_date, position, id).
+        
+        La page suivante reprend après la clé de la dernière activité reçue : le coût
+        ne dépend pas de la profondeur (pas d'OFFSET), l'index de tri par échéance
+        est parcouru à partir de la clé.
+        
+        Args:
+            list_id (int, optional): Filtre par liste
+            sublist_id (int, optional): Filtre par sous-liste
+            is_completed (bool, optional): Filtre par statut de complétion
+            after (tuple, optional): Clé (due_date, position, id) de la dernière activité vue
+            limit (int, optional): Nombre maximal d'activités dans la page
+        
+        Returns:
+            tuple: (activités, clé de la dernière activité ou None si c'est la dernière page)
+        """
+        query = cls._filtered_query(list_id, sublist_id, is_completed)
+        if after is not None:
+            query = query.filter(keyset_after(cls.PAGE_KEY, after))
+        
+        activities = query.order_by(*cls.PAGE_KEY).limit(limit + 1).all()
+        if len(activities) <= limit:
+            return activities, None
+        
+        activities = activities[:limit]
+        last = activities[-1]
+        return activities, (last.due_date, last.position, last.id)
+    
+    @classmethod
+    def _filtered_query(cls, list_id=None, sublist_id=None, is_completed=None):
+        """Construit la requête filtrée commune à get_filtered et get_page."""
         query = cls.query
         
         if list_id is not None:
@@ -223,13 +371,183 @@ class Activity(db.Model):
         if is_completed is not None:
             query = query.filter_by(is_completed=is_completed)
         
-        return query.order_by(cls.due_date, cls.position).all()
+        return query
+    
+    @classmethod
+    def get_stats(cls, date_from, date_to, include_archived=False):
+        """
+        Calcule les statistiques des activités dont l'échéance est dans un intervalle.
+        
+        Une seule requête d'agrégation (SUM/CASE) sur l'intervalle de due_date (index
+        ix_activities_due_date_position) : aucune activité n'est chargée en mémoire.
+        Même résultat que wip_utils.calculate_activities_stats sur ces activités.
+        
+        Args:
+            date_from (date): Première échéance incluse
+            date_to (date): Dernière échéance incluse
+            include_archived (bool, optional): Compte aussi les activités archivées
+        
+        Returns:
+            dict: total_time_units, activities_count, activities_by_duration,
+                  completed_count, completion_rate
+        """
+        from app.utils.wip_utils import TIME_UNITS, build_activities_stats
+        
+        sizes = {size.value: size for size in DurationSize}
+        count_of = lambda condition: func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+        in_range = lambda model: select(model.duration, model.is_completed).where(
+            model.due_date.between(date_from, date_to)
+        )
+        
+        source = in_range(cls)
+        if include_archived:
+            from app.models.archived_activity import ArchivedActivity
+            source = union_all(source, in_range(ArchivedActivity))
+        source = source.subquery()
+        
+        row = db.session.execute(select(
+            func.count(),
+            func.coalesce(func.sum(case(
+                *((source.c.duration == sizes[code], units) for code, units in TIME_UNITS.items()),
+                else_=0
+            )), 0),
+            *(count_of(source.c.duration == sizes[code]) for code in TIME_UNITS),
+            count_of(source.c.is_completed == True)
+        )).one()
+        
+        activities_count, total_units, *duration_counts, completed_count = row
+        return build_activities_stats(
+            total_units, activities_count, dict(zip(TIME_UNITS, duration_counts)), completed_count
+        )
+    
+    @classmethod
+    def get_completed(cls, list_id=None, completed_from=None, completed_to=None,
+                      include_archived=False, limit=50):
+        """
+        Récupère l'historique des activités terminées, les plus récentes en premier.
+        
+        Sans include_archived, seule la table activities est lue (index partiel
+        ix_activities_completed_at). Avec, les deux tables sont réunies (UNION ALL) avant
+        le tri et la limite.
+        
+        Args:
+            list_id (int, optional): Filtre par liste parente
+            completed_from (datetime, optional): Date de réalisation minimale (incluse)
+            completed_to (datetime, optional): Date de réalisation maximale (exclue)
+            include_archived (bool, optional): Inclut les activités archivées
+            limit (int, optional): Nombre maximal d'entrées
+        
+        Returns:
+            list: Entrées CompletedActivity triées par completed_at décroissant
+        """
+        def completed(model, is_archived):
+            criteria = [model.is_completed == True, model.completed_at.isnot(None)]
+            if list_id is not None:
+                criteria.append(model.list_id == list_id)
+            if completed_from is not None:
+                criteria.append(model.completed_at >= completed_from)
+            if completed_to is not None:
+                criteria.append(model.completed_at < completed_to)
+            return select(
+                model.id, model.title, model.list_id, model.sublist_id, model.duration,
+                model.due_date, model.completed_at,
+                literal(is_archived).label('is_archived')
+            ).where(*criteria)
+        
+        statement = completed(cls, False)
+        if include_archived:
+            from app.models.archived_activity import ArchivedActivity
+            statement = union_all(statement, completed(ArchivedActivity, True))
+        statement = statement.subquery()
+        
+        rows = db.session.execute(
+            select(statement).order_by(statement.c.completed_at.desc(), statement.c.id.desc()).limit(limit)
+        )
+        return [CompletedActivity(*row) for row in rows]
+    
+    @classmethod
+    def card_columns(cls):
+        """
+        Colonnes lues pour construire une ActivityCard (dans l'ordre de ses champs).
+        
+        Returns:
+            tuple: Colonnes du modèle, sans list_color
+        """
+        return (cls.id, cls.title, cls.duration, cls.due_date, cls.start_time,
+                cls.is_priority, cls.is_completed, cls.list_id, cls.sublist_id, cls.position)
+    
+    @classmethod
+    def get_cards_by_list_ids(cls, list_ids):
+        """
+        Récupère en une seule requête les cartes des activités de plusieurs listes.
+        
+        Args:
+            list_ids (list): IDs des listes parentes
+        
+        Returns:
+            list: ActivityCard triées par position puis ID
+        """
+        if not list_ids:
+            return []
+        rows = db.session.query(*cls.card_columns()).filter(
+            cls.list_id.in_(list_ids)
+        ).order_by(cls.position, cls.id)
+        return [ActivityCard(*row) for row in rows]
+    
+    @classmethod
+    def get_cards_by_sublist(cls, list_id, sublist_id):
+        """
+        Récupère les cartes des activités d'un seul conteneur (index
+        ix_activities_list_sublist_position).
+        
+        Args:
+            list_id (int): ID de la liste parente
+            sublist_id (int): ID de la sous-liste (0 = sous-liste virtuelle)
+        
+        Returns:
+            list: ActivityCard triées par position puis ID
+        """
+        if sublist_id:
+            in_sublist = cls.sublist_id == sublist_id
+        else:
+            in_sublist = or_(cls.sublist_id == 0, cls.sublist_id.is_(None))
+        rows = db.session.query(*cls.card_columns()).filter(
+            cls.list_id == list_id, in_sublist
+        ).order_by(cls.position, cls.id)
+        return [ActivityCard(*row) for row in rows]
+    
+    @classmethod
+    def get_week_cards(cls, week_start, week_end):
+        """
+        Récupère les cartes des activités dont l'échéance tombe dans une semaine.
+        
+        Une seule requête sur l'intervalle de due_date (index ix_activities_due_date_position,
+        déjà trié par échéance puis position), avec la couleur de la liste parente.
+        
+        Args:
+            week_start (date): Premier jour de la semaine (lundi)
+            week_end (date): Dernier jour de la semaine (dimanche)
+        
+        Returns:
+            list: ActivityCard (list_color renseigné) triées par échéance puis position
+        """
+        from app.models.list import List
+        
+        rows = db.session.query(
+            *cls.card_columns(), List.color_code.label('list_color')
+        ).join(List, List.id == cls.list_id).filter(
+            cls.due_date.between(week_start, week_end)
+        ).order_by(cls.due_date, cls.position)
+        return [ActivityCard(*row) for row in rows]
     
     @classmethod
     def create(cls, data):
         """
         Crée une nouvelle activité.
         
+        La position de tête est calculée dans la même transaction que l'insertion :
+        l'action complète ne fait qu'un commit.
+        
         Args:
             data (dict): Dictionnaire contenant les données de l'activité
         
@@ -259,18 +577,144 @@ class Activity(db.Model):
             if 'is_priority' in data:
                 activity.is_priority = data['is_priority']
             
-            if 'position' in data:
+            if data.get('position') is not None:
                 activity.position = data['position']
+            else:
+                # Insertion en tête : seule la nouvelle ligne est écrite
+                activity.position = cls.top_position(activity.list_id, activity.sublist_id)
             
             if 'is_active' in data:
                 activity.is_active = data['is_active']
             
             # Sauvegarde avec validation
-            activity.save()
-            # Réorganiser les positions après création
-            cls.reorder_positions(activity.list_id, activity.sublist_id)
+            return activity.save()
+        
+        except Exception as e:
+            db.session.rollback()
+            return None
+    
+    @classmethod
+    def create_many(cls, items):
+        """
+        Crée plusieurs activités en une seule transaction.
+        
+        Les données doivent avoir été validées au préalable (liste existante, sous-liste
+        appartenant à la liste) : aucune vérification n'est refaite ligne par ligne. Les
+        activités sans position sont placées en tête de leur conteneur en conservant
+        l'ordre de `items`, à partir d'une seule requête sur les positions existantes.
+        
+        Les IDs attribués sont lus par INSERT … RETURNING, dans l'ordre des lignes fournies
+        (sort_by_parameter_order : SQLite ne garantissant pas l'ordre de RETURNING, SQLAlchemy
+        exécute un INSERT par ligne, dans la même transaction). La charge hebdomadaire est
+        mise à jour en une requête, puis les activités sont rechargées en une requête après
+        le commit.
+        
+        Args:
+            items (list): Dictionnaires de données (mêmes clés que create)
+        
+        Returns:
+            list: Activités créées dans l'ordre de `items`, ou None en cas d'erreur
+        """
+        try:
+            rows = []
+            for data in items:
+                rows.append({
+                    'title': data['title'],
+                    'list_id': data['list_id'],
+                    'sublist_id': data.get('sublist_id') or 0,
+                    'duration': data.get('duration', DurationSize.SMALL),
+                    'due_date': data.get('due_date', date(2099, 12, 31)),
+                    'start_time': data.get('start_time', time(23, 59)),
+                    'is_priority': data.get('is_priority', False),
+                    'position': data.get('position'),
+                    'is_active': data.get('is_active', True),
+                })
+            
+            # Positions en tête : la première activité fournie est placée le plus haut
+            pending = {}
+            for row in rows:
+                if row['position'] is None:
+                    pending.setdefault((row['list_id'], row['sublist_id']), []).append(row)
+            
+            tops = cls.top_positions(pending.keys())
+            for container, container_rows in pending.items():
+                position = tops[container] - len(container_rows) * cls.POSITION_GAP
+                for row in container_rows:
+                    position += cls.POSITION_GAP
+                    row['position'] = position
+            
+            ids = db.session.execute(
+                insert(cls).returning(cls.id, sort_by_parameter_order=True), rows
+            ).scalars().all()
+            
+            # L'insertion en lot ne passe pas par le flush : charge hebdomadaire mise à jour ici
+            from app.models.weekly_load import WeeklyLoad
+            WeeklyLoad.apply_activity_rows(rows)
+            db.session.commit()
+            
+            by_id = {activity.id: activity for activity in cls.query.filter(cls.id.in_(ids))}
+            return [by_id[id] for id in ids]
+        
+        except Exception as e:
+            db.session.rollback()
+            return None
+    
+    @classmethod
+    def apply_orderings(cls, orderings):
+        """
+        Applique en une seule transaction le nouvel ordre de plusieurs conteneurs.
+        
+        Chaque activité fournie est rattachée au conteneur cible (déplacement entre
+        sous-listes ou entre listes), dans l'ordre donné. Les autres activités déjà
+        présentes dans un conteneur cible sont placées à la suite, dans leur ordre actuel.
+        Seules les activités qui changent de place reçoivent une nouvelle position, prise
+        entre leurs voisines (sparse_positions) ; le conteneur n'est renuméroté que si
+        l'écart entre deux voisines est épuisé. Les couples liste/sous-liste doivent avoir
+        été validés au préalable.
+        
+        Args:
+            orderings (list): Tuples (list_id, sublist_id, [Activity, ...])
+        
+        Returns:
+            int: Nombre d'activités modifiées, ou None en cas d'erreur
+        """
+        try:
+            moved_ids = [activity.id for _, _, activities in orderings for activity in activities]
+            containers = [(list_id, sublist_id) for list_id, sublist_id, _ in orderings]
+            
+            # Activités restantes des conteneurs cibles (une seule requête)
+            remaining = {container: [] for container in containers}
+            others = cls.query.filter(
+                tuple_(cls.list_id, cls.sublist_id).in_(containers),
+                cls.id.notin_(moved_ids)
+            ).order_by(cls.position, cls.id).all()
+            for activity in others:
+                remaining[(activity.list_id, activity.sublist_id)].append(activity)
             
-            return activity
+            changed = 0
+            for list_id, sublist_id, activities in orderings:
+                ordered = list(activities) + remaining[(list_id, sublist_id)]
+                current = [activity.position if (activity.list_id, activity.sublist_id) == (list_id, sublist_id)
+                           else None for activity in ordered]
+                positions = sparse_positions(current, gap=cls.POSITION_GAP)
+                
+                if positions is None:
+                    # Écart épuisé : renumérotation du conteneur puis nouveau calcul
+                    if not cls.reorder_positions(list_id, sublist_id, commit=False):
+                        raise ValueError("Impossible de renuméroter les positions du conteneur.")
+                    renumbered = dict(db.session.query(cls.id, cls.position).filter_by(
+                        list_id=list_id, sublist_id=sublist_id))
+                    current = [renumbered.get(activity.id) for activity in ordered]
+                    positions = sparse_positions(current, gap=cls.POSITION_GAP) or \
+                        [(index + 1) * cls.POSITION_GAP for index in range(len(ordered))]
+                
+                for activity, old, position in zip(ordered, current, positions):
+                    if old != position:
+                        activity.list_id, activity.sublist_id, activity.position = list_id, sublist_id, position
+                        changed += 1
+            
+            db.session.commit()
+            return changed
         
         except Exception as e:
             db.session.rollback()
@@ -343,34 +787,127 @@ class Activity(db.Model):
         if not activity:
             return None
         
-        return activity.duplicate()
+        try:
+            return activity.duplicate()
+        except Exception as e:
+            db.session.rollback()
+            return None
+    
+    @classmethod
+    def top_position(cls, list_id, sublist_id):
+        """
+        Calcule une position placée avant la première activité d'un conteneur.
+        
+        Args:
+            list_id (int): ID de la liste parente
+            sublist_id (int): ID de la sous-liste (0 pour la sous-liste virtuelle)
+        
+        Returns:
+            int: Position libre en tête du conteneur
+        """
+        first = db.session.query(func.min(cls.position)).filter_by(
+            list_id=list_id, sublist_id=sublist_id
+        ).scalar()
+        
+        return cls.POSITION_GAP if first is None else first - cls.POSITION_GAP
     
     @classmethod
-    def reorder_positions(cls, list_id, sublist_id=None):
+    def top_positions(cls, containers):
+        """
+        Calcule en une seule requête la position de tête de plusieurs conteneurs.
+        
+        Args:
+            containers (iterable): Couples (list_id, sublist_id)
+        
+        Returns:
+            dict: {(list_id, sublist_id): position libre en tête} (voir top_position)
+        """
+        containers = set(containers)
+        if not containers:
+            return {}
+        
+        rows = db.session.query(cls.list_id, cls.sublist_id, func.min(cls.position)).filter(
+            cls.list_id.in_({list_id for list_id, _ in containers})
+        ).group_by(cls.list_id, cls.sublist_id).all()
+        first = {(list_id, sublist_id): position for list_id, sublist_id, position in rows}
+        
+        return {
+            container: cls.POSITION_GAP if first.get(container) is None
+            else first[container] - cls.POSITION_GAP
+            for container in containers
+        }
+    
+    @classmethod
+    def reorder_positions(cls, list_id, sublist_id=None, commit=True):
         """
         Réorganise les positions des activités dans un conteneur (liste ou sous-liste).
-        Assigne des positions séquentielles : 1, 2, 3, etc.
+        Assigne des positions régulièrement espacées : POSITION_GAP, 2 × POSITION_GAP, etc.
+        
+        Cette renumérotation complète n'est nécessaire que lorsque l'écart entre deux
+        positions voisines est épuisé (voir apply_orderings). Elle est exécutée en une
+        seule requête UPDATE (ROW_NUMBER() sur position), sans charger les activités.
         
         Args:
             list_id (int): ID de la liste parente
             sublist_id (int, optional): ID de la sous-liste (None pour la liste racine)
+            commit (bool, optional): Valide la transaction (sinon point de sauvegarde,
+                seul annulé en cas d'échec : le travail en cours de l'appelant est conservé)
         
         Returns:
             bool: True si succès, False sinon
         """
+        return cls._renumber(
+            (cls.list_id == list_id, cls.sublist_id == sublist_id),
+            commit=commit
+        )
+    
+    @classmethod
+    def reorder_list_positions(cls, list_id, commit=True):
+        """
+        Réorganise en une seule requête les positions de tous les conteneurs d'une liste.
+        Chaque sous-liste (et la sous-liste virtuelle) est renumérotée indépendamment.
+        
+        Args:
+            list_id (int): ID de la liste parente
+            commit (bool, optional): Valide la transaction (sinon point de sauvegarde,
+                seul annulé en cas d'échec : le travail en cours de l'appelant est conservé)
+        
+        Returns:
+            bool: True si succès, False sinon
+        """
+        return cls._renumber(
+            (cls.list_id == list_id,),
+            partition_by=(cls.sublist_id,),
+            commit=commit
+        )
+    
+    @classmethod
+    def _renumber(cls, criteria, partition_by=(), commit=True):
+        """
+        Renumérote les positions (voir renumber_positions) dans sa propre transaction,
+        ou dans un point de sauvegarde (SAVEPOINT) de la transaction de l'appelant.
+        
+        Args:
+            criteria (tuple): Conditions de sélection des activités
+            partition_by (tuple, optional): Colonnes délimitant les conteneurs
+            commit (bool, optional): Valide la transaction (sinon point de sauvegarde)
+        
+        Returns:
+            bool: True si succès, False sinon
+        """
+        if not commit:
+            # Un échec n'annule que le point de sauvegarde : l'appelant décide du reste
+            try:
+                with db.session.begin_nested():
+                    renumber_positions(cls, criteria, partition_by=partition_by, gap=cls.POSITION_GAP)
+                return True
+            except Exception as e:
+                return False
+        
         try:
-            # Récupérer toutes les activités du conteneur, triées par position
-            activities = cls.query.filter_by(
-                list_id=list_id, 
-                sublist_id=sublist_id
-            ).order_by(cls.position).all()
-            
-            # Réassigner les positions séquentiellement
-            for index, activity in enumerate(activities, start=1):
-                activity.position = index
-            
+            renumber_positions(cls, criteria, partition_by=partition_by, gap=cls.POSITION_GAP)
             db.session.commit()
             return True
         except Exception as e:
             db.session.rollback()
-            return False
\ No newline at end of file
+            return False
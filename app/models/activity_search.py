@@ -0,0 +1,186 @@
+"""
+File: app/models/activity_search.py
+Role: Index de recherche plein texte des activités
+Description: Table virtuelle FTS5 activities_fts (titre de l'activité, nom de sa sous-liste
+             et de sa liste) tenue à jour par des déclencheurs SQLite, et recherche classée
+Input data: Saisie de recherche, nombre maximal de résultats
+Output data: Résultats SearchResult avec le contexte liste / sous-liste
+Business constraints:
+- Une ligne d'index par activité courante (rowid = activities.id) ; les activités
+  archivées ne sont pas indexées
+- Les déclencheurs suivent les créations, suppressions (y compris en cascade), changements
+  de titre ou de conteneur des activités et les renommages de listes et sous-listes
+- La recherche est une seule requête : correspondance FTS5, classement par pertinence (bm25,
+  le titre pesant le plus) des RANK_WINDOW correspondances les plus récentes, puis jointure
+  des activités, listes et sous-listes pour les seuls résultats retenus
+- ActivitySearch.rebuild régénère l'index depuis les tables (commande `flask search rebuild`)
+"""
+
+from datetime import date
+from typing import NamedTuple, Optional
+
+from markupsafe import Markup
+from sqlalchemy import DDL, event
+
+from app import db
+from app.utils.search_utils import build_match_query, highlight_terms, split_search_terms
+
+# Poids bm25 des colonnes indexées : titre, sous-liste, liste
+RANK_WEIGHTS = (10.0, 2.0, 1.0)
+
+# Nombre de correspondances classées au plus : les plus récentes (rowid décroissant).
+# Le coût de bm25 croît avec le nombre de lignes classées ; cette fenêtre le borne
+# quand un mot très courant correspond à une grande partie de la table
+RANK_WINDOW = 500
+
+# Définitions reprises par la migration b58d0e2f7a16
+FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS activities_fts USING fts5(
+    title, sublist_name, list_name,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+FTS_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_activities_fts_insert
+    AFTER INSERT ON activities
+    BEGIN
+        INSERT INTO activities_fts (rowid, title, sublist_name, list_name)
+        VALUES (NEW.id, NEW.title,
+                (SELECT name FROM sublists WHERE id = NEW.sublist_id),
+                (SELECT name FROM lists WHERE id = NEW.list_id));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_activities_fts_update
+    AFTER UPDATE OF title, list_id, sublist_id ON activities
+    BEGIN
+        UPDATE activities_fts
+        SET title = NEW.title,
+            sublist_name = (SELECT name FROM sublists WHERE id = NEW.sublist_id),
+            list_name = (SELECT name FROM lists WHERE id = NEW.list_id)
+        WHERE rowid = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_activities_fts_delete
+    AFTER DELETE ON activities
+    BEGIN
+        DELETE FROM activities_fts WHERE rowid = OLD.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_lists_fts_rename
+    AFTER UPDATE OF name ON lists
+    BEGIN
+        UPDATE activities_fts SET list_name = NEW.name
+        WHERE rowid IN (SELECT id FROM activities WHERE list_id = NEW.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_sublists_fts_rename
+    AFTER UPDATE OF name ON sublists
+    BEGIN
+        UPDATE activities_fts SET sublist_name = NEW.name
+        WHERE rowid IN (SELECT id FROM activities WHERE sublist_id = NEW.id);
+    END
+    """,
+)
+
+# Remplissage depuis les tables (migration et ActivitySearch.rebuild)
+FTS_FILL = """
+INSERT INTO activities_fts (rowid, title, sublist_name, list_name)
+SELECT activities.id, activities.title, sublists.name, lists.name
+FROM activities
+JOIN lists ON lists.id = activities.list_id
+LEFT JOIN sublists ON sublists.id = activities.sublist_id
+"""
+
+_SEARCH = db.text(f"""
+WITH ranked AS (
+    SELECT rowid AS id, bm25(activities_fts, {', '.join(map(str, RANK_WEIGHTS))}) AS score
+    FROM activities_fts
+    WHERE activities_fts MATCH :query
+      AND rowid >= coalesce((SELECT rowid FROM activities_fts
+                             WHERE activities_fts MATCH :query
+                             ORDER BY rowid DESC LIMIT 1 OFFSET :window - 1), 0)
+    ORDER BY score
+    LIMIT :limit
+)
+SELECT activities.id, activities.title, activities.is_completed, activities.due_date,
+       lists.id AS list_id, lists.name AS list_name, lists.color_code AS list_color,
+       activities.sublist_id, sublists.name AS sublist_name
+FROM ranked
+JOIN activities ON activities.id = ranked.id
+JOIN lists ON lists.id = activities.list_id
+LEFT JOIN sublists ON sublists.id = activities.sublist_id
+ORDER BY ranked.score
+""").columns(is_completed=db.Boolean, due_date=db.Date)
+
+
+class SearchResult(NamedTuple):
+    """Activité trouvée, avec le contexte de sa liste et de sa sous-liste."""
+    id: int
+    title: str
+    title_html: Markup  # Titre échappé, mots trouvés entourés de <mark>
+    is_completed: bool
+    due_date: Optional[date]
+    list_id: int
+    list_name: str
+    list_color: str
+    sublist_id: int
+    sublist_name: Optional[str]
+
+
+class ActivitySearch:
+    """Accès à l'index plein texte des activités (pas de modèle ORM : table virtuelle)."""
+
+    @staticmethod
+    def search(text, limit=20):
+        """
+        Recherche les activités correspondant à une saisie libre.
+
+        Args:
+            text (str): Saisie de l'utilisateur (chaque mot est cherché comme préfixe)
+            limit (int, optional): Nombre maximal de résultats
+
+        Returns:
+            list: Résultats SearchResult, les plus pertinents en premier
+        """
+        terms = split_search_terms(text)
+        query = build_match_query(terms)
+        if query is None:
+            return []
+
+        rows = db.session.execute(_SEARCH, {'query': query, 'window': RANK_WINDOW, 'limit': limit})
+        return [
+            SearchResult(row.id, row.title, highlight_terms(row.title, terms), *row[2:])
+            for row in rows
+        ]
+
+    @staticmethod
+    def rebuild():
+        """
+        Régénère l'index depuis les tables activities, lists et sublists (une transaction).
+
+        Returns:
+            int: Nombre d'activités indexées, ou None en cas d'erreur
+        """
+        try:
+            db.session.execute(db.text("DELETE FROM activities_fts"))
+            indexed = db.session.execute(db.text(FTS_FILL)).rowcount
+            db.session.execute(db.text("INSERT INTO activities_fts (activities_fts) VALUES ('optimize')"))
+            db.session.commit()
+            return indexed
+        except Exception as e:
+            db.session.rollback()
+            return None
+
+
+# Index et déclencheurs créés avec le schéma (db.create_all), supprimés avec lui
+for statement in (FTS_TABLE, *FTS_TRIGGERS):
+    event.listen(db.metadata, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+event.listen(db.metadata, 'before_drop',
+             DDL("DROP TABLE IF EXISTS activities_fts").execute_if(dialect='sqlite'))
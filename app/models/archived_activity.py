@@ -0,0 +1,149 @@
+"""
+File: app/models/archived_activity.py
+Role: Modèle de données pour l'archive des activités terminées
+Description: Table froide recevant les activités terminées depuis plus de N semaines,
+             déplacées par lots depuis la table activities (commande `flask activities archive`)
+Input data: Activités terminées (is_completed, completed_at), ancienneté en semaines, taille de lot
+Output data: Objet ArchivedActivity, nombre d'activités archivées
+Business constraints:
+- Seules les activités terminées avant la date limite sont archivées ; le déplacement
+  (copie puis suppression) est fait par lots, une transaction courte par lot, pour ne
+  pas bloquer les écritures interactives
+- Les lectures courantes (listes, tableau, objectifs, charge hebdomadaire) n'utilisent que
+  la table activities ; l'archive n'est lue que sur demande explicite (include_archived)
+- Une activité archivée garde son identifiant d'origine (activity_id), qui peut être
+  réattribué par SQLite à une nouvelle activité : l'archive a sa propre clé primaire
+- La charge hebdomadaire (weekly_load) ne compte que les activités non archivées
+- La suppression d'une liste ou d'une sous-liste supprime aussi ses activités archivées
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, literal, select
+
+from app import db
+from app.models.activity import Activity, DurationSize
+
+# Colonnes recopiées telles quelles depuis activities
+COPIED_COLUMNS = ('title', 'list_id', 'sublist_id', 'duration', 'due_date', 'start_time',
+                  'is_priority', 'position', 'is_active', 'is_completed', 'completed_at',
+                  'created_at', 'updated_at')
+
+# Taille de lot par défaut (voir ARCHIVE_BATCH_SIZE)
+DEFAULT_BATCH_SIZE = 500
+
+
+class ArchivedActivity(db.Model):
+    __tablename__ = 'archived_activities'
+
+    id = db.Column(db.Integer, primary_key=True)
+    activity_id = db.Column(db.Integer, nullable=False)  # ID dans activities avant archivage
+    title = db.Column(db.String(255), nullable=False)
+    list_id = db.Column(db.Integer, db.ForeignKey('lists.id', ondelete='CASCADE'), nullable=False)
+    # Sans clé étrangère, comme activities.sublist_id (cascade par trg_sublists_delete_activities)
+    sublist_id = db.Column(db.Integer, default=0, nullable=False)
+    duration = db.Column(db.Enum(DurationSize), default=DurationSize.SMALL)
+    due_date = db.Column(db.Date)
+    start_time = db.Column(db.Time)
+    is_priority = db.Column(db.Boolean, default=False)
+    position = db.Column(db.Integer, default=0)
+    is_active = db.Column(db.Boolean, default=True)
+    is_completed = db.Column(db.Boolean, default=True)
+    completed_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        # Historique par date de réalisation, global ou par liste (Activity.get_completed)
+        db.Index('ix_archived_activities_completed_at', 'completed_at'),
+        db.Index('ix_archived_activities_list_completed_at', 'list_id', 'completed_at'),
+        # Statistiques par échéance (Activity.get_stats avec include_archived)
+        db.Index('ix_archived_activities_due_date', 'due_date'),
+        # Cascade depuis une sous-liste (déclencheur trg_sublists_delete_activities)
+        db.Index('ix_archived_activities_sublist_id', 'sublist_id'),
+    )
+
+    def __repr__(self):
+        return f'<ArchivedActivity {self.title}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'activity_id': self.activity_id,
+            'title': self.title,
+            'list_id': self.list_id,
+            'sublist_id': self.sublist_id,
+            'duration': self.duration.value if self.duration else None,
+            'due_date': self.due_date.isoformat() if self.due_date else None,
+            'is_priority': self.is_priority,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'archived_at': self.archived_at.isoformat()
+        }
+
+    @staticmethod
+    def cutoff(weeks, now=None):
+        """
+        Calcule la date limite d'archivage.
+
+        Args:
+            weeks (int): Ancienneté minimale de la réalisation, en semaines
+            now (datetime, optional): Instant de référence (maintenant par défaut)
+
+        Returns:
+            datetime: Les activités terminées avant cet instant sont archivables
+        """
+        return (now or datetime.now(timezone.utc)) - timedelta(weeks=weeks)
+
+    @classmethod
+    def archive_completed(cls, completed_before, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Déplace vers l'archive les activités terminées avant une date, par lots.
+
+        Chaque lot est une transaction courte : sélection des IDs (index partiel
+        ix_activities_completed_at), copie INSERT ... SELECT, suppression, retrait de la
+        charge hebdomadaire, commit. Le verrou d'écriture est relâché entre deux lots.
+
+        Args:
+            completed_before (datetime): Date de réalisation limite (exclue)
+            batch_size (int, optional): Nombre maximal d'activités par lot
+
+        Returns:
+            int: Nombre d'activités archivées, ou None en cas d'erreur (les lots déjà
+                 validés restent archivés)
+        """
+        from app.models.weekly_load import WeeklyLoad
+
+        source = [getattr(Activity, name) for name in COPIED_COLUMNS]
+        target = ['activity_id', *COPIED_COLUMNS, 'archived_at']
+        archived = 0
+
+        while True:
+            try:
+                ids = db.session.scalars(
+                    select(Activity.id)
+                    .where(Activity.is_completed == True, Activity.completed_at < completed_before)
+                    .order_by(Activity.completed_at)
+                    .limit(batch_size)
+                ).all()
+                if not ids:
+                    return archived
+
+                batch = Activity.id.in_(ids)
+                loads = db.session.execute(
+                    select(Activity.due_date, Activity.duration, Activity.is_completed).where(batch)
+                ).mappings().all()
+                db.session.execute(insert(cls).from_select(
+                    target,
+                    select(Activity.id, *source, literal(datetime.now(timezone.utc), db.DateTime)).where(batch)
+                ))
+                db.session.execute(delete(Activity).where(batch).execution_options(synchronize_session=False))
+                WeeklyLoad.apply_activity_rows(loads, sign=-1)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                return None
+
+            archived += len(ids)
+            if len(ids) < batch_size:
+                return archived
@@ -7,12 +7,58 @@ Output data: Objet List avec relations vers les sous-listes et activités associ
 Business constraints:
 - Le nom de la liste doit être unique
 - Une liste peut contenir plusieurs sous-listes et activités
-- La suppression d'une liste entraîne la suppression cascade de toutes ses sous-listes et activités
+- La suppression d'une liste entraîne la suppression cascade de toutes ses sous-listes et activités,
+  faite par SQLite (ON DELETE CASCADE, PRAGMA foreign_keys=ON) en une seule requête
 - Le code couleur par défaut est #3C91E6 (bleu)
+- Le catalogue (listes et sous-listes, sans activités) est mis en cache dans le processus,
+  invalidé à chaque commit modifiant une liste ou une sous-liste
+- Le contenu chargé pour le rendu (load_content) est en lecture seule : sous-listes
+  SublistContent et activités ActivityCard, sans objets ORM suivis par la session
 """
 
+import time
+import weakref
+from dataclasses import dataclass
 from app import db
 from datetime import datetime, timezone
+from flask import current_app
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+# Catalogues en cache par moteur : {engine: (catalogue, empreinte, instant de vérification)}
+_catalogs = weakref.WeakKeyDictionary()
+
+# Clé de session signalant qu'un commit doit invalider le catalogue
+CATALOG_DIRTY_KEY = 'catalog_dirty'
+
+
+@dataclass(frozen=True)
+class CatalogSublist:
+    """Entrée immuable du catalogue pour une sous-liste (id 0 = sous-liste virtuelle)"""
+    id: int
+    name: str
+    list_id: int
+    position: int
+
+
+@dataclass(frozen=True)
+class CatalogList:
+    """Entrée immuable du catalogue pour une liste et ses sous-listes ordonnées"""
+    id: int
+    name: str
+    color_code: str
+    sublists: tuple
+
+
+@dataclass(frozen=True)
+class SublistContent:
+    """Sous-liste en lecture seule avec ses cartes d'activités (id 0 = sous-liste virtuelle)"""
+    id: int
+    name: str
+    list_id: int
+    position: int
+    activities: list
+
 
 class List(db.Model):
     __tablename__ = 'lists'
@@ -24,9 +70,12 @@ class List(db.Model):
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     
     # Relations
-    sublists = db.relationship('Sublist', backref='parent_list', lazy=True, cascade='all, delete-orphan')
+    # Suppressions en cascade faites par SQLite (ON DELETE CASCADE) : les enfants ne sont
+    # pas chargés pour être supprimés un par un
+    sublists = db.relationship('Sublist', backref='parent_list', lazy=True, cascade='all, delete-orphan',
+                               passive_deletes=True)
     activities = db.relationship('Activity', backref='list', lazy=True, 
-                                cascade='all, delete-orphan', 
+                                cascade='all, delete-orphan', passive_deletes=True,
                                 primaryjoin="List.id == Activity.list_id")
     
     def __init__(self, name, color_code=None):
@@ -55,7 +104,231 @@ class List(db.Model):
     def get_all(cls):
         """Récupère toutes les listes triées par nom."""
         return cls.query.order_by(cls.name).all()
+
+    @classmethod
+    def get_existing_ids(cls, ids):
+        """
+        Retourne, parmi des IDs, ceux qui correspondent à une liste existante.
+        
+        Args:
+            ids (iterable): IDs à vérifier
+        
+        Returns:
+            set: IDs existants (une seule requête)
+        """
+        ids = set(ids)
+        if not ids:
+            return set()
+        return {row.id for row in db.session.query(cls.id).filter(cls.id.in_(ids))}
+
+    @classmethod
+    def get_catalog(cls):
+        """
+        Récupère le catalogue des listes et de leurs sous-listes (sans activités).
+        
+        Le catalogue est mis en cache dans le processus et vidé à chaque commit modifiant
+        une liste ou une sous-liste. Au-delà de CATALOG_CACHE_TTL secondes, une requête
+        d'empreinte (nombre et dernière modification des lignes) détecte les changements
+        faits par un autre processus (None = jamais).
+        
+        Returns:
+            tuple: Entrées CatalogList triées par nom, sous-liste virtuelle en tête
+        """
+        engine = db.engine
+        ttl = current_app.config.get('CATALOG_CACHE_TTL')
+        now = time.monotonic()
+        
+        entry = _catalogs.get(engine)
+        if entry:
+            catalog, fingerprint, checked_at = entry
+            if ttl is None or now - checked_at < ttl:
+                return catalog
+            if cls._catalog_fingerprint() == fingerprint:
+                _catalogs[engine] = (catalog, fingerprint, now)
+                return catalog
+        
+        from app.models.sublist import Sublist
+        
+        fingerprint = cls._catalog_fingerprint()
+        lists = cls.get_all()
+        sublists_by_list = Sublist.get_by_list_ids([list_obj.id for list_obj in lists])
+        catalog = tuple(
+            CatalogList(
+                id=list_obj.id,
+                name=list_obj.name,
+                color_code=list_obj.color_code,
+                sublists=tuple(
+                    CatalogSublist(id=sublist.id, name=sublist.name,
+                                   list_id=sublist.list_id, position=sublist.position)
+                    for sublist in sublists_by_list[list_obj.id]
+                )
+            )
+            for list_obj in lists
+        )
+        
+        _catalogs[engine] = (catalog, fingerprint, now)
+        return catalog
     
+    @classmethod
+    def _catalog_fingerprint(cls):
+        """Calcule en une requête l'empreinte des tables lists et sublists."""
+        from app.models.sublist import Sublist
+        
+        return tuple(db.session.execute(select(
+            select(func.count()).select_from(cls).scalar_subquery(),
+            select(func.max(cls.updated_at)).scalar_subquery(),
+            select(func.count()).select_from(Sublist).scalar_subquery(),
+            select(func.max(Sublist.updated_at)).scalar_subquery()
+        )).one())
+    
+    @classmethod
+    def invalidate_catalog(cls):
+        """Vide le catalogue en cache (toutes les bases du processus)."""
+        _catalogs.clear()
+
+    @classmethod
+    def get_with_content(cls, list_id):
+        """
+        Récupère une liste avec toute son arborescence en un nombre fixe de requêtes.
+
+        Les sous-listes et les activités sont chargées en deux requêtes puis regroupées
+        en Python : chaque sous-liste expose ses cartes d'activités (`activities`), sans
+        requête paresseuse lors du rendu. La sous-liste virtuelle 'Aucune sous-liste'
+        reçoit les activités sans sous-liste du même jeu de résultats.
+
+        Args:
+            list_id (int): ID de la liste
+
+        Returns:
+            tuple: (List, sous-listes, activités) ou None si la liste n'existe pas
+                - sous-listes: SublistContent, sous-liste virtuelle en tête puis sous-listes
+                  triées par position
+                - activités: ActivityCard de toutes les activités de la liste triées par position
+        """
+        list_obj = cls.get_by_id(list_id)
+        if not list_obj:
+            return None
+
+        return cls.load_content([list_obj])[0]
+
+    @classmethod
+    def get_sublist_content(cls, list_id, sublist_id):
+        """
+        Récupère une seule sous-liste d'une liste avec ses cartes d'activités.
+
+        Seules les activités de cette sous-liste sont lues, quelle que soit la taille
+        de la liste.
+
+        Args:
+            list_id (int): ID de la liste
+            sublist_id (int): ID de la sous-liste (0 = sous-liste virtuelle)
+
+        Returns:
+            tuple: (List, SublistContent) ou None si la liste n'existe pas ou si la
+                   sous-liste n'appartient pas à la liste
+        """
+        from app.models.sublist import Sublist
+        from app.models.activity import Activity
+
+        list_obj = cls.get_by_id(list_id)
+        if not list_obj:
+            return None
+
+        sublist = Sublist.get_by_id(sublist_id) if sublist_id else Sublist.build_virtual(list_id)
+        if not sublist or sublist.list_id != list_id:
+            return None
+
+        return list_obj, SublistContent(
+            id=sublist.id, name=sublist.name, list_id=list_id, position=sublist.position,
+            activities=Activity.get_cards_by_sublist(list_id, sublist.id)
+        )
+
+    @classmethod
+    def get_all_with_content(cls):
+        """
+        Récupère toutes les listes triées par nom avec leur arborescence.
+
+        Le nombre de requêtes est fixe (listes, sous-listes, activités), quel que soit
+        le nombre de listes.
+
+        Returns:
+            list: Tuples (List, sous-listes, activités), voir get_with_content
+        """
+        return cls.load_content(cls.get_all())
+
+    @classmethod
+    def load_content(cls, lists):
+        """
+        Charge en lot les sous-listes et activités d'un ensemble de listes.
+        
+        Les activités sont lues en projection (ActivityCard) et non hydratées en objets
+        ORM : le résultat est destiné au rendu, pas à la modification.
+
+        Args:
+            lists (list): Objets List déjà chargés
+
+        Returns:
+            list: Tuples (List, sous-listes, activités) dans l'ordre de `lists`
+        """
+        from app.models.sublist import Sublist
+        from app.models.activity import Activity
+
+        list_ids = [list_obj.id for list_obj in lists]
+        if not list_ids:
+            return []
+
+        sublists_by_list = Sublist.get_by_list_ids(list_ids)
+
+        activities_by_list = {list_id: [] for list_id in list_ids}
+        for activity in Activity.get_cards_by_list_ids(list_ids):
+            activities_by_list[activity.list_id].append(activity)
+
+        content = []
+        for list_obj in lists:
+            sublists = sublists_by_list[list_obj.id]
+            list_activities = activities_by_list[list_obj.id]
+
+            # Regroupement des activités par sous-liste (0 ou NULL = sous-liste virtuelle)
+            activities_by_sublist = {sublist.id: [] for sublist in sublists}
+            for activity in list_activities:
+                bucket = activities_by_sublist.get(activity.sublist_id or 0)
+                if bucket is not None:
+                    bucket.append(activity)
+
+            sublist_contents = [
+                SublistContent(id=sublist.id, name=sublist.name, list_id=sublist.list_id,
+                               position=sublist.position,
+                               activities=activities_by_sublist[sublist.id])
+                for sublist in sublists
+            ]
+
+            content.append((list_obj, sublist_contents, list_activities))
+
+        return content
+
+    @classmethod
+    def reorder_content(cls, list_id):
+        """
+        Renumérote en une seule transaction les sous-listes et tous les conteneurs
+        d'activités d'une liste (deux requêtes UPDATE ensemblistes).
+        
+        Args:
+            list_id (int): ID de la liste
+        
+        Returns:
+            bool: True si succès, False sinon
+        """
+        from app.models.sublist import Sublist
+        from app.models.activity import Activity
+
+        if not (Sublist.reorder_positions(list_id, commit=False)
+                and Activity.reorder_list_positions(list_id, commit=False)):
+            db.session.rollback()
+            return False
+
+        db.session.commit()
+        return True
+
     @classmethod
     def create(cls, data):
         """
@@ -111,10 +384,29 @@ class List(db.Model):
         
         return self
     
+    def count_content(self):
+        """
+        Compte en une seule requête les sous-listes et activités (courantes et archivées)
+        de cette liste.
+        
+        Returns:
+            dict: {'sublists': nombre, 'activities': nombre, 'archived_activities': nombre}
+        """
+        from app.models.sublist import Sublist
+        from app.models.activity import Activity
+        from app.models.archived_activity import ArchivedActivity
+        
+        sublists, activities, archived = db.session.execute(select(*(
+            select(func.count(model.id)).where(model.list_id == self.id).scalar_subquery()
+            for model in (Sublist, Activity, ArchivedActivity)
+        ))).one()
+        return {'sublists': sublists, 'activities': activities, 'archived_activities': archived}
+    
     def delete(self):
         """
         Supprime cette liste de la base de données.
-        Supprime également toutes les sous-listes et activités associées (cascade).
+        Les sous-listes et activités associées sont supprimées par SQLite (ON DELETE CASCADE)
+        dans la même requête DELETE, sans être chargées.
         
         Returns:
             str: Message de confirmation
@@ -124,3 +416,26 @@ class List(db.Model):
         db.session.commit()
         
         return f"Liste '{name}' supprimée avec succès"
+
+
+# Invalidation du catalogue : un flush touchant une liste ou une sous-liste marque la
+# session, le commit suivant vide le cache (un rollback annule le marquage)
+@event.listens_for(Session, 'after_flush')
+def _mark_catalog_dirty(session, flush_context):
+    from app.models.sublist import Sublist
+    
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, (List, Sublist)):
+            session.info[CATALOG_DIRTY_KEY] = True
+            return
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_catalog_on_commit(session):
+    if session.info.pop(CATALOG_DIRTY_KEY, False):
+        List.invalidate_catalog()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_catalog_mark(session):
+    session.info.pop(CATALOG_DIRTY_KEY, None)
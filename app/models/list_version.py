@@ -0,0 +1,140 @@
+"""
+File: app/models/list_version.py
+Role: Compteurs de version du contenu des listes
+Description: Table list_versions tenue à jour par des déclencheurs SQLite : un compteur
+             global (list_id 0) incrémenté à chaque écriture dans lists, sublists ou
+             activities, et pour chaque liste la valeur du compteur global lors de sa
+             dernière modification
+Input data: ID de liste
+Output data: Numéros de version (ETag des fragments /lists, /board, /list/<id>, /objectives)
+Business constraints:
+- Toute écriture est comptée, y compris les UPDATE ensemblistes, les suppressions en
+  cascade et l'archivage, qui ne passent pas par les objets ORM
+- Une liste prend la valeur courante du compteur global : deux états distincts d'une même
+  liste, ou une nouvelle liste réutilisant l'ID d'une liste supprimée, n'ont jamais la
+  même version
+- La ligne d'une liste est supprimée avec elle ; une version absente vaut 0
+- Seuls les déclencheurs écrivent dans cette table
+"""
+
+from sqlalchemy import DDL, event, select
+
+from app import db
+
+# ID réservé au compteur global (aucune liste n'a l'ID 0)
+GLOBAL_VERSION_ID = 0
+
+
+def _stamp(list_id, condition='1'):
+    """Instructions d'un déclencheur : incrémente le compteur global et l'attribue à une liste."""
+    return f"""
+        INSERT INTO list_versions (list_id, version) VALUES ({GLOBAL_VERSION_ID}, 1)
+            ON CONFLICT (list_id) DO UPDATE SET version = version + 1;
+        INSERT INTO list_versions (list_id, version)
+            SELECT {list_id}, version FROM list_versions
+            WHERE list_id = {GLOBAL_VERSION_ID} AND ({condition})
+              AND EXISTS (SELECT 1 FROM lists WHERE id = {list_id})
+            ON CONFLICT (list_id) DO UPDATE SET version = excluded.version;"""
+
+
+# Définitions reprises par la migration c6f1a2d9e8b3
+VERSION_TRIGGERS = {
+    f'trg_{table}_version_{action}': f"""
+    CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{action}
+    AFTER {action.upper()} ON {table}
+    BEGIN{body}
+    END
+    """
+    for table, column in (('activities', 'list_id'), ('sublists', 'list_id'))
+    for action, body in (
+        ('insert', _stamp(f'NEW.{column}')),
+        ('update', _stamp(f'NEW.{column}')
+                   + _stamp(f'OLD.{column}', f'OLD.{column} <> NEW.{column}')),
+        ('delete', _stamp(f'OLD.{column}')),
+    )
+}
+VERSION_TRIGGERS.update({
+    'trg_lists_version_insert': f"""
+    CREATE TRIGGER IF NOT EXISTS trg_lists_version_insert
+    AFTER INSERT ON lists
+    BEGIN{_stamp('NEW.id')}
+    END
+    """,
+    'trg_lists_version_update': f"""
+    CREATE TRIGGER IF NOT EXISTS trg_lists_version_update
+    AFTER UPDATE ON lists
+    BEGIN{_stamp('NEW.id')}
+    END
+    """,
+    'trg_lists_version_delete': f"""
+    CREATE TRIGGER IF NOT EXISTS trg_lists_version_delete
+    AFTER DELETE ON lists
+    BEGIN
+        INSERT INTO list_versions (list_id, version) VALUES ({GLOBAL_VERSION_ID}, 1)
+            ON CONFLICT (list_id) DO UPDATE SET version = version + 1;
+        DELETE FROM list_versions WHERE list_id = OLD.id;
+    END
+    """,
+})
+
+
+class ListVersion(db.Model):
+    __tablename__ = 'list_versions'
+
+    # 0 = compteur global, sinon ID de la liste (sans clé étrangère : ligne supprimée
+    # par trg_lists_version_delete)
+    list_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    version = db.Column(db.Integer, nullable=False)
+
+    def __repr__(self):
+        return f'<ListVersion {self.list_id}: {self.version}>'
+
+    @classmethod
+    def get_global(cls):
+        """
+        Récupère le compteur global (toute écriture dans les listes, sous-listes ou activités).
+
+        Returns:
+            int: Version globale, 0 si aucune écriture n'a encore été comptée
+        """
+        return db.session.scalar(
+            select(cls.version).where(cls.list_id == GLOBAL_VERSION_ID)
+        ) or 0
+
+    @classmethod
+    def get_for_list(cls, list_id):
+        """
+        Récupère la version d'une liste (dernière modification de la liste, de ses
+        sous-listes ou de ses activités).
+
+        Args:
+            list_id (int): ID de la liste
+
+        Returns:
+            int: Version de la liste, 0 si elle n'a pas de version enregistrée
+        """
+        return db.session.scalar(select(cls.version).where(cls.list_id == list_id)) or 0
+
+    @classmethod
+    def get_for_lists(cls, list_ids):
+        """
+        Récupère en une requête les versions de plusieurs listes.
+
+        Args:
+            list_ids (iterable): IDs des listes
+
+        Returns:
+            dict: {list_id: version}, 0 pour une liste sans version enregistrée
+        """
+        list_ids = set(list_ids)
+        versions = dict.fromkeys(list_ids, 0)
+        if list_ids:
+            versions.update(db.session.execute(
+                select(cls.list_id, cls.version).where(cls.list_id.in_(list_ids))
+            ).tuples().all())
+        return versions
+
+
+# Déclencheurs créés avec le schéma (db.create_all)
+for statement in VERSION_TRIGGERS.values():
+    event.listen(db.metadata, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
@@ -9,11 +9,60 @@ Business constraints:
 - L'heure de début de journée est au format HH:MM
 - Le nombre d'unités par jour est limité à un entier positif
 - La WIP limit ne peut pas dépasser (units_per_day * 7)
+- Les lectures passent par un instantané immuable mis en cache dans le processus,
+  revalidé par le compteur `version` (incrémenté à chaque mise à jour)
 """
 
+import time
+import weakref
+from dataclasses import dataclass
 from datetime import datetime
+from flask import current_app
 from app import db
 
+# Instantanés en cache par moteur : {engine: (SettingsSnapshot, instant de vérification)}
+_snapshots = weakref.WeakKeyDictionary()
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """
+    Copie immuable des paramètres, partageable entre requêtes sans accès à la base
+    """
+    id: int
+    time_unit_minutes: int
+    day_start_time: str
+    time_units_per_day: int
+    wip_limit: int
+    version: int
+    
+    @classmethod
+    def from_model(cls, settings):
+        """Construit un instantané à partir d'une instance Settings"""
+        return cls(
+            id=settings.id,
+            time_unit_minutes=settings.time_unit_minutes,
+            day_start_time=settings.day_start_time,
+            time_units_per_day=settings.time_units_per_day,
+            wip_limit=settings.wip_limit,
+            version=settings.version
+        )
+    
+    def to_dict(self):
+        """
+        Convertit l'instantané en dictionnaire (même format que Settings.to_dict)
+        
+        Returns:
+            dict: Dictionnaire des paramètres
+        """
+        return {
+            'time_unit_minutes': self.time_unit_minutes,
+            'day_start_time': self.day_start_time,
+            'time_units_per_day': self.time_units_per_day,
+            'wip_limit': self.wip_limit
+        }
+
+
 class Settings(db.Model):
     """
     Modèle de données pour les paramètres de l'application
@@ -28,6 +77,8 @@ class Settings(db.Model):
     day_start_time = db.Column(db.String(5), nullable=False, default="09:00")
     time_units_per_day = db.Column(db.Integer, nullable=False, default=20)
     wip_limit = db.Column(db.Integer, nullable=False, default=100)
+    # Compteur incrémenté à chaque mise à jour (revalidation du cache entre processus)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -114,6 +165,46 @@ class Settings(db.Model):
             db.session.rollback()
             return None
     
+    @classmethod
+    def get_cached(cls):
+        """
+        Récupère un instantané immuable des paramètres depuis le cache du processus
+        
+        Aucune requête n'est émise tant que le cache a été vérifié il y a moins de
+        SETTINGS_CACHE_TTL secondes. Au-delà, seule la colonne `version` est relue
+        pour détecter une mise à jour faite par un autre processus (None = jamais).
+            
+        Returns:
+            SettingsSnapshot: Paramètres courants, ou None en cas d'erreur
+        """
+        engine = db.engine
+        ttl = current_app.config.get('SETTINGS_CACHE_TTL')
+        now = time.monotonic()
+        
+        entry = _snapshots.get(engine)
+        if entry:
+            snapshot, checked_at = entry
+            if ttl is None or now - checked_at < ttl:
+                return snapshot
+            
+            version = db.session.query(cls.version).filter_by(id=snapshot.id).scalar()
+            if version == snapshot.version:
+                _snapshots[engine] = (snapshot, now)
+                return snapshot
+        
+        settings = cls.get_settings()
+        if not settings:
+            return None
+        
+        snapshot = SettingsSnapshot.from_model(settings)
+        _snapshots[engine] = (snapshot, now)
+        return snapshot
+    
+    @classmethod
+    def invalidate_cache(cls):
+        """Vide le cache des paramètres pour la base de l'application courante"""
+        _snapshots.pop(db.engine, None)
+    
     @classmethod
     def get_by_id(cls, id):
         """
@@ -127,35 +218,37 @@ class Settings(db.Model):
         """
         return db.session.get(cls, id)
     
-@classmethod
-def update(cls, data):
-    """
-    Met à jour les paramètres de l'application
-    
-    Args:
-        data (dict): Dictionnaire des champs à mettre à jour
-    
-    Returns:
-        Settings: Instance mise à jour, ou None en cas d'erreur
-    """
-    try:
-        settings = cls.get_settings()
-        if not settings:
-            return None
+    @classmethod
+    def update(cls, data):
+        """
+        Met à jour les paramètres de l'application
         
-        # Mise à jour des champs
-        for key, value in data.items():
-            if hasattr(settings, key):
-                setattr(settings, key, value)
+        Args:
+            data (dict): Dictionnaire des champs à mettre à jour
         
-        # Valider les paramètres
-        is_valid, _ = settings.validate()
-        if not is_valid:
+        Returns:
+            Settings: Instance mise à jour, ou None en cas d'erreur
+        """
+        try:
+            settings = cls.get_settings()
+            if not settings:
+                return None
+            
+            # Mise à jour des champs
+            for key, value in data.items():
+                if hasattr(settings, key):
+                    setattr(settings, key, value)
+            
+            # Valider les paramètres
+            is_valid, _ = settings.validate()
+            if not is_valid:
+                db.session.rollback()
+                return None
+            
+            settings.version = (settings.version or 0) + 1
+            db.session.commit()
+            cls.invalidate_cache()
+            return settings
+        except Exception as e:
             db.session.rollback()
-            return None
-        
-        db.session.commit()
-        return settings
-    except Exception as e:
-        db.session.rollback()
-        return None
\ No newline at end of file
+            return None
\ No newline at end of file
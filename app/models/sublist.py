@@ -7,11 +7,27 @@ Output data: Objet Sublist avec relations vers ses activités associées
 Business constraints:
 - Une sous-liste doit obligatoirement appartenir à une liste parente
 - Le nom d'une sous-liste doit être unique au sein d'une même liste parente
-- La suppression d'une sous-liste entraîne la suppression cascade de toutes ses activités
+- La suppression d'une sous-liste entraîne la suppression cascade de toutes ses activités,
+  faite en base par le déclencheur trg_sublists_delete_activities (activities.sublist_id n'a
+  pas de clé étrangère à cause de la valeur sentinelle 0)
 - La position permet d'ordonner les sous-listes au sein d'une même liste
 """
 from app import db
 from datetime import datetime, timezone
+from sqlalchemy import DDL, event, func, select
+from app.utils.position_utils import renumber_positions
+from app.models.list import CATALOG_DIRTY_KEY
+
+# Cascade sous-liste → activités (et activités archivées) faite par SQLite, aussi lors
+# d'une cascade depuis la liste. Même définition dans la migration a93e5b17c4d0
+SUBLIST_DELETE_TRIGGER = DDL("""
+CREATE TRIGGER IF NOT EXISTS trg_sublists_delete_activities
+AFTER DELETE ON sublists
+BEGIN
+    DELETE FROM activities WHERE sublist_id = OLD.id;
+    DELETE FROM archived_activities WHERE sublist_id = OLD.id;
+END
+""")
 
 class Sublist(db.Model):
     __tablename__ = 'sublists'
@@ -26,11 +42,12 @@ class Sublist(db.Model):
     
     # Relations
     activities = db.relationship('Activity', backref='sublist', lazy=True, 
-                                cascade='all, delete-orphan',
-                                primaryjoin="Sublist.id == Activity.sublist_id")
+                                cascade='all, delete-orphan', passive_deletes=True,
+                                primaryjoin="Sublist.id == foreign(Activity.sublist_id)")
     
     __table_args__ = (
         db.UniqueConstraint('name', 'list_id', name='uix_sublist_name_list'),
+        db.Index('ix_sublists_list_position', 'list_id', 'position'),
     )
     
     def __init__(self, name, list_id, position=0):
@@ -60,17 +77,102 @@ class Sublist(db.Model):
     @classmethod
     def get_by_list_id(cls, list_id):
         """Récupère toutes les sous-listes d'une liste spécifique, y compris la sous-liste virtuelle."""
-        sublists = cls.query.filter_by(list_id=list_id).order_by(cls.position).all()
+        sublists = cls.query.filter_by(list_id=list_id).order_by(cls.position, cls.id).all()
+        
+        # Insérer la sous-liste virtuelle au début
+        sublists.insert(0, cls.build_virtual(list_id))
+        
+        return sublists
+    
+    @classmethod
+    def get_by_list_ids(cls, list_ids):
+        """
+        Récupère en une seule requête les sous-listes de plusieurs listes.
         
-        # Ajouter la sous-liste virtuelle au début de la liste
-        # Créer un objet Sublist virtuel (non persisté en base)
+        Args:
+            list_ids (list): IDs des listes parentes
+        
+        Returns:
+            dict: {list_id: [sous-liste virtuelle, sous-listes triées par position]}
+        """
+        sublists_by_list = {list_id: [cls.build_virtual(list_id)] for list_id in list_ids}
+        if not list_ids:
+            return sublists_by_list
+        
+        sublists = cls.query.filter(cls.list_id.in_(list_ids)).order_by(
+            cls.list_id, cls.position, cls.id
+        ).all()
+        for sublist in sublists:
+            sublists_by_list[sublist.list_id].append(sublist)
+        
+        return sublists_by_list
+    
+    @classmethod
+    def get_owners(cls, ids):
+        """
+        Récupère la liste parente de plusieurs sous-listes en une seule requête.
+        
+        Lu en base à chaque appel (recherche par clé primaire), dans la transaction de
+        l'écriture qui valide : une sous-liste supprimée ou déplacée par un autre processus
+        n'est jamais acceptée.
+        
+        Args:
+            ids (iterable): IDs des sous-listes
+        
+        Returns:
+            dict: {sublist_id: list_id} pour les sous-listes existantes
+        """
+        ids = set(ids)
+        if not ids:
+            return {}
+        return dict(db.session.query(cls.id, cls.list_id).filter(cls.id.in_(ids)).all())
+    
+    @classmethod
+    def build_virtual(cls, list_id):
+        """
+        Construit la sous-liste virtuelle 'Aucune sous-liste' (non persistée en base).
+        
+        Args:
+            list_id (int): ID de la liste parente
+        
+        Returns:
+            Sublist: Objet transitoire dont l'ID est forcé à 0
+        """
         virtual_sublist = cls(name='Aucune sous-liste', list_id=list_id, position=0)
         virtual_sublist.id = 0  # Forcer l'ID à 0 pour la sous-liste virtuelle
+        return virtual_sublist
     
-        # Insérer la sous-liste virtuelle au début
-        sublists.insert(0, virtual_sublist)
+    @classmethod
+    def reorder_positions(cls, list_id, commit=True):
+        """
+        Réorganise les positions des sous-listes d'une liste (1, 2, 3...) en une seule requête.
         
-        return sublists
+        Args:
+            list_id (int): ID de la liste parente
+            commit (bool, optional): Valide la transaction (sinon point de sauvegarde,
+                seul annulé en cas d'échec : le travail en cours de l'appelant est conservé)
+        
+        Returns:
+            bool: True si succès, False sinon
+        """
+        if not commit:
+            try:
+                with db.session.begin_nested():
+                    renumber_positions(cls, (cls.list_id == list_id,), gap=1)
+                # Requête ensembliste hors unité de travail : invalidation explicite du catalogue
+                db.session.info[CATALOG_DIRTY_KEY] = True
+                return True
+            except Exception as e:
+                return False
+        
+        try:
+            renumber_positions(cls, (cls.list_id == list_id,), gap=1)
+            db.session.info[CATALOG_DIRTY_KEY] = True
+            db.session.commit()
+            return True
+        except Exception as e:
+            db.session.rollback()
+            return False
     
     @classmethod
     def exists_with_name_in_list(cls, name, list_id, exclude_id=None):
@@ -141,11 +243,30 @@ class Sublist(db.Model):
             db.session.rollback()
             return None
     
+    def count_content(self):
+        """
+        Compte en une seule requête les activités (courantes et archivées) de cette sous-liste.
+        
+        Returns:
+            dict: {'activities': nombre, 'archived_activities': nombre}
+        """
+        from app.models.activity import Activity
+        from app.models.archived_activity import ArchivedActivity
+        
+        activities, archived = db.session.execute(select(*(
+            select(func.count(model.id)).where(model.sublist_id == self.id).scalar_subquery()
+            for model in (Activity, ArchivedActivity)
+        ))).one()
+        return {'activities': activities, 'archived_activities': archived}
+    
     @classmethod
     def delete(cls, id):
         """
         Supprime une sous-liste et toutes ses activités associées.
         
+        Les activités sont supprimées par le déclencheur trg_sublists_delete_activities
+        dans la même requête DELETE, sans être chargées.
+        
         Args:
             id (int): ID de la sous-liste à supprimer
         
@@ -162,4 +283,8 @@ class Sublist(db.Model):
             return True
         except Exception as e:
             db.session.rollback()
-            return False
\ No newline at end of file
+            return False
+
+
+# Déclencheur créé avec le schéma (db.create_all), une fois toutes les tables créées
+event.listen(db.metadata, 'after_create', SUBLIST_DELETE_TRIGGER.execute_if(dialect='sqlite'))
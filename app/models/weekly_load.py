@@ -0,0 +1,311 @@
+"""
+File: app/models/weekly_load.py
+Role: Modèle de données pour la charge hebdomadaire
+Description: Compteurs de charge par semaine ISO (nombre d'activités, unités de temps,
+             répartition par durée, activités terminées), tenus à jour dans la même
+             transaction que les écritures d'activités
+Input data: Lundi de la semaine, variations des compteurs calculées à chaque flush
+Output data: Objet WeeklyLoad, statistiques au format wip_utils.calculate_activities_stats
+Business constraints:
+- Une ligne par semaine (clé primaire week_start = lundi), absente tant qu'aucune
+  activité n'y a été rattachée ; une ligne à zéro équivaut à une ligne absente
+- Une activité compte dans la semaine de sa due_date (sans échéance : aucune semaine)
+- Création, suppression ou modification de durée, d'échéance ou de statut d'une activité
+  par l'ORM : compteurs mis à jour avant le flush, dans la même transaction
+- Suppression d'une liste ou d'une sous-liste (activités supprimées en cascade par SQLite) :
+  apport de ses activités retiré en une requête d'agrégation avant le flush
+- Les insertions en lot (Activity.create_many) appliquent explicitement leurs variations
+- WeeklyLoad.rebuild régénère la table depuis les activités, WeeklyLoad.check la compare
+  aux données réelles (commandes `flask weekly-load rebuild` et `flask weekly-load check`)
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+
+from sqlalchemy import case, event, func, inspect, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.activity import Activity, DurationSize
+from app.models.list import List
+from app.models.sublist import Sublist
+from app.utils.wip_utils import TIME_UNITS, build_activities_stats
+
+# Compteurs maintenus pour chaque semaine
+COUNTERS = ('activities_count', 'total_time_units', 'small_count', 'medium_count',
+            'large_count', 'completed_count')
+
+# Compteur de répartition associé à chaque code de durée
+DURATION_COUNTERS = {'S': 'small_count', 'M': 'medium_count', 'L': 'large_count'}
+
+# Attributs d'une activité qui influent sur la charge
+TRACKED_ATTRIBUTES = ('due_date', 'duration', 'is_completed')
+
+
+class WeeklyLoad(db.Model):
+    __tablename__ = 'weekly_load'
+
+    week_start = db.Column(db.Date, primary_key=True)  # Lundi de la semaine
+    activities_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    total_time_units = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    small_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    medium_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    large_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    completed_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    def __repr__(self):
+        return f'<WeeklyLoad {self.week_start}>'
+
+    def to_dict(self):
+        return {
+            'week_start': self.week_start.isoformat(),
+            **{counter: getattr(self, counter) for counter in COUNTERS}
+        }
+
+    @staticmethod
+    def week_of(day):
+        """Retourne le lundi de la semaine ISO contenant `day`."""
+        return day - timedelta(days=day.weekday())
+
+    @classmethod
+    def get_stats(cls, week_start):
+        """
+        Récupère les statistiques d'une semaine par une lecture sur clé primaire.
+
+        Args:
+            week_start (date): Un jour de la semaine (ramené au lundi)
+
+        Returns:
+            dict: Statistiques au format wip_utils.calculate_activities_stats
+                  (compteurs à zéro si la semaine n'a pas de ligne)
+        """
+        load = db.session.get(cls, cls.week_of(week_start))
+        values = {counter: getattr(load, counter) if load else 0 for counter in COUNTERS}
+        return _stats_from_counters(values)
+
+    # ==================================================================
+    # Maintenance incrémentale
+    # ==================================================================
+
+    @staticmethod
+    def contribution(due_date, duration, is_completed):
+        """
+        Calcule l'apport d'une activité aux compteurs de sa semaine.
+
+        Args:
+            due_date (date): Échéance de l'activité
+            duration (DurationSize|str): Durée de l'activité
+            is_completed (bool): Statut de complétion
+
+        Returns:
+            tuple: (lundi de la semaine, {compteur: valeur}) ou None si pas d'échéance
+        """
+        if due_date is None:
+            return None
+        code = duration.value if isinstance(duration, DurationSize) else duration
+        values = dict.fromkeys(COUNTERS, 0)
+        values['activities_count'] = 1
+        values['total_time_units'] = TIME_UNITS.get(code, 0)
+        if code in DURATION_COUNTERS:
+            values[DURATION_COUNTERS[code]] = 1
+        if is_completed:
+            values['completed_count'] = 1
+        return WeeklyLoad.week_of(due_date), values
+
+    @classmethod
+    def apply_deltas(cls, deltas, session=None):
+        """
+        Ajoute des variations aux compteurs en une seule requête (UPSERT).
+
+        Ne valide pas la transaction : les variations sont écrites avec les activités
+        qui les ont produites.
+
+        Args:
+            deltas (dict): {lundi: {compteur: variation}}
+            session (Session, optional): Session à utiliser (db.session par défaut)
+        """
+        rows = [
+            {'week_start': week_start, **values}
+            for week_start, values in deltas.items()
+            if any(values.values())
+        ]
+        if not rows:
+            return
+
+        table = cls.__table__
+        statement = sqlite_insert(table).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.week_start],
+            set_={counter: table.c[counter] + statement.excluded[counter] for counter in COUNTERS}
+        )
+        (session or db.session).execute(statement)
+
+    @classmethod
+    def apply_activity_rows(cls, rows, sign=1):
+        """
+        Répercute des activités insérées (ou supprimées avec sign=-1) hors de l'ORM.
+
+        Args:
+            rows (iterable): Dictionnaires contenant due_date, duration et is_completed
+            sign (int, optional): 1 pour un ajout, -1 pour un retrait
+        """
+        deltas = _Deltas()
+        for row in rows:
+            deltas.add(cls.contribution(row.get('due_date'), row.get('duration'),
+                                        row.get('is_completed')), sign)
+        cls.apply_deltas(deltas)
+
+    # ==================================================================
+    # Reconstruction et vérification
+    # ==================================================================
+
+    @classmethod
+    def _live_counters(cls, *criteria, session=None):
+        """
+        Recalcule les compteurs par semaine depuis la table activities.
+        
+        Args:
+            *criteria: Filtres optionnels sur les activités (toutes par défaut)
+            session (Session, optional): Session à utiliser (db.session par défaut)
+        """
+        week = func.date(Activity.due_date, 'weekday 0', '-6 days')
+        units = case(
+            *((Activity.duration == DurationSize(code), value) for code, value in TIME_UNITS.items()),
+            else_=0
+        )
+        count_of = lambda condition: func.sum(case((condition, 1), else_=0))
+
+        statement = select(
+            week.label('week_start'),
+            func.count(Activity.id),
+            func.sum(units),
+            *(count_of(Activity.duration == DurationSize(code)) for code in DURATION_COUNTERS),
+            count_of(Activity.is_completed == True)
+        ).where(Activity.due_date.isnot(None), *criteria).group_by(week)
+
+        return {
+            date.fromisoformat(row[0]): dict(zip(COUNTERS, row[1:]))
+            for row in (session or db.session).execute(statement)
+        }
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Régénère entièrement la table depuis les activités (une transaction).
+
+        Returns:
+            int: Nombre de semaines écrites, ou None en cas d'erreur
+        """
+        try:
+            live = cls._live_counters()
+            db.session.execute(cls.__table__.delete())
+            if live:
+                db.session.execute(cls.__table__.insert(), [
+                    {'week_start': week_start, **values} for week_start, values in live.items()
+                ])
+            db.session.commit()
+            return len(live)
+        except Exception as e:
+            db.session.rollback()
+            return None
+
+    @classmethod
+    def check(cls):
+        """
+        Compare les compteurs enregistrés aux données réelles.
+
+        Returns:
+            list: Écarts {week_start, stored, expected} triés par semaine (vide si cohérent)
+        """
+        zero = dict.fromkeys(COUNTERS, 0)
+        live = cls._live_counters()
+        stored = {
+            load.week_start: {counter: getattr(load, counter) for counter in COUNTERS}
+            for load in cls.query.all()
+        }
+
+        mismatches = []
+        for week_start in sorted(live.keys() | stored.keys()):
+            expected = live.get(week_start, zero)
+            actual = stored.get(week_start, zero)
+            if expected != actual:
+                mismatches.append({'week_start': week_start, 'stored': actual, 'expected': expected})
+        return mismatches
+
+
+def _stats_from_counters(values):
+    """Convertit les compteurs d'une semaine au format wip_utils.calculate_activities_stats."""
+    return build_activities_stats(
+        values['total_time_units'],
+        values['activities_count'],
+        {code: values[counter] for code, counter in DURATION_COUNTERS.items()},
+        values['completed_count']
+    )
+
+
+class _Deltas(defaultdict):
+    """Variations des compteurs regroupées par semaine."""
+
+    def __init__(self):
+        super().__init__(lambda: dict.fromkeys(COUNTERS, 0))
+
+    def add(self, contribution, sign):
+        if contribution is None:
+            return
+        week_start, values = contribution
+        bucket = self[week_start]
+        for counter, value in values.items():
+            bucket[counter] += sign * value
+
+
+# ==================================================================
+# Maintenance à chaque flush
+# ==================================================================
+
+@event.listens_for(Session, 'before_flush')
+def _track_weekly_load(session, flush_context, instances):
+    """
+    Répercute sur weekly_load les activités créées, supprimées ou modifiées.
+
+    L'état d'origine des activités supprimées ou modifiées est relu en base (une requête)
+    avant que le flush ne l'écrase ; le nouvel état provient des objets en mémoire.
+    Les activités des listes et sous-listes supprimées (cascade en base, hors ORM) sont
+    retirées par une requête d'agrégation.
+    """
+    created = [obj for obj in session.new if isinstance(obj, Activity)]
+    deleted = [obj for obj in session.deleted if isinstance(obj, Activity)]
+    modified = [
+        obj for obj in session.dirty
+        if isinstance(obj, Activity) and obj not in session.deleted
+        and any(inspect(obj).attrs[name].history.has_changes() for name in TRACKED_ATTRIBUTES)
+    ]
+    deleted_lists = [obj.id for obj in session.deleted if isinstance(obj, List)]
+    deleted_sublists = [obj.id for obj in session.deleted if isinstance(obj, Sublist)]
+    if not (created or deleted or modified or deleted_lists or deleted_sublists):
+        return
+
+    deltas = _Deltas()
+
+    previous_ids = [obj.id for obj in deleted + modified if obj.id is not None]
+    if previous_ids:
+        previous = session.execute(
+            select(Activity.due_date, Activity.duration, Activity.is_completed)
+            .where(Activity.id.in_(previous_ids))
+        )
+        for row in previous:
+            deltas.add(WeeklyLoad.contribution(*row), -1)
+
+    if deleted_lists or deleted_sublists:
+        cascaded = WeeklyLoad._live_counters(
+            or_(Activity.list_id.in_(deleted_lists), Activity.sublist_id.in_(deleted_sublists)),
+            Activity.id.notin_(previous_ids),
+            session=session
+        )
+        for contribution in cascaded.items():
+            deltas.add(contribution, -1)
+
+    for obj in created + modified:
+        deltas.add(WeeklyLoad.contribution(obj.due_date, obj.duration, obj.is_completed), 1)
+
+    WeeklyLoad.apply_deltas(deltas, session)
@@ -12,17 +12,68 @@ Données produites: Réponses HTTP pour la gestion des activités
 Contraintes:
 - Ne doit jamais accéder directement aux modèles
 - Toute la logique métier doit être déléguée aux contrôleurs
+- Les modifications d'activités rafraîchissent uniquement les sous-listes concernées :
+  conteneurs rendus hors bande pour une requête HTMX, sinon en-tête HX-Trigger
+  sublistRefresh-<list_id>-<sublist_id>
 """
 
 from flask import render_template, request, jsonify
 from werkzeug.exceptions import NotFound
 
 # Importation du décorateur qui gère les formats des données de requête
-from app.utils.request_format_utils import parse_request_data
+from app.utils.request_format_utils import parse_request_data, is_htmx_request
 
 # Importation des contrôleurs nécessaires
 from app.controllers import ctrl_activity, ctrl_list
 
+
+def _sublist_refresh(response, *containers):
+    """
+    Ajoute à une réponse l'en-tête HX-Trigger rafraîchissant des conteneurs d'activités.
+    
+    Chaque conteneur affiché écoute l'événement sublistRefresh-<list_id>-<sublist_id>
+    (voir components/sublist_container.html) et recharge seulement sa sous-liste.
+    
+    Args:
+        response: Réponse Flask
+        *containers: Couples (list_id, sublist_id) ; sublist_id 0 ou None = sans sous-liste
+    
+    Returns:
+        Response: La réponse
+    """
+    events = dict.fromkeys(f'sublistRefresh-{list_id}-{sublist_id or 0}'
+                           for list_id, sublist_id in containers if list_id)
+    if events:
+        response.headers['HX-Trigger'] = ', '.join(events)
+    return response
+
+def _activity_changes(payload, status, *containers):
+    """
+    Construit la réponse d'une modification d'activité.
+    
+    Pour une requête HTMX, les conteneurs concernés sont rendus hors bande
+    (components/activity_changes.html) et remplacent ceux affichés sans second
+    aller-retour ; sinon, réponse JSON avec l'en-tête HX-Trigger de _sublist_refresh.
+    
+    Args:
+        payload (dict): Corps de la réponse JSON
+        status (int): Code HTTP
+        *containers: Couples (list_id, sublist_id) ; sublist_id 0 ou None = sans sous-liste
+    
+    Returns:
+        tuple: (réponse, code HTTP)
+    """
+    if not is_htmx_request():
+        return _sublist_refresh(jsonify(payload), *containers), status
+    
+    contents = []
+    for list_id, sublist_id in dict.fromkeys((list_id, sublist_id or 0)
+                                             for list_id, sublist_id in containers if list_id):
+        success, content = ctrl_list.get_sublist_content(list_id, sublist_id)
+        if success:
+            contents.append(content)
+    return render_template('components/activity_changes.html', containers=contents), status
+
 def register_activity_routes(app):
     """
     Enregistre les routes pour la gestion des activités.
@@ -54,15 +105,15 @@ def register_activity_routes(app):
         if not success:
             return NotFound(activity_data)
         
-        # Récupérer les listes et sous-listes pour le formulaire
-        lists = ctrl_list.get_all_lists()
+        # Récupérer les listes et sous-listes pour le formulaire (catalogue en cache)
+        lists = ctrl_list.get_catalog()
         
         # Si l'activité est dans une liste, récupérer ses sous-listes
         sublists = []
         if activity_data.list_id:
-            success, data = ctrl_list.get_list_with_content(activity_data.list_id)
+            success, data = ctrl_list.get_catalog_sublists(activity_data.list_id)
             if success:
-                sublists = data["sublists"]
+                sublists = data
         
         return render_template('modals/create_edit_activity_modal.html', 
                             title="Modifier une activité",
@@ -112,11 +163,98 @@ def register_activity_routes(app):
         Retourne:
         - Rendu HTML du formulaire de création d'activité
         """
-        lists = ctrl_list.get_all_lists()
+        lists = ctrl_list.get_catalog()
         return render_template('modals/create_edit_activity_modal.html', 
                             title="Créer une activité",
                             lists=lists)
 
+    @app.route('/activities', methods=['GET'])
+    @parse_request_data
+    def list_activities():
+        """
+        Liste les activités en JSON, par pages.
+        
+        Paramètres de requête (tous optionnels):
+        - list_id, sublist_id, is_completed: filtres
+        - limit: taille de page
+        - cursor: valeur de next_cursor reçue avec la page précédente
+        
+        Retourne:
+        - Si succès: Réponse JSON {"activities", "next_cursor"} (next_cursor null sur la dernière page)
+        - Si échec: Réponse JSON avec le message d'erreur
+        """
+        params = request.parsed_data
+        success, data = ctrl_activity.get_activities_page(
+            list_id=params.get('list_id'),
+            sublist_id=params.get('sublist_id'),
+            is_completed=params.get('is_completed'),
+            cursor=params.get('cursor'),
+            limit=params.get('limit')
+        )
+        
+        if not success:
+            return jsonify({"error": data}), 400
+        
+        return jsonify({
+            "activities": [activity.to_dict() for activity in data["activities"]],
+            "next_cursor": data["next_cursor"]
+        })
+
+    @app.route('/activities/completed', methods=['GET'])
+    @parse_request_data
+    def list_completed_activities():
+        """
+        Liste en JSON l'historique des activités terminées (les plus récentes en premier).
+        
+        Paramètres de requête (tous optionnels):
+        - list_id: filtre par liste
+        - date_from, date_to: jours de réalisation (YYYY-MM-DD, inclus)
+        - include_archived: true pour inclure les activités archivées
+        - limit: nombre maximal d'entrées
+        
+        Retourne:
+        - Si succès: Réponse JSON {"activities"} (chaque entrée indique is_archived)
+        - Si échec: Réponse JSON avec le message d'erreur
+        """
+        params = request.parsed_data
+        success, data = ctrl_activity.get_completed_history(
+            list_id=params.get('list_id'),
+            date_from=params.get('date_from'),
+            date_to=params.get('date_to'),
+            include_archived=params.get('include_archived', False),
+            limit=params.get('limit')
+        )
+        
+        if not success:
+            return jsonify({"error": data}), 400
+        
+        return jsonify({"activities": [entry.to_dict() for entry in data]})
+
+    @app.route('/activities/search', methods=['GET'])
+    @parse_request_data
+    def search_activities():
+        """
+        Recherche les activités par mots du titre, de la sous-liste ou de la liste.
+        
+        Cette route est appelée par HTMX à la saisie dans le champ de recherche.
+        
+        Paramètres de requête:
+        - q: texte recherché (chaque mot comme préfixe)
+        - limit (optionnel): nombre maximal de résultats
+        
+        Retourne:
+        - Rendu HTML des résultats classés par pertinence, avec liste et sous-liste
+        - Erreur 400 si limit est invalide
+        """
+        params = request.parsed_data
+        query = params.get('q') or ''
+        success, data = ctrl_activity.search_activities(query, params.get('limit'))
+        
+        if not success:
+            return jsonify({"error": data}), 400
+        
+        return render_template('components/search_results.html', results=data, query=query)
+
     @app.route('/activities', methods=['POST'])
     @parse_request_data
     def new_activity():
@@ -126,7 +264,9 @@ def register_activity_routes(app):
         Cette route est appelée par HTMX lors de la soumission du formulaire de création.
         
         Retourne:
-        - Si succès: Réponse JSON avec l'activité créée
+        - Si succès (HTMX): Conteneur de sa sous-liste, rendu hors bande
+        - Si succès: Réponse JSON avec l'activité créée et un en-tête HX-Trigger
+          rafraîchissant sa sous-liste
         - Si échec: Réponse JSON avec le message d'erreur
         """
         success, data = ctrl_activity.create_activity(request.parsed_data)
@@ -134,7 +274,76 @@ def register_activity_routes(app):
         if not success:
             return jsonify({"error": data}), 400
         
-        return jsonify(data.to_dict()), 201
+        return _activity_changes(data.to_dict(), 201, (data.list_id, data.sublist_id))
+
+    @app.route('/activities/bulk', methods=['POST'])
+    @parse_request_data
+    def new_activities_bulk():
+        """
+        Crée plusieurs activités en une seule requête.
+        
+        Le corps JSON est un tableau d'activités (mêmes champs que /activities)
+        ou un objet {"activities": [...]}. La création se fait en une seule
+        transaction ; les éléments invalides sont signalés sans bloquer les autres.
+        
+        Retourne:
+        - 201 si toutes les activités sont créées, 207 si certaines sont en échec
+        - Réponse JSON {"created", "failed", "results"} avec un résultat par élément,
+          et un en-tête HX-Trigger rafraîchissant les sous-listes des activités créées
+        - 400 si le corps n'est pas un tableau d'activités
+        """
+        items = request.parsed_data
+        if isinstance(items, dict):
+            items = items.get('activities')
+        
+        success, results = ctrl_activity.create_activities(items)
+        
+        if not success:
+            return jsonify({"error": results}), 400
+        
+        payload = []
+        for result in results:
+            if result["success"]:
+                payload.append({"index": result["index"], "success": True,
+                                "activity": result["activity"].to_dict()})
+            else:
+                payload.append(result)
+        
+        failed = sum(1 for result in results if not result["success"])
+        response = jsonify({
+            "created": len(results) - failed,
+            "failed": failed,
+            "results": payload
+        })
+        _sublist_refresh(response, *((result["activity"].list_id, result["activity"].sublist_id)
+                                     for result in results if result["success"]))
+        return response, 201 if failed == 0 else 207
+
+    @app.route('/activities/reorder', methods=['POST'])
+    @parse_request_data
+    def reorder_activities():
+        """
+        Enregistre le nouvel ordre des activités après un glisser-déposer.
+        
+        Le corps JSON est un objet {"containers": [...]} (ou directement le tableau),
+        chaque conteneur donnant list_id, sublist_id et activity_ids dans le nouvel
+        ordre. Tous les déplacements sont appliqués en un seul aller-retour.
+        
+        Retourne:
+        - Si succès: Réponse JSON {"updated", "list_ids", "containers"} et un en-tête
+          HX-Trigger rafraîchissant chaque sous-liste concernée (origine et destination)
+        - Si échec: Réponse JSON avec le message d'erreur
+        """
+        containers = request.parsed_data
+        if isinstance(containers, dict):
+            containers = containers.get('containers')
+        
+        success, data = ctrl_activity.reorder_activities(containers)
+        
+        if not success:
+            return jsonify({"error": data}), 400
+        
+        return _sublist_refresh(jsonify(data), *data["containers"]), 200
 
     @app.route('/activities/<int:activity_id>', methods=['POST', 'PUT'])
     @parse_request_data
@@ -148,15 +357,22 @@ def register_activity_routes(app):
         - activity_id: Identifiant unique de l'activité à mettre à jour
         
         Retourne:
-        - Si succès: Réponse JSON avec l'activité mise à jour
+        - Si succès (HTMX): Conteneurs de sa sous-liste (et de sa sous-liste d'origine si
+          elle a été déplacée), rendus hors bande
+        - Si succès: Réponse JSON avec l'activité mise à jour et un en-tête HX-Trigger
+          rafraîchissant sa sous-liste (et sa sous-liste d'origine si elle a été déplacée)
         - Si échec: Réponse JSON avec le message d'erreur
         """
+        # Conteneur d'origine (l'objet est modifié par la mise à jour)
+        found, activity = ctrl_activity.get_activity(activity_id)
+        origin = (activity.list_id, activity.sublist_id) if found else (None, None)
+        
         success, data = ctrl_activity.update_activity(activity_id, request.parsed_data)
         
         if not success:
             return jsonify({"error": data}), 400
         
-        return jsonify(data.to_dict()), 200
+        return _activity_changes(data.to_dict(), 200, origin, (data.list_id, data.sublist_id))
 
     @app.route('/activities/<int:activity_id>', methods=['DELETE'])
     def erase_activity(activity_id):
@@ -169,15 +385,20 @@ def register_activity_routes(app):
         - activity_id: Identifiant unique de l'activité à supprimer
         
         Retourne:
-        - Si succès: Réponse JSON avec le message de confirmation
+        - Si succès (HTMX): Conteneur de sa sous-liste, rendu hors bande
+        - Si succès: Réponse JSON avec le message de confirmation et un en-tête HX-Trigger
+          rafraîchissant sa sous-liste
         - Si échec: Réponse JSON avec le message d'erreur
         """
+        found, activity = ctrl_activity.get_activity(activity_id)
+        origin = (activity.list_id, activity.sublist_id) if found else (None, None)
+        
         success, message = ctrl_activity.delete_activity(activity_id)
         
         if not success:
             return jsonify({"error": message}), 404
         
-        return jsonify({"message": message}), 200
+        return _activity_changes({"message": message}, 200, origin)
 
     @app.route('/activities/<int:activity_id>/default-date', methods=['POST'])
     def edit_activity_default_date(activity_id):
@@ -190,7 +411,9 @@ def register_activity_routes(app):
         - activity_id: Identifiant unique de l'activité
         
         Retourne:
-        - Si succès: Réponse JSON avec l'activité mise à jour
+        - Si succès (HTMX): Conteneur de sa sous-liste, rendu hors bande
+        - Si succès: Réponse JSON avec l'activité mise à jour et un en-tête HX-Trigger
+          rafraîchissant sa sous-liste
         - Si échec: Réponse JSON avec le message d'erreur
         """
         success, data = ctrl_activity.set_activity_default_date(activity_id)
@@ -198,7 +421,7 @@ def register_activity_routes(app):
         if not success:
             return jsonify({"error": data}), 404
         
-        return jsonify(data.to_dict()), 200
+        return _activity_changes(data.to_dict(), 200, (data.list_id, data.sublist_id))
 
     @app.route('/activities/<int:activity_id>/duplicate', methods=['POST'])
     def duplicate_activity(activity_id):
@@ -211,7 +434,9 @@ def register_activity_routes(app):
         - activity_id: Identifiant unique de l'activité à dupliquer
         
         Retourne:
-        - Si succès: Réponse JSON avec la nouvelle activité créée
+        - Si succès (HTMX): Conteneur de sa sous-liste, rendu hors bande
+        - Si succès: Réponse JSON avec la nouvelle activité créée et un en-tête HX-Trigger
+          rafraîchissant sa sous-liste
         - Si échec: Réponse JSON avec le message d'erreur
         """
         success, data = ctrl_activity.duplicate_activity(activity_id)
@@ -219,4 +444,4 @@ def register_activity_routes(app):
         if not success:
             return jsonify({"error": data}), 404
         
-        return jsonify(data.to_dict()), 201
\ No newline at end of file
+        return _activity_changes(data.to_dict(), 201, (data.list_id, data.sublist_id))
\ No newline at end of file
@@ -14,14 +14,47 @@ Contraintes:
 - Toute la logique métier doit être déléguée aux contrôleurs
 """
 
+from datetime import date
+
 from flask import render_template, request, jsonify, url_for
+from markupsafe import Markup
 from werkzeug.exceptions import NotFound
 
 # Importation du décorateur qui gère les formats des données de requête
 from app.utils.request_format_utils import parse_request_data
+from app.utils.http_cache_utils import conditional_render, get_templates_fingerprint
+from app.utils.fragment_cache_utils import cached_fragment, get_fragment_cache
 
 # Importation des contrôleurs nécessaires
-from app.controllers import ctrl_list
+from app.controllers import ctrl_list, ctrl_settings
+
+
+def _list_content_keys(versions):
+    """
+    Clés des rendus de components/list_content.html dans le cache de fragments.
+    
+    Args:
+        versions (dict): {list_id: version du contenu} (voir ctrl_list.get_content_versions)
+    
+    Returns:
+        dict: {list_id: clé} ; une clé contient la liste, sa version, la version des
+              paramètres, le jour courant et l'empreinte des templates
+    """
+    success, settings = ctrl_settings.get_settings()
+    context = (settings.version if success else None, date.today().isoformat(),
+               get_templates_fingerprint())
+    return {list_id: ('list_content', list_id, version, *context)
+            for list_id, version in versions.items()}
+
+
+def _render_list_content(content):
+    """Rend components/list_content.html pour un contenu de ctrl_list.get_list_with_content."""
+    return render_template(
+        'components/list_content.html',
+        list_item=content["list"],
+        sublists=content["sublists"],
+        activities=content["activities"]
+    )
 
 def register_list_routes(app):
     """
@@ -44,9 +77,51 @@ def register_list_routes(app):
         
         Retourne:
         - Rendu HTML du composant de liste complet
+        - 304 sans rendu si le navigateur possède déjà cette version (ETag)
+        """
+        return conditional_render(
+            (ctrl_list.get_content_version(),),
+            lambda: render_template('components/lists.html', lists=ctrl_list.get_all_lists())
+        )
+    
+    @app.route('/board')
+    def show_board():
+        """
+        Récupère et affiche toutes les listes avec leur contenu en une seule réponse.
+        
+        Cette route est appelée par HTMX pour charger la colonne de gauche "Liste".
+        Contrairement à /lists, le contenu de chaque liste est rendu directement
+        au lieu d'être chargé par une requête HTMX par liste.
+        
+        Retourne:
+        - Rendu HTML du composant de liste avec le contenu de chaque liste
+        - 304 sans rendu si le navigateur possède déjà cette version (ETag)
         """
-        lists = ctrl_list.get_all_lists()
-        return render_template('components/lists.html', lists=lists)
+        def render():
+            lists = ctrl_list.get_all_lists()
+            versions = ctrl_list.get_content_versions(list_obj.id for list_obj in lists)
+            keys = _list_content_keys(versions)
+            cache = get_fragment_cache()
+            
+            # Rendus en cache ; le contenu des autres listes est chargé en lot puis rendu
+            contents, missing = {}, []
+            for list_obj in lists:
+                html = cache.get(keys[list_obj.id]) if cache and versions[list_obj.id] else None
+                if html is None:
+                    missing.append(list_obj)
+                else:
+                    contents[list_obj.id] = html
+            
+            for content in ctrl_list.get_lists_content(missing):
+                list_id = content["list"].id
+                html = Markup(_render_list_content(content))
+                if cache and versions[list_id]:
+                    cache.put(keys[list_id], html, group=list_id)
+                contents[list_id] = html
+            
+            return render_template('components/lists.html', lists=lists, contents=contents)
+        
+        return conditional_render((ctrl_list.get_content_version(),), render)
     
     @app.route('/list/<int:list_id>')
     def show_list(list_id):
@@ -54,25 +129,57 @@ def register_list_routes(app):
         Récupère et affiche une liste spécifique avec ses sous-listes et activités.
         
         Cette route est appelée par HTMX lors du clic sur une liste ou
-        après la modification/création d'une liste.
+        après la modification/création d'une liste (rafraîchissement ciblé).
         
         Paramètres:
         - list_id: Identifiant unique de la liste à afficher
         
         Retourne:
         - Rendu HTML du contenu de la liste spécifiée
+        - 304 sans rendu si le navigateur possède déjà cette version (ETag)
         - Erreur 404 si la liste n'existe pas
         """
-        success, data = ctrl_list.get_list_with_content(list_id)
-        if not success:
-            return NotFound(data)
+        def render():
+            success, data = ctrl_list.get_list_with_content(list_id)
+            if not success:
+                return NotFound(data)
+            return _render_list_content(data)
         
-        return render_template(
-            'components/list_content.html',
-            list_item=data["list"],
-            sublists=data["sublists"],
-            activities=data["activities"]
-        )
+        version = ctrl_list.get_content_version(list_id)
+        if not version:
+            return render()
+        
+        # Rendu servi depuis le cache de fragments tant que la liste n'a pas changé
+        key = _list_content_keys({list_id: version})[list_id]
+        return conditional_render((list_id, version),
+                                  lambda: cached_fragment(key, render, group=list_id))
+    
+    @app.route('/list/<int:list_id>/sublist/<int:sublist_id>')
+    def show_sublist(list_id, sublist_id):
+        """
+        Récupère et affiche une seule sous-liste d'une liste avec ses activités.
+        
+        Cette route est appelée par HTMX lorsqu'une modification d'activité émet
+        sublistRefresh-<list_id>-<sublist_id> : seul le conteneur concerné est rendu.
+        
+        Paramètres:
+        - list_id: Identifiant unique de la liste
+        - sublist_id: Identifiant de la sous-liste (0 = sans sous-liste)
+        
+        Retourne:
+        - Rendu HTML du conteneur de la sous-liste
+        - 304 sans rendu si le navigateur possède déjà cette version de la liste (ETag)
+        - Erreur 404 si la sous-liste n'appartient pas à la liste
+        """
+        def render():
+            success, data = ctrl_list.get_sublist_content(list_id, sublist_id)
+            if not success:
+                return NotFound(data)
+            return render_template('components/sublist_container.html',
+                                   list_item=data["list"], sublist=data["sublist"])
+        
+        version = ctrl_list.get_content_version(list_id)
+        return conditional_render((list_id, sublist_id, version) if version else None, render)
     
     @app.route('/modals/create-list')
     def show_new_list():
@@ -163,13 +270,14 @@ def register_list_routes(app):
         - list_id: Identifiant unique de la liste à supprimer
         
         Retourne:
-        - Si succès: Réponse JSON avec le message de confirmation
+        - Si succès: Réponse JSON avec le message de confirmation et le nombre de lignes
+          supprimées ("deleted": lists, sublists, activities, archived_activities)
         - Si échec: Réponse JSON avec le message d'erreur
         """
-        success, message = ctrl_list.delete_list(list_id)
+        success, data = ctrl_list.delete_list(list_id)
         
         if not success:
-            return jsonify({"error": message}), 404
+            return jsonify({"error": data}), 404
         
-        return jsonify({"message": message}), 200
+        return jsonify(data), 200
     
\ No newline at end of file
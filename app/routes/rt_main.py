@@ -3,8 +3,8 @@ app/routes/rt_main.py
 
 Rôle fonctionnel: Gestion des routes principales et des gestionnaires d'erreurs
 
-Description: Ce fichier contient les routes pour les pages principales (dashboard)
-et les gestionnaires d'erreurs (404, 500).
+Description: Ce fichier contient les routes pour les pages principales (dashboard),
+les statistiques de cache (HTTP, fragments) et les gestionnaires d'erreurs (404, 500).
 
 Données attendues: Application Flask
 Données produites: Réponses HTTP pour les pages principales
@@ -14,7 +14,10 @@ Contraintes:
 - Toute la logique métier doit être déléguée aux contrôleurs
 """
 
-from flask import render_template, flash
+from flask import render_template, flash, jsonify
+
+from app.utils.http_cache_utils import get_conditional_stats
+from app.utils.fragment_cache_utils import get_fragment_cache_stats
 
 # Importation des contrôleurs nécessaires
 from app.controllers import ctrl_settings
@@ -47,6 +50,28 @@ def register_main_routes(app):
             
         return render_template('pages/settings.html', settings=settings_data)
 
+    @app.route('/stats/http-cache')
+    def show_http_cache_stats():
+        """
+        Statistiques des réponses conditionnelles des fragments (processus courant).
+        
+        Retourne:
+        - Réponse JSON {route: {"hits", "misses", "hit_ratio"}} : hits = réponses 304
+          sans rendu, misses = rendus complets
+        """
+        return jsonify(get_conditional_stats())
+
+    @app.route('/stats/fragment-cache')
+    def show_fragment_cache_stats():
+        """
+        Statistiques du cache des rendus de listes (processus courant).
+        
+        Retourne:
+        - Réponse JSON {"enabled", "entries", "bytes", "max_bytes", "hits", "misses",
+          "evictions", "invalidations", "hit_ratio"}
+        """
+        return jsonify(get_fragment_cache_stats())
+
     # =========================================================================
     # Gestionnaires d'erreurs
     # =========================================================================
@@ -5,6 +5,8 @@ Rôle fonctionnel: Gestion des routes pour les sous-listes
 
 Description: Ce fichier contient les routes pour l'affichage, la création, 
 la modification et la suppression des sous-listes.
+Les requêtes HTMX de modification reçoivent uniquement les fragments modifiés
+(hx-swap-oob) ; les autres clients reçoivent du JSON.
 
 Données attendues: Application Flask
 Données produites: Réponses HTTP pour la gestion des sous-listes
@@ -18,11 +20,32 @@ from flask import render_template, request, jsonify
 from werkzeug.exceptions import NotFound
 
 # Importation du décorateur qui gère les formats des données de requête
-from app.utils.request_format_utils import parse_request_data
+from app.utils.request_format_utils import parse_request_data, is_htmx_request
 
 # Importation des contrôleurs nécessaires
 from app.controllers import ctrl_list, ctrl_sublist
 
+
+def _render_sublist_changes(removed=(), list_id=None, sublist_id=None):
+    """
+    Rend les fragments hors bande d'une modification de sous-liste.
+    
+    Args:
+        removed (iterable): IDs des conteneurs de sous-listes à retirer de la page
+        list_id (int, optional): Liste de la sous-liste à insérer
+        sublist_id (int, optional): Sous-liste à insérer à sa place (rendue avec ses activités)
+    
+    Returns:
+        str: Rendu de components/sublist_changes.html
+    """
+    context = {'removed': list(removed)}
+    if sublist_id is not None:
+        success, content = ctrl_list.get_sublist_content(list_id, sublist_id)
+        if success:
+            context.update(list_item=content["list"], sublist=content["sublist"],
+                           previous_id=ctrl_sublist.get_previous_sublist_id(list_id, sublist_id))
+    return render_template('components/sublist_changes.html', **context)
+
 def register_sublist_routes(app):
     """
     Enregistre les routes pour la gestion des sous-listes.
@@ -51,15 +74,13 @@ def register_sublist_routes(app):
         # Récupérer l'ID de liste si fourni
         list_id = request.args.get('list_id', type=int)
         
-        # Récupérer toutes les listes pour le sélecteur
-        lists = ctrl_list.get_all_lists()
+        # Récupérer toutes les listes pour le sélecteur (catalogue en cache)
+        lists = ctrl_list.get_catalog()
         
         # Récupérer la liste sélectionnée si une liste_id est fournie
         selected_list = None
         if list_id:
-            success, data = ctrl_list.get_list(list_id)
-            if success:
-                selected_list = data
+            selected_list = next((entry for entry in lists if entry.id == list_id), None)
         
         return render_template('modals/create_edit_sublist_modal.html',
                             title="Créer une sous-liste",
@@ -87,8 +108,8 @@ def register_sublist_routes(app):
         if not success:
             return NotFound(sublist)
         
-        # Récupérer toutes les listes pour le sélecteur
-        lists = ctrl_list.get_all_lists()
+        # Récupérer toutes les listes pour le sélecteur (catalogue en cache)
+        lists = ctrl_list.get_catalog()
         
         return render_template('modals/create_edit_sublist_modal.html',
                             title="Modifier une sous-liste",
@@ -106,6 +127,7 @@ def register_sublist_routes(app):
         Cette route est appelée par HTMX lors de la soumission du formulaire de création.
         
         Retourne:
+        - Si succès (HTMX): Conteneur de la sous-liste, inséré hors bande à sa place
         - Si succès: Réponse JSON avec la sous-liste créée
         - Si échec: Réponse JSON avec le message d'erreur
         """
@@ -114,6 +136,9 @@ def register_sublist_routes(app):
         if not success:
             return jsonify({"error": data}), 400
         
+        if is_htmx_request():
+            return _render_sublist_changes(list_id=data.list_id, sublist_id=data.id), 201
+        
         # Déclencher le rafraîchissement de la liste parente
         list_id = request.parsed_data.get('list_id')
         
@@ -134,14 +159,31 @@ def register_sublist_routes(app):
         - sublist_id: Identifiant unique de la sous-liste à mettre à jour
         
         Retourne:
+        - Si succès (HTMX): Fragments hors bande
+            - nom modifié: en-tête de la sous-liste
+            - position modifiée: conteneur retiré puis réinséré à sa place
+            - liste modifiée: aucun fragment, rechargement des deux listes (HX-Trigger)
         - Si succès: Réponse JSON avec la sous-liste mise à jour
         - Si échec: Réponse JSON avec le message d'erreur
         """
+        # Emplacement avant modification (l'objet est modifié par la mise à jour)
+        found, sublist = ctrl_sublist.get_sublist(sublist_id)
+        old_list_id, old_position = (sublist.list_id, sublist.position) if found else (None, None)
+        
         success, data = ctrl_sublist.update_sublist(sublist_id, request.parsed_data)
         
         if not success:
             return jsonify({"error": data}), 400
         
+        if is_htmx_request():
+            if data.list_id != old_list_id:
+                return '', 200, {'HX-Trigger': f'listContentRefresh-{old_list_id}, '
+                                               f'listContentRefresh-{data.list_id}'}
+            if data.position != old_position:
+                return _render_sublist_changes(removed=[f'sublist-{data.list_id}-{data.id}'],
+                                               list_id=data.list_id, sublist_id=data.id)
+            return render_template('components/sublist_header.html', sublist=data, oob=True)
+        
         # Déclencher le rafraîchissement de la liste parente
         list_id = request.parsed_data.get('list_id')
         if not list_id and hasattr(data, 'list_id'):
@@ -167,7 +209,9 @@ def register_sublist_routes(app):
         - sublist_id: Identifiant unique de la sous-liste à supprimer
         
         Retourne:
-        - Si succès: Réponse JSON avec le message de confirmation
+        - Si succès (HTMX): Retrait hors bande du conteneur de la sous-liste
+        - Si succès: Réponse JSON avec le message de confirmation et le nombre de lignes
+          supprimées ("deleted": sublists, activities, archived_activities)
         - Si échec: Réponse JSON avec le message d'erreur
         """
         # Récupérer d'abord l'ID de la liste parente pour le rafraîchissement
@@ -175,13 +219,16 @@ def register_sublist_routes(app):
         list_id = sublist.list_id if success else None
         
         # Supprimer la sous-liste
-        success, message = ctrl_sublist.delete_sublist(sublist_id)
+        success, data = ctrl_sublist.delete_sublist(sublist_id)
         
         if not success:
-            return jsonify({"error": message}), 404
+            return jsonify({"error": data}), 404
+        
+        if is_htmx_request():
+            return _render_sublist_changes(removed=[f'sublist-{list_id}-{sublist_id}'])
         
         # Préparer la réponse
-        response = jsonify({"message": message})
+        response = jsonify(data)
         
         # Ajouter le déclencheur pour rafraîchir la liste parente
         if list_id:
@@ -208,8 +255,8 @@ def register_sublist_routes(app):
         sublists = []
         
         if list_id:
-            success, data = ctrl_list.get_list_with_content(list_id)
+            success, data = ctrl_list.get_catalog_sublists(list_id)
             if success:
-                sublists = data["sublists"]
+                sublists = data
         
         return render_template('components/sublist_options.html', sublists=sublists)
\ No newline at end of file
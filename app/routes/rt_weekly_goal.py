@@ -19,9 +19,10 @@ from datetime import date
 
 # Importation du décorateur qui gère les formats des données de requête
 from app.utils.request_format_utils import parse_request_data
+from app.utils.http_cache_utils import conditional_render
 
 # Importation des contrôleurs nécessaires
-from app.controllers import ctrl_weekly_goal
+from app.controllers import ctrl_weekly_goal, ctrl_activity, ctrl_list
 
 def register_weekly_goal_routes(app):
     """
@@ -59,6 +60,26 @@ def register_weekly_goal_routes(app):
                             week_display=data['week_display'],
                             content=data.get('content', ""))
 
+    @app.route('/modals/wip-limit-check')
+    def show_wip_limit_check():
+        """
+        Affiche la jauge de charge de la semaine par rapport à la WIP limit.
+        
+        Cette route est appelée par HTMX lorsque l'utilisateur clique sur
+        "Vérifier la WIP Limit" dans le menu de la colonne Objectifs. La charge
+        est lue dans les compteurs hebdomadaires (une lecture sur clé primaire).
+        
+        Retourne:
+        - Rendu HTML de la modale de vérification de la WIP limit
+        """
+        success, data = ctrl_activity.get_wip_status()
+        if not success:
+            return jsonify({"error": data}), 400
+        
+        return render_template('modals/wip_limit_check_modal.html',
+                            title="Vérifier la WIP Limit",
+                            wip=data)
+
     @app.route('/weekly-goals', methods=['GET'])
     def get_weekly_goal():
         """
@@ -140,20 +161,23 @@ def register_weekly_goal_routes(app):
         
         Retourne:
         - Rendu HTML de la colonne des objectifs
+        - 304 sans rendu si le navigateur possède déjà cette version (ETag : version
+          globale des listes et jour courant, qui détermine la semaine affichée)
         """
-        # Récupérer les activités de la semaine
-        today = date.today()
-        
-        # TODO: Implémenter la fonction dans ctrl_activity pour récupérer les activités de la semaine
-        # Pour l'instant, utilisons des listes vides
-        priority_activities = []
-        standard_activities = []
-        
-        # Récupérer les informations de date pour l'affichage
-        success, data = ctrl_weekly_goal.get_weekly_goal_with_week_info()
-        server_date_info = data if success else {}
-        
-        return render_template('components/objectives_column.html',
-                            priority_activities=priority_activities,
-                            standard_activities=standard_activities,
-                            server_date_info=server_date_info)
\ No newline at end of file
+        def render():
+            # Récupérer les activités de la semaine (une seule requête)
+            success, week = ctrl_activity.get_week_activities()
+            priority_activities = week["priority"] if success else []
+            standard_activities = week["standard"] if success else []
+            
+            # Récupérer les informations de date pour l'affichage
+            success, data = ctrl_weekly_goal.get_weekly_goal_with_week_info()
+            server_date_info = data if success else {}
+            
+            return render_template('components/objectives_column.html',
+                                priority_activities=priority_activities,
+                                standard_activities=standard_activities,
+                                server_date_info=server_date_info)
+        
+        version = ctrl_list.get_content_version()
+        return conditional_render((version, date.today().isoformat()) if version else None, render)
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+File: app/utils/db_utils.py
+Role: Utilitaires de réglage de la connexion SQLite
+Description: Définit les profils de PRAGMA SQLite par environnement et les applique
+             à chaque nouvelle connexion ouverte par le moteur SQLAlchemy
+Input data: Nom d'environnement, dictionnaire de PRAGMA, moteur SQLAlchemy
+Output data: Connexions configurées, valeurs effectives des PRAGMA
+Business constraints:
+- Les PRAGMA sont appliqués à chaque connexion (ils ne sont pas tous persistants)
+- Seuls les PRAGMA connus sont acceptés, les noms provenant de la configuration
+- foreign_keys est activé : les suppressions en cascade (ON DELETE CASCADE) sont faites
+  par SQLite ; activities.sublist_id n'a pas de clé étrangère (valeur sentinelle 0 =
+  aucune sous-liste), sa cascade passe par le déclencheur trg_sublists_delete_activities
+"""
+
+from typing import Dict
+
+from sqlalchemy import event
+
+# PRAGMA pris en charge, dans l'ordre d'application
+SQLITE_PRAGMA_NAMES = (
+    'journal_mode',
+    'synchronous',
+    'cache_size',
+    'mmap_size',
+    'temp_store',
+    'busy_timeout',
+    'foreign_keys',
+)
+
+# Profils par environnement
+SQLITE_PRAGMA_PROFILES = {
+    'development': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,       # ~16 Mo (valeur négative = Kio)
+        'mmap_size': 67108864,      # 64 Mo
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,       # ms
+        'foreign_keys': 'ON',
+    },
+    'testing': {
+        'journal_mode': 'MEMORY',
+        'synchronous': 'OFF',
+        'cache_size': -8000,
+        'mmap_size': 0,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 1000,
+        'foreign_keys': 'ON',
+    },
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,       # ~64 Mo
+        'mmap_size': 268435456,     # 256 Mo
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+        'foreign_keys': 'ON',
+    },
+}
+
+
+def get_sqlite_pragmas(env_name: str) -> Dict:
+    """
+    Retourne une copie du profil de PRAGMA d'un environnement
+
+    Args:
+        env_name: Nom de l'environnement ('development', 'testing' ou 'production')
+
+    Returns:
+        dict: PRAGMA à appliquer
+
+    Raises:
+        ValueError: Si l'environnement est inconnu
+    """
+    if env_name not in SQLITE_PRAGMA_PROFILES:
+        raise ValueError(f"Environnement inconnu: {env_name}. "
+                         f"Valeurs possibles: {', '.join(SQLITE_PRAGMA_PROFILES)}")
+    return dict(SQLITE_PRAGMA_PROFILES[env_name])
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: Dict) -> None:
+    """
+    Applique les PRAGMA sur une connexion DB-API sqlite3
+
+    Args:
+        dbapi_connection: Connexion sqlite3 brute
+        pragmas: Dictionnaire {nom: valeur}
+
+    Raises:
+        ValueError: Si un PRAGMA n'est pas pris en charge
+    """
+    unknown = set(pragmas) - set(SQLITE_PRAGMA_NAMES)
+    if unknown:
+        raise ValueError(f"PRAGMA non pris en charge: {', '.join(sorted(unknown))}")
+
+    cursor = dbapi_connection.cursor()
+    try:
+        for name in SQLITE_PRAGMA_NAMES:
+            if name in pragmas and pragmas[name] is not None:
+                cursor.execute(f"PRAGMA {name}={pragmas[name]}")
+    finally:
+        cursor.close()
+
+
+def register_sqlite_pragmas(engine, pragmas: Dict) -> None:
+    """
+    Enregistre l'application des PRAGMA sur chaque nouvelle connexion du moteur
+
+    Args:
+        engine: Moteur SQLAlchemy
+        pragmas: Dictionnaire {nom: valeur}
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+
+def read_effective_pragmas(engine) -> Dict:
+    """
+    Lit les valeurs effectives des PRAGMA sur une connexion du moteur
+
+    Args:
+        engine: Moteur SQLAlchemy
+
+    Returns:
+        dict: Valeurs effectives {nom: valeur}
+    """
+    effective = {}
+    with engine.connect() as connection:
+        for name in SQLITE_PRAGMA_NAMES:
+            effective[name] = connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+    return effective
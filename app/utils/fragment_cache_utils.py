@@ -0,0 +1,171 @@
+"""
+File: app/utils/fragment_cache_utils.py
+Role: Cache en mémoire des fragments HTML rendus
+Description: Cache LRU borné en octets, propre au processus, des rendus de
+             components/list_content.html, indexé par version du contenu
+Input data: Clé (liste, version de la liste, version des paramètres, jour, empreinte des
+            templates), HTML rendu
+Output data: HTML en cache, compteurs hits / misses / evictions / invalidations
+Business constraints:
+- La clé contient la version de la liste (list_versions, tenue par des déclencheurs) :
+  toute écriture sur la liste, ses sous-listes ou ses activités change la clé
+- Une seule entrée par liste : le rendu d'une nouvelle version remplace l'ancien
+  (invalidation), sans attendre son éviction
+- La taille cumulée (UTF-8) ne dépasse jamais FRAGMENT_CACHE_MAX_BYTES ; les entrées les
+  moins récemment lues sont évincées ; un fragment plus grand que la limite n'est pas
+  mis en cache (0 = cache désactivé)
+"""
+
+import threading
+from collections import OrderedDict
+
+from flask import current_app
+from markupsafe import Markup
+
+EXTENSION_KEY = 'fragment_cache'
+
+
+class FragmentCache:
+    """Cache LRU de fragments HTML, borné en octets, sûr entre threads."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # clé -> (html, taille, groupe)
+        self._groups = {}  # groupe -> clé de son entrée courante
+        self._size = 0
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get(self, key):
+        """
+        Args:
+            key (tuple): Clé du fragment
+
+        Returns:
+            Markup: HTML en cache, ou None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, html, group=None):
+        """
+        Met un fragment en cache.
+
+        Args:
+            key (tuple): Clé du fragment
+            html (Markup): HTML rendu
+            group (hashable, optional): Groupe du fragment (ex. ID de liste) : l'entrée
+                                        précédente du même groupe est retirée
+        """
+        size = len(html.encode('utf-8'))
+        with self._lock:
+            previous = self._groups.get(group) if group is not None else None
+            if previous is not None and previous != key:
+                self._discard(previous)
+                self.invalidations += 1
+            self._discard(key)
+
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (html, size, group)
+            self._size += size
+            if group is not None:
+                self._groups[group] = key
+
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        _, size, group = entry
+        self._size -= size
+        if group is not None and self._groups.get(group) == key:
+            del self._groups[group]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._groups.clear()
+            self._size = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: entries, bytes, max_bytes, hits, misses, evictions, invalidations, hit_ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else None
+            }
+
+
+def init_fragment_cache(app):
+    """
+    Crée le cache de fragments de l'application (FRAGMENT_CACHE_MAX_BYTES, 0 = désactivé).
+
+    Args:
+        app: L'application Flask
+    """
+    max_bytes = app.config.get('FRAGMENT_CACHE_MAX_BYTES') or 0
+    app.extensions[EXTENSION_KEY] = FragmentCache(max_bytes) if max_bytes > 0 else None
+
+
+def get_fragment_cache():
+    """
+    Returns:
+        FragmentCache: Cache de l'application courante, ou None s'il est désactivé
+    """
+    return current_app.extensions.get(EXTENSION_KEY)
+
+
+def get_fragment_cache_stats():
+    """
+    Returns:
+        dict: Statistiques du cache (voir FragmentCache.stats), {'enabled': False} s'il
+              est désactivé
+    """
+    cache = get_fragment_cache()
+    if cache is None:
+        return {'enabled': False}
+    return {'enabled': True, **cache.stats()}
+
+
+def cached_fragment(key, render, group=None):
+    """
+    Retourne un fragment depuis le cache, ou le rend et le met en cache.
+
+    Args:
+        key (tuple): Clé du fragment (doit contenir toutes les versions dont dépend le rendu)
+        render (callable): Fonction sans argument produisant le HTML
+        group (hashable, optional): Groupe du fragment (voir FragmentCache.put)
+
+    Returns:
+        Markup: HTML du fragment
+    """
+    cache = get_fragment_cache()
+    if cache is None:
+        return Markup(render())
+
+    html = cache.get(key)
+    if html is None:
+        html = Markup(render())
+        cache.put(key, html, group)
+    return html
@@ -0,0 +1,125 @@
+"""
+File: app/utils/http_cache_utils.py
+Role: Réponses conditionnelles (ETag / If-None-Match) pour les fragments HTML
+Description: Calcule un ETag fort à partir d'un signal de version bon marché, répond
+             304 Not Modified sans rendu quand le navigateur possède déjà le fragment,
+             et compte les réponses évitées par route
+Input data: Parties de version du fragment (compteurs de list_versions, semaine, ...),
+            fonction de rendu appelée seulement si nécessaire
+Output data: Réponse Flask 200 (rendu) ou 304 (sans corps), statistiques par route
+Business constraints:
+- L'ETag comprend une empreinte des fichiers de templates : un déploiement modifiant
+  un template invalide les fragments déjà en cache chez les clients
+- Cache-Control: no-cache : le navigateur revalide chaque requête HTMX (If-None-Match)
+  et réutilise sa copie sur 304
+- Les compteurs sont propres au processus (un par worker)
+"""
+
+import hashlib
+import os
+import threading
+
+from flask import current_app, make_response, request
+
+EXTENSION_KEY = 'http_cache'
+
+
+class ConditionalStats:
+    """Compteurs par route des réponses 304 (hits) et des rendus complets (misses)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, endpoint, hit):
+        with self._lock:
+            counts = self._counts.setdefault(endpoint, {'hits': 0, 'misses': 0})
+            counts['hits' if hit else 'misses'] += 1
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: {route: {'hits', 'misses', 'hit_ratio'}}, hit_ratio None sans requête
+        """
+        with self._lock:
+            counts_by_endpoint = {endpoint: dict(counts) for endpoint, counts in self._counts.items()}
+
+        for counts in counts_by_endpoint.values():
+            total = counts['hits'] + counts['misses']
+            counts['hit_ratio'] = round(counts['hits'] / total, 3) if total else None
+        return counts_by_endpoint
+
+
+def _templates_fingerprint(app):
+    """Empreinte courte des templates (chemin, taille, date de modification de chaque fichier)."""
+    digest = hashlib.sha1()
+    template_root = os.path.join(app.root_path, app.template_folder)
+    for folder, _, files in sorted(os.walk(template_root)):
+        for name in sorted(files):
+            stat = os.stat(os.path.join(folder, name))
+            digest.update(f'{os.path.relpath(os.path.join(folder, name), template_root)}:'
+                          f'{stat.st_size}:{stat.st_mtime_ns};'.encode())
+    return digest.hexdigest()[:12]
+
+
+def init_http_cache(app):
+    """
+    Prépare l'empreinte des templates et les compteurs de l'application.
+
+    Args:
+        app: L'application Flask
+    """
+    app.extensions[EXTENSION_KEY] = {
+        'fingerprint': _templates_fingerprint(app),
+        'stats': ConditionalStats()
+    }
+
+
+def get_templates_fingerprint():
+    """
+    Empreinte des templates de l'application courante, recalculée à chaque appel quand
+    les templates sont rechargés à chaud (mode debug).
+
+    Returns:
+        str: Empreinte courte (12 caractères hexadécimaux)
+    """
+    if current_app.jinja_env.auto_reload:
+        return _templates_fingerprint(current_app)
+    return current_app.extensions[EXTENSION_KEY]['fingerprint']
+
+
+def get_conditional_stats():
+    """
+    Returns:
+        dict: Statistiques par route des réponses conditionnelles (voir ConditionalStats)
+    """
+    return current_app.extensions[EXTENSION_KEY]['stats'].snapshot()
+
+
+def conditional_render(version_parts, render):
+    """
+    Répond 304 si le client possède la version courante du fragment, sinon le rend.
+
+    Args:
+        version_parts (tuple): Signal de version du fragment ; None = pas de réponse
+                               conditionnelle (ex. ressource absente)
+        render (callable): Fonction sans argument produisant la réponse (rendu du template)
+
+    Returns:
+        Response: 304 sans corps, ou réponse de render() ; toutes deux portent l'ETag
+    """
+    if version_parts is None:
+        return render()
+
+    state = current_app.extensions[EXTENSION_KEY]
+    etag = '-'.join((get_templates_fingerprint(), request.endpoint, *map(str, version_parts)))
+
+    hit = request.if_none_match.contains(etag)
+    state['stats'].record(request.endpoint, hit)
+    if hit:
+        response = current_app.response_class(status=304)
+    else:
+        response = make_response(render())
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
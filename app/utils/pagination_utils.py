@@ -0,0 +1,99 @@
+"""
+File: app/utils/pagination_utils.py
+Role: Utilitaires de pagination par clé (keyset)
+Description: Construit le filtre "après la dernière ligne vue" sur une clé de tri composite
+             et encode/décode cette clé sous forme de curseur opaque
+Input data: Colonnes de tri, valeurs de la dernière ligne, curseur reçu du client
+Output data: Expression de filtre SQLAlchemy, curseur (chaîne base64 URL-safe)
+Business constraints:
+- Tri croissant, NULL en premier (comportement de SQLite)
+- La clé doit se terminer par une colonne unique (id) pour un ordre total
+- Le coût d'une page ne dépend pas de sa profondeur (pas d'OFFSET)
+"""
+
+import base64
+import json
+from datetime import date
+
+from sqlalchemy import and_, or_
+
+
+def keyset_after(columns, values):
+    """
+    Construit le filtre sélectionnant les lignes situées après `values` dans l'ordre de `columns`
+
+    La comparaison est développée colonne par colonne pour respecter le placement des NULL
+    en tête. Une borne sur la première colonne est ajoutée pour que l'index correspondant
+    au tri soit parcouru à partir de la clé plutôt que depuis le début.
+
+    Args:
+        columns (tuple): Colonnes de tri, dans l'ordre
+        values (tuple): Valeurs de la dernière ligne de la page précédente
+
+    Returns:
+        Expression SQLAlchemy à passer à filter()
+    """
+    branches = []
+    for index, (column, value) in enumerate(zip(columns, values)):
+        equalities = [
+            previous.is_(None) if previous_value is None else previous == previous_value
+            for previous, previous_value in zip(columns[:index], values[:index])
+        ]
+        greater = column.isnot(None) if value is None else column > value
+        branches.append(and_(*equalities, greater))
+
+    condition = or_(*branches)
+    if values[0] is not None:
+        condition = and_(columns[0] >= values[0], condition)
+    return condition
+
+
+def encode_cursor(values):
+    """
+    Encode la clé de la dernière ligne d'une page en curseur opaque
+
+    Args:
+        values (tuple): Valeurs de la clé (dates, entiers ou None)
+
+    Returns:
+        str: Curseur base64 URL-safe
+    """
+    payload = [value.isoformat() if isinstance(value, date) else value for value in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, types):
+    """
+    Décode un curseur produit par encode_cursor
+
+    Args:
+        cursor (str): Curseur reçu du client
+        types (tuple): Type attendu de chaque valeur (date ou int)
+
+    Returns:
+        tuple: Valeurs de la clé
+
+    Raises:
+        ValueError: Si le curseur est mal formé
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Curseur de pagination invalide") from e
+
+    if not isinstance(payload, list) or len(payload) != len(types):
+        raise ValueError("Curseur de pagination invalide")
+
+    values = []
+    for value, expected in zip(payload, types):
+        if value is None:
+            values.append(None)
+        elif expected is date and isinstance(value, str):
+            values.append(date.fromisoformat(value))
+        elif expected is int and isinstance(value, int) and not isinstance(value, bool):
+            values.append(value)
+        else:
+            raise ValueError("Curseur de pagination invalide")
+    return tuple(values)
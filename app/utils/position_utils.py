@@ -0,0 +1,148 @@
+"""
+File: app/utils/position_utils.py
+Role: Utilitaires de renumérotation et de placement des positions
+Description: Renumérote les positions d'un ensemble de lignes (activités, sous-listes)
+             en une seule instruction UPDATE ensembliste basée sur ROW_NUMBER(), et
+             calcule un nouvel ordre en ne déplaçant que les lignes qui ont changé de place
+Input data: Modèle SQLAlchemy possédant les colonnes id et position, critères de filtre ;
+            positions actuelles dans l'ordre voulu
+Output data: Nombre de lignes dont la position a changé ; nouvelles positions
+Business constraints:
+- L'ordre existant (position puis id) est conservé, seules les valeurs changent
+- Les lignes déjà à la bonne position ne sont pas réécrites
+- Un nouvel ordre conserve les positions clairsemées : seules les lignes hors de la plus
+  longue sous-suite déjà ordonnée reçoivent une position, entre leurs voisines
+- Nécessite SQLite >= 3.33 (UPDATE ... FROM et fonctions de fenêtrage)
+- Ne valide pas la transaction : l'appelant décide du commit
+"""
+
+from bisect import bisect_left
+
+from sqlalchemy import func, select, update
+
+from app import db
+
+
+def renumber_positions(model, criteria, partition_by=(), gap=1):
+    """
+    Renumérote les positions des lignes d'un modèle en une seule requête
+
+    Les positions deviennent gap, 2 × gap, 3 × gap... dans chaque partition. Les
+    modifications en attente sont envoyées avant la requête, et les instances du modèle
+    présentes dans la session sont expirées pour être relues après la renumérotation.
+
+    Args:
+        model: Classe du modèle (colonnes id et position requises)
+        criteria (tuple): Expressions de filtre délimitant les lignes à renuméroter
+        partition_by (tuple, optional): Colonnes définissant des conteneurs indépendants
+        gap (int, optional): Écart entre deux positions consécutives
+
+    Returns:
+        int: Nombre de lignes mises à jour
+    """
+    table = model.__table__
+    rank = func.row_number().over(
+        partition_by=list(partition_by) or None,
+        order_by=(table.c.position, table.c.id)
+    )
+    ranked = select(
+        table.c.id.label('id'),
+        (rank * gap).label('new_position')
+    ).where(*criteria).subquery('ranked')
+
+    statement = (
+        update(table)
+        .where(table.c.id == ranked.c.id)
+        .where(table.c.position.is_distinct_from(ranked.c.new_position))
+        .values(position=ranked.c.new_position)
+    )
+
+    db.session.flush()
+    result = db.session.execute(statement)
+
+    for instance in list(db.session.identity_map.values()):
+        if isinstance(instance, model):
+            db.session.expire(instance)
+
+    return result.rowcount
+
+
+def _longest_increasing(values):
+    """
+    Retourne les indices d'une plus longue sous-suite strictement croissante
+
+    Args:
+        values (list): Valeurs (None = ignorée)
+
+    Returns:
+        set: Indices des valeurs de la sous-suite
+    """
+    tail_values, tail_indexes, parents = [], [], {}
+    for index, value in enumerate(values):
+        if value is None:
+            continue
+        length = bisect_left(tail_values, value)
+        parents[index] = tail_indexes[length - 1] if length else None
+        if length == len(tail_values):
+            tail_values.append(value)
+            tail_indexes.append(index)
+        else:
+            tail_values[length] = value
+            tail_indexes[length] = index
+
+    kept = set()
+    index = tail_indexes[-1] if tail_indexes else None
+    while index is not None:
+        kept.add(index)
+        index = parents[index]
+    return kept
+
+
+def sparse_positions(positions, gap=1):
+    """
+    Calcule les positions d'une suite ordonnée en changeant le moins de valeurs possible
+
+    Les lignes dont la position suit déjà l'ordre voulu (plus longue sous-suite
+    strictement croissante) la conservent. Les autres reçoivent le milieu de l'intervalle
+    entre leurs voisines conservées, ou un écart de gap avant la première / après la
+    dernière : un glisser-déposer d'une ligne ne réécrit que cette ligne.
+
+    Args:
+        positions (list): Positions actuelles dans l'ordre voulu (None = ligne qui
+            n'appartient pas encore au conteneur)
+        gap (int, optional): Écart utilisé en tête et en fin de suite
+
+    Returns:
+        list: Nouvelles positions dans le même ordre, ou None si l'écart entre deux
+            voisines est épuisé (renumérotation nécessaire)
+    """
+    kept = _longest_increasing(positions)
+    result = list(positions)
+    index = 0
+    while index < len(result):
+        if index in kept:
+            index += 1
+            continue
+
+        end = index
+        while end < len(result) and end not in kept:
+            end += 1
+        count = end - index
+        low = result[index - 1] if index > 0 else None
+        high = result[end] if end < len(result) else None
+
+        if low is None and high is None:
+            values = [gap * (rank + 1) for rank in range(count)]
+        elif low is None:
+            values = [high - gap * (count - rank) for rank in range(count)]
+        elif high is None:
+            values = [low + gap * (rank + 1) for rank in range(count)]
+        else:
+            step = (high - low) // (count + 1)
+            if step < 1:
+                return None
+            values = [low + step * (rank + 1) for rank in range(count)]
+
+        result[index:end] = values
+        index = end
+    return result
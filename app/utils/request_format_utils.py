@@ -4,6 +4,15 @@ from flask import request
 from functools import wraps
 from datetime import datetime
 
+def is_htmx_request():
+    """
+    Indique si la requête courante est émise par HTMX (en-tête HX-Request).
+    
+    Les routes de modification répondent alors par des fragments HTML, et par du
+    JSON aux autres clients.
+    """
+    return request.headers.get('HX-Request') == 'true'
+
 def parse_request_data(f):
     """
     Décorateur qui analyse les données de la requête et les rend disponibles
@@ -15,6 +24,9 @@ def parse_request_data(f):
     - application/json
     - application/x-www-form-urlencoded
     - multipart/form-data
+    
+    Un corps JSON peut aussi être un tableau d'objets (création groupée).
+    Pour une requête GET, les paramètres de la chaîne de requête sont utilisés.
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -42,8 +54,18 @@ def parse_request_data(f):
             if request.files:
                 request.parsed_files = request.files
         
+        elif request.method == 'GET':
+            # Paramètres de la chaîne de requête (filtres, pagination)
+            request.parsed_data = request.args.to_dict(flat=True)
+        
         # Conversion des types pour les champs communs
-        _convert_common_types(request.parsed_data)
+        # (pour un tableau JSON, chaque élément est converti)
+        if isinstance(request.parsed_data, list):
+            for item in request.parsed_data:
+                if isinstance(item, dict):
+                    _convert_common_types(item)
+        else:
+            _convert_common_types(request.parsed_data)
             
         return f(*args, **kwargs)
     
@@ -66,7 +88,7 @@ def _convert_common_types(data):
                     data[field] = None   # Convertir en None pour les champs optionnels
     
     # Liste des champs qui doivent être convertis en booléens
-    bool_fields = ['is_priority', 'is_template', 'is_completed', 'is_active']
+    bool_fields = ['is_priority', 'is_template', 'is_completed', 'is_active', 'include_archived']
     
     for field in bool_fields:
         if field in data:
@@ -75,7 +97,7 @@ def _convert_common_types(data):
                 data[field] = data[field].lower() in ('true', 'yes', 'y', '1', 'on')
     
     # Liste des champs qui doivent être convertis en dates
-    date_fields = ['due_date', 'created_at', 'updated_at', 'completed_at']
+    date_fields = ['due_date', 'created_at', 'updated_at', 'completed_at', 'date_from', 'date_to']
     
     for field in date_fields:
         if field in data and data[field] and isinstance(data[field], str):
@@ -0,0 +1,102 @@
+"""
+File: app/utils/search_utils.py
+Role: Utilitaires de recherche plein texte
+Description: Découpe la saisie libre de l'utilisateur en mots, construit la requête MATCH
+             FTS5 correspondante et surligne les mots trouvés dans un titre
+Input data: Texte saisi dans le champ de recherche, titre d'une activité trouvée
+Output data: Mots cherchés, requête FTS5, titre HTML surligné
+Business constraints:
+- La syntaxe FTS5 (opérateurs, colonnes, guillemets) n'est jamais transmise telle quelle
+- Tous les mots doivent être présents (ET implicite), chacun comme préfixe
+- Un mot d'une seule lettre n'est cherché que comme mot complet : un préfixe aussi court
+  parcourrait tout le vocabulaire de l'index
+- La comparaison ignore la casse et les accents, comme le tokenizer de l'index
+  (unicode61 remove_diacritics 2)
+"""
+
+import re
+import unicodedata
+
+from markupsafe import Markup, escape
+
+# Mots pris en compte au plus (les suivants sont ignorés)
+MAX_SEARCH_TERMS = 8
+
+# Longueur minimale d'un mot cherché comme préfixe (index FTS5 prefix='2 3')
+MIN_PREFIX_LENGTH = 2
+
+_WORD = re.compile(r'\w+')
+
+
+def fold_text(text):
+    """
+    Normalise un texte pour la comparaison : minuscules, sans accents
+
+    Args:
+        text (str): Texte à normaliser
+
+    Returns:
+        str: Texte normalisé ("Médecin" -> "medecin")
+    """
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def split_search_terms(text):
+    """
+    Découpe une saisie libre en mots cherchés (normalisés)
+
+    Args:
+        text (str): Saisie de l'utilisateur
+
+    Returns:
+        list: Mots normalisés, au plus MAX_SEARCH_TERMS
+    """
+    return [fold_text(term) for term in _WORD.findall(text or '')][:MAX_SEARCH_TERMS]
+
+
+def build_match_query(terms):
+    """
+    Construit la requête MATCH FTS5 correspondant à des mots cherchés
+
+    Args:
+        terms (list): Mots renvoyés par split_search_terms
+
+    Returns:
+        str: Requête FTS5 (ex. '"rapport"* "men"*'), ou None si aucun mot
+    """
+    if not terms:
+        return None
+    return ' '.join(
+        f'"{term}"*' if len(term) >= MIN_PREFIX_LENGTH else f'"{term}"'
+        for term in terms
+    )
+
+
+def highlight_terms(text, terms):
+    """
+    Entoure de <mark> les mots d'un texte trouvés par la recherche
+
+    Args:
+        text (str): Texte à afficher (titre d'une activité)
+        terms (list): Mots renvoyés par split_search_terms
+
+    Returns:
+        Markup: Texte échappé, mots trouvés surlignés
+    """
+    def matches(word):
+        folded = fold_text(word)
+        return any(
+            folded.startswith(term) if len(term) >= MIN_PREFIX_LENGTH else folded == term
+            for term in terms
+        )
+
+    parts = []
+    position = 0
+    for word in _WORD.finditer(text):
+        if matches(word.group()):
+            parts.append(escape(text[position:word.start()]))
+            parts.append(Markup('<mark>%s</mark>') % word.group())
+            position = word.end()
+    parts.append(escape(text[position:]))
+    return Markup('').join(parts)
@@ -0,0 +1,107 @@
+"""
+File: app/utils/template_utils.py
+Role: Profils d'environnement Jinja (rechargement, cache de bytecode, précompilation)
+Description: Définit par environnement (SEMAINIER_ENV) le réglage de l'environnement
+             Jinja de l'application et précompile les templates au démarrage d'un worker
+Input data: Nom d'environnement, application Flask
+Output data: Environnement Jinja configuré, nombre de templates compilés
+Business constraints:
+- En production, les templates ne sont jamais revérifiés sur disque (auto_reload désactivé) :
+  une modification de template exige un redémarrage des workers
+- Le cache de bytecode est partagé par les workers (dossier instance/jinja_cache) ; une
+  entrée dont la source a changé est ignorée par Jinja (somme de contrôle), sans purge
+- La précompilation remplit aussi le cache mémoire de l'environnement : le premier rendu
+  d'un worker ne relit ni ne recompile aucun template
+"""
+
+import os
+import time
+from typing import Dict
+
+from jinja2 import FileSystemBytecodeCache
+
+# Profils Jinja par environnement
+# auto_reload: None = suit le mode debug (comportement par défaut de Flask)
+TEMPLATE_PROFILES = {
+    'development': {
+        'auto_reload': None,
+        'bytecode_cache': False,
+        'precompile': False,
+    },
+    'testing': {
+        'auto_reload': None,
+        'bytecode_cache': False,
+        'precompile': False,
+    },
+    'production': {
+        'auto_reload': False,
+        'bytecode_cache': True,
+        'precompile': True,
+    },
+}
+
+# Sous-dossier de instance/ contenant le cache de bytecode
+BYTECODE_CACHE_FOLDER = 'jinja_cache'
+
+
+def get_template_profile(env_name: str) -> Dict:
+    """
+    Retourne une copie du profil Jinja d'un environnement
+
+    Args:
+        env_name: Nom de l'environnement ('development', 'testing' ou 'production')
+
+    Returns:
+        dict: Réglages auto_reload, bytecode_cache, precompile
+
+    Raises:
+        ValueError: Si l'environnement est inconnu
+    """
+    if env_name not in TEMPLATE_PROFILES:
+        raise ValueError(f"Environnement inconnu: {env_name}. "
+                         f"Valeurs possibles: {', '.join(TEMPLATE_PROFILES)}")
+    return dict(TEMPLATE_PROFILES[env_name])
+
+
+def configure_templates(app) -> None:
+    """
+    Applique le profil Jinja de l'application (config TEMPLATE_PROFILE) à son environnement
+
+    Doit être appelé avant le premier rendu.
+
+    Args:
+        app: L'application Flask
+    """
+    profile = app.config['TEMPLATE_PROFILE']
+    if profile.get('auto_reload') is not None:
+        app.config['TEMPLATES_AUTO_RELOAD'] = profile['auto_reload']
+        app.jinja_env.auto_reload = profile['auto_reload']
+
+    if profile.get('bytecode_cache'):
+        directory = app.config['TEMPLATE_BYTECODE_CACHE_DIR']
+        os.makedirs(directory, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+
+def precompile_templates(app) -> int:
+    """
+    Charge tous les templates de l'application dans l'environnement Jinja
+
+    Chaque template est compilé (ou relu depuis le cache de bytecode) puis conservé dans
+    le cache mémoire de l'environnement.
+
+    Args:
+        app: L'application Flask
+
+    Returns:
+        int: Nombre de templates compilés
+    """
+    env = app.jinja_env
+    names = env.list_templates(filter_func=lambda name: name.endswith('.html'))
+
+    start = time.perf_counter()
+    for name in names:
+        env.get_template(name)
+    app.logger.info("Templates: %d compilés en %.0f ms", len(names),
+                    (time.perf_counter() - start) * 1000)
+    return len(names)
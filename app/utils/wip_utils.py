@@ -3,7 +3,8 @@ File: app/utils/wip_utils.py
 Role: Utilitaires de calcul de la limite de travail en cours (WIP limit)
 Description: Fournit des fonctions pour calculer et évaluer la limite de travail 
              en cours basée sur les durées des activités, sans interaction directe avec la base de données
-Input data: Durées d'activités, listes d'activités (fournies par les contrôleurs)
+Input data: Durées d'activités, listes d'activités ou compteurs agrégés (fournis par les
+            contrôleurs ou par Activity.get_stats)
 Output data: Statistiques de WIP limit, nombre d'unités de temps, statut de la limite
 Business constraints:
 - Chaque activité a une durée (S, M, L) correspondant à un nombre spécifique d'unités de temps
@@ -13,6 +14,13 @@ Business constraints:
 from typing import Dict, List, Union, Optional
 from app.models.activity import DurationSize
 
+# Unités de temps par code de durée (partagé avec l'agrégation SQL Activity.get_stats)
+TIME_UNITS = {
+    'S': 1,  # Small = 1 unité
+    'M': 3,  # Medium = 3 unités
+    'L': 6   # Large = 6 unités
+}
+
 
 def calculate_time_units(duration: str) -> int:
     """
@@ -24,17 +32,11 @@ def calculate_time_units(duration: str) -> int:
     Returns:
         int: Nombre d'unités de temps
     """
-    duration_map = {
-        'S': 1,  # Small = 1 unité
-        'M': 3,  # Medium = 3 unités
-        'L': 6   # Large = 6 unités
-    }
-    
     # Gérer le cas où duration peut être un DurationSize.value ou une chaîne
     if isinstance(duration, DurationSize):
         duration = duration.value
         
-    return duration_map.get(duration.upper(), 0)
+    return TIME_UNITS.get(duration.upper(), 0)
 
 
 def calculate_activities_stats(activities: List) -> Dict:
@@ -74,8 +76,27 @@ def calculate_activities_stats(activities: List) -> Dict:
         if activity.is_completed:
             completed_count += 1
     
+    return build_activities_stats(total_units, len(activities), duration_counts, completed_count)
+
+
+def build_activities_stats(total_units: int, activities_count: int,
+                           duration_counts: Dict, completed_count: int) -> Dict:
+    """
+    Assemble le dictionnaire de statistiques à partir des compteurs
+    
+    Utilisé par calculate_activities_stats (objets en mémoire) et par
+    Activity.get_stats (agrégation SQL) pour garantir un format identique.
+    
+    Args:
+        total_units: Nombre total d'unités de temps
+        activities_count: Nombre total d'activités
+        duration_counts: Nombre d'activités par code de durée (S, M, L)
+        completed_count: Nombre d'activités terminées
+        
+    Returns:
+        dict: Statistiques des activités (voir calculate_activities_stats)
+    """
     # Calculer le taux de complétion
-    activities_count = len(activities)
     completion_rate = (completed_count / activities_count * 100) if activities_count > 0 else 0
     
     return {
@@ -0,0 +1,142 @@
+"""
+File: benchmarks/bench_board_render.py
+Role: Benchmark du rendu du tableau des listes
+Description: Compare le chargement et le rendu de components/lists.html entre des activités
+             hydratées en objets ORM (ancien chargement) et les projections ActivityCard
+             utilisées par List.load_content
+Input data: Nombre total d'activités (argument optionnel, 5000 par défaut)
+Output data: Tableau texte (durée moyenne du chargement seul et du chargement + rendu,
+             pic mémoire)
+Business constraints:
+- Base SQLite en mémoire, indépendante du dossier instance
+- Usage: python benchmarks/bench_board_render.py [nombre_activités]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import render_template
+from markupsafe import Markup
+from sqlalchemy import insert
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app import create_app, db
+from app.models import List, Sublist, Activity
+
+LISTS = 10
+SUBLISTS_PER_LIST = 5
+RUNS = 5
+
+
+def seed(total):
+    """Crée LISTS listes de SUBLISTS_PER_LIST sous-listes et `total` activités réparties"""
+    lists = [List(name=f'Liste {i}') for i in range(LISTS)]
+    db.session.add_all(lists)
+    db.session.commit()
+    sublists = [Sublist(name=f'Sous-liste {i}', list_id=list_obj.id, position=i)
+                for list_obj in lists for i in range(SUBLISTS_PER_LIST)]
+    db.session.add_all(sublists)
+    db.session.commit()
+
+    rows = []
+    for i in range(total):
+        sublist = sublists[i % len(sublists)]
+        rows.append({'title': f'Activité {i}', 'list_id': sublist.list_id,
+                     'sublist_id': sublist.id if i % 4 else 0,
+                     'position': (i + 1) * Activity.POSITION_GAP})
+    db.session.execute(insert(Activity), rows)
+    db.session.commit()
+
+
+def orm_board():
+    """Ancien chargement : activités hydratées et rattachées aux relations des sous-listes"""
+    lists = List.get_all()
+    list_ids = [list_obj.id for list_obj in lists]
+    sublists_by_list = Sublist.get_by_list_ids(list_ids)
+    activities = Activity.query.filter(Activity.list_id.in_(list_ids)).order_by(
+        Activity.position, Activity.id
+    ).all()
+
+    activities_by_list = {list_id: [] for list_id in list_ids}
+    for activity in activities:
+        activities_by_list[activity.list_id].append(activity)
+
+    board = []
+    for list_obj in lists:
+        sublists = sublists_by_list[list_obj.id]
+        buckets = {sublist.id: [] for sublist in sublists}
+        list_activities = activities_by_list[list_obj.id]
+        for activity in list_activities:
+            buckets[activity.sublist_id or 0].append(activity)
+        for sublist in sublists:
+            set_committed_value(sublist, 'activities', buckets[sublist.id])
+        board.append({'list': list_obj, 'sublists': sublists, 'activities': list_activities})
+    return board
+
+
+def projected_board():
+    """Chargement actuel : projections ActivityCard (voir List.load_content)"""
+    return [
+        {'list': list_obj, 'sublists': sublists, 'activities': activities}
+        for list_obj, sublists, activities in List.get_all_with_content()
+    ]
+
+
+def render(loader):
+    """Charge le tableau puis rend le composant, comme la route /board (cache de fragments vide)"""
+    board = loader()
+    contents = {
+        entry['list'].id: Markup(render_template('components/list_content.html',
+                                                 list_item=entry['list'],
+                                                 sublists=entry['sublists'],
+                                                 activities=entry['activities']))
+        for entry in board
+    }
+    html = render_template('components/lists.html',
+                           lists=[entry['list'] for entry in board], contents=contents)
+    # Libère les objets chargés, comme en fin de requête
+    db.session.remove()
+    return html
+
+
+def measure(loader):
+    """Retourne les durées moyennes (chargement seul, chargement + rendu) et le pic mémoire"""
+    render(loader)  # Préchauffage (compilation des templates, requêtes préparées)
+
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        loader()
+        db.session.remove()
+    loading = (time.perf_counter() - start) / RUNS
+
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        render(loader)
+    elapsed = (time.perf_counter() - start) / RUNS
+
+    tracemalloc.start()
+    render(loader)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return loading, elapsed, peak
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    app = create_app(test_config={'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+    with app.test_request_context():
+        db.create_all()
+        seed(total)
+        print(f"{total} activités, {LISTS} listes")
+        print(f"{'chargement':<12} {'ms/charg.':>10} {'ms/rendu':>9} {'pic Mo':>8}")
+        for label, loader in (('ORM', orm_board), ('projection', projected_board)):
+            loading, elapsed, peak = measure(loader)
+            print(f"{label:<12} {loading * 1000:>10.1f} {elapsed * 1000:>9.1f} {peak / 1e6:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
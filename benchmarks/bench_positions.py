@@ -0,0 +1,118 @@
+"""
+File: benchmarks/bench_positions.py
+Role: Benchmark de l'amplification d'écriture des positions d'activités
+Description: Compare le nombre de lignes écrites par insertion entre l'ancienne
+             renumérotation complète (1..N après chaque création) et les positions
+             clairsemées (insertion en tête par Activity.top_position, glisser-déposer
+             d'une carte par Activity.apply_orderings, chemin de POST /activities/reorder)
+Input data: Tailles de conteneur et nombre d'insertions (arguments optionnels)
+Output data: Tableau texte (lignes écrites par opération, durée moyenne)
+Business constraints:
+- Base SQLite en mémoire, indépendante du dossier instance
+- Usage: python benchmarks/bench_positions.py [taille ...]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from sqlalchemy import event
+
+from app import db
+from app.models import List, Activity
+
+INSERTS = 50
+
+
+def make_app():
+    """Crée une application minimale sur une base SQLite en mémoire"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    return app
+
+
+class WriteCounter:
+    """Compte les lignes écrites (INSERT/UPDATE/DELETE) sur le moteur"""
+
+    def __init__(self, engine):
+        self.rows = 0
+        event.listen(engine, 'after_cursor_execute', self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE')):
+            self.rows += max(cursor.rowcount, 0)
+
+
+def legacy_create(list_id, title):
+    """Création suivie d'une renumérotation complète 1..N (ancien comportement)"""
+    activity = Activity(title=title, list_id=list_id, position=0)
+    db.session.add(activity)
+    db.session.commit()
+    activities = Activity.query.filter_by(list_id=list_id, sublist_id=0).order_by(Activity.position).all()
+    for index, item in enumerate(activities, start=1):
+        item.position = index
+    db.session.commit()
+
+
+def sparse_create(list_id, title):
+    """Création en tête avec une position clairsemée"""
+    Activity.create({'title': title, 'list_id': list_id})
+
+
+def sparse_move(list_id):
+    """Glisser-déposer d'une carte à une place tirée au hasard (ordre complet du conteneur)"""
+    activities = Activity.query.filter_by(list_id=list_id, sublist_id=0).order_by(Activity.position).all()
+    moved = activities.pop(random.randrange(len(activities)))
+    activities.insert(random.randrange(len(activities) + 1), moved)
+    Activity.apply_orderings([(list_id, 0, activities)])
+
+
+def run(size, counter):
+    """Mesure les trois scénarios pour un conteneur de `size` activités"""
+    results = []
+    for label, operation in (('renumérotation', legacy_create), ('clairsemée', sparse_create)):
+        db.drop_all()
+        db.create_all()
+        list_obj = List(name='Bench')
+        db.session.add(list_obj)
+        db.session.commit()
+        db.session.add_all([Activity(title=f'a{i}', list_id=list_obj.id,
+                                     position=(i + 1) * Activity.POSITION_GAP) for i in range(size)])
+        db.session.commit()
+
+        counter.rows = 0
+        start = time.perf_counter()
+        for i in range(INSERTS):
+            operation(list_obj.id, f'new{i}')
+        elapsed = time.perf_counter() - start
+        results.append((f'insertion ({label})', counter.rows / INSERTS, elapsed / INSERTS))
+
+        if label == 'clairsemée':
+            counter.rows = 0
+            start = time.perf_counter()
+            for _ in range(INSERTS):
+                sparse_move(list_obj.id)
+            elapsed = time.perf_counter() - start
+            results.append(('déplacement (clairsemée)', counter.rows / INSERTS, elapsed / INSERTS))
+    return results
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 500, 2000]
+    random.seed(42)
+    app = make_app()
+    with app.app_context():
+        counter = WriteCounter(db.engine)
+        print(f"{'taille':>7}  {'scénario':<28} {'lignes/op':>10} {'ms/op':>8}")
+        for size in sizes:
+            for label, rows, seconds in run(size, counter):
+                print(f"{size:>7}  {label:<28} {rows:>10.1f} {seconds * 1000:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+File: benchmarks/bench_template_startup.py
+Role: Benchmark du premier rendu d'un worker selon le profil Jinja
+Description: Lance chaque mesure dans un nouveau processus (worker à froid) et compare,
+             pour les pages servies en premier après un déploiement, le temps du premier
+             rendu : profil de développement, cache de bytecode vide, cache de bytecode
+             rempli, et profil de production (précompilation au démarrage)
+Input data: Aucune
+Output data: Tableau texte (durée de create_app, du premier rendu et du second rendu)
+Business constraints:
+- Lecture seule de la base de l'instance (migrée) ; cache de bytecode dans un dossier
+  temporaire
+- bytecode-* : profil de production sans précompilation (cache vide, ou rempli au
+  déploiement) ; production : cache rempli au déploiement et précompilation au démarrage
+- Usage: python benchmarks/bench_template_startup.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Pages demandées par un navigateur à l'ouverture de l'application
+URLS = ['/board', '/objectives', '/modals/create-list', '/modals/create-activity']
+RUNS = 5
+
+
+def worker(mode, cache_dir):
+    """Mesure dans le processus courant (à froid) : démarrage puis deux séries de rendus"""
+    start = time.perf_counter()
+    from app import create_app
+    from app.utils.template_utils import get_template_profile, configure_templates, precompile_templates
+
+    app = create_app('development')
+    if mode != 'development':
+        # Profil de production, avec le cache de bytecode dans le dossier du banc
+        app.config['TEMPLATE_PROFILE'] = get_template_profile('production')
+        app.config['TEMPLATE_BYTECODE_CACHE_DIR'] = cache_dir
+        configure_templates(app)
+    if mode in ('compile', 'production'):
+        precompile_templates(app)
+    startup = time.perf_counter() - start
+
+    client = app.test_client()
+    timings = []
+    for _ in range(2):
+        start = time.perf_counter()
+        for url in URLS:
+            assert client.get(url).status_code == 200, url
+        timings.append(time.perf_counter() - start)
+    print(json.dumps({'startup': startup, 'first': timings[0], 'second': timings[1]}))
+
+
+def run(mode, cache_dir):
+    """Lance une mesure dans un nouveau processus et retourne ses durées (s)"""
+    output = subprocess.run([sys.executable, __file__, '--worker', mode, cache_dir],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    print(f"{'profil':<15} {'ms démarrage':>13} {'ms 1er rendu':>13} {'ms 2e rendu':>12}")
+    for mode in ('development', 'bytecode-cold', 'bytecode-warm', 'production'):
+        results = []
+        for _ in range(RUNS):
+            with tempfile.TemporaryDirectory() as cache_dir:
+                if mode in ('bytecode-warm', 'production'):
+                    run('compile', cache_dir)  # Cache rempli au déploiement (flask templates compile)
+                results.append(run(mode, cache_dir))
+        mean = {key: sum(result[key] for result in results) / RUNS * 1000 for key in results[0]}
+        print(f"{mode:<15} {mean['startup']:>13.1f} {mean['first']:>13.1f} {mean['second']:>12.1f}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == '--worker':
+        worker(sys.argv[2], sys.argv[3])
+    else:
+        main()
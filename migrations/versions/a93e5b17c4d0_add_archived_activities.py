@@ -0,0 +1,87 @@
+"""Add archive table for completed activities
+
+Revision ID: a93e5b17c4d0
+Revises: f2c7d9a4b8e1
+Create Date: 2026-10-17 03:38:36
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a93e5b17c4d0'
+down_revision = 'f2c7d9a4b8e1'
+branch_labels = None
+depends_on = None
+
+# Même définition que app.models.sublist.SUBLIST_DELETE_TRIGGER
+SUBLIST_DELETE_TRIGGER = """
+CREATE TRIGGER trg_sublists_delete_activities
+AFTER DELETE ON sublists
+BEGIN
+    DELETE FROM activities WHERE sublist_id = OLD.id;
+    DELETE FROM archived_activities WHERE sublist_id = OLD.id;
+END
+"""
+
+# Définition précédente (migration f2c7d9a4b8e1)
+PREVIOUS_SUBLIST_DELETE_TRIGGER = """
+CREATE TRIGGER trg_sublists_delete_activities
+AFTER DELETE ON sublists
+BEGIN
+    DELETE FROM activities WHERE sublist_id = OLD.id;
+END
+"""
+
+
+def upgrade():
+    op.create_table('archived_activities',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('activity_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('list_id', sa.Integer(), nullable=False),
+    sa.Column('sublist_id', sa.Integer(), nullable=False),
+    sa.Column('duration', sa.Enum('SMALL', 'MEDIUM', 'LARGE', name='durationsize'), nullable=True),
+    sa.Column('due_date', sa.Date(), nullable=True),
+    sa.Column('start_time', sa.Time(), nullable=True),
+    sa.Column('is_priority', sa.Boolean(), nullable=True),
+    sa.Column('position', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_completed', sa.Boolean(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['list_id'], ['lists.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('archived_activities', schema=None) as batch_op:
+        batch_op.create_index('ix_archived_activities_completed_at', ['completed_at'], unique=False)
+        batch_op.create_index('ix_archived_activities_due_date', ['due_date'], unique=False)
+        batch_op.create_index('ix_archived_activities_list_completed_at', ['list_id', 'completed_at'], unique=False)
+        batch_op.create_index('ix_archived_activities_sublist_id', ['sublist_id'], unique=False)
+
+    with op.batch_alter_table('activities', schema=None) as batch_op:
+        batch_op.create_index('ix_activities_completed_at', ['completed_at'], unique=False,
+                              sqlite_where=sa.text('is_completed = 1'))
+
+    # La cascade depuis une sous-liste couvre aussi l'archive
+    op.execute("DROP TRIGGER IF EXISTS trg_sublists_delete_activities")
+    op.execute(SUBLIST_DELETE_TRIGGER)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS trg_sublists_delete_activities")
+    op.execute(PREVIOUS_SUBLIST_DELETE_TRIGGER)
+
+    with op.batch_alter_table('activities', schema=None) as batch_op:
+        batch_op.drop_index('ix_activities_completed_at', sqlite_where=sa.text('is_completed = 1'))
+
+    with op.batch_alter_table('archived_activities', schema=None) as batch_op:
+        batch_op.drop_index('ix_archived_activities_sublist_id')
+        batch_op.drop_index('ix_archived_activities_list_completed_at')
+        batch_op.drop_index('ix_archived_activities_due_date')
+        batch_op.drop_index('ix_archived_activities_completed_at')
+
+    op.drop_table('archived_activities')
@@ -0,0 +1,94 @@
+"""Full-text search index over activities
+
+Revision ID: b58d0e2f7a16
+Revises: a93e5b17c4d0
+Create Date: 2026-10-17 03:47:11
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b58d0e2f7a16'
+down_revision = 'a93e5b17c4d0'
+branch_labels = None
+depends_on = None
+
+# Mêmes définitions que app.models.activity_search
+FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS activities_fts USING fts5(
+    title, sublist_name, list_name,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+FTS_TRIGGERS = {
+    'trg_activities_fts_insert': """
+    CREATE TRIGGER IF NOT EXISTS trg_activities_fts_insert
+    AFTER INSERT ON activities
+    BEGIN
+        INSERT INTO activities_fts (rowid, title, sublist_name, list_name)
+        VALUES (NEW.id, NEW.title,
+                (SELECT name FROM sublists WHERE id = NEW.sublist_id),
+                (SELECT name FROM lists WHERE id = NEW.list_id));
+    END
+    """,
+    'trg_activities_fts_update': """
+    CREATE TRIGGER IF NOT EXISTS trg_activities_fts_update
+    AFTER UPDATE OF title, list_id, sublist_id ON activities
+    BEGIN
+        UPDATE activities_fts
+        SET title = NEW.title,
+            sublist_name = (SELECT name FROM sublists WHERE id = NEW.sublist_id),
+            list_name = (SELECT name FROM lists WHERE id = NEW.list_id)
+        WHERE rowid = NEW.id;
+    END
+    """,
+    'trg_activities_fts_delete': """
+    CREATE TRIGGER IF NOT EXISTS trg_activities_fts_delete
+    AFTER DELETE ON activities
+    BEGIN
+        DELETE FROM activities_fts WHERE rowid = OLD.id;
+    END
+    """,
+    'trg_lists_fts_rename': """
+    CREATE TRIGGER IF NOT EXISTS trg_lists_fts_rename
+    AFTER UPDATE OF name ON lists
+    BEGIN
+        UPDATE activities_fts SET list_name = NEW.name
+        WHERE rowid IN (SELECT id FROM activities WHERE list_id = NEW.id);
+    END
+    """,
+    'trg_sublists_fts_rename': """
+    CREATE TRIGGER IF NOT EXISTS trg_sublists_fts_rename
+    AFTER UPDATE OF name ON sublists
+    BEGIN
+        UPDATE activities_fts SET sublist_name = NEW.name
+        WHERE rowid IN (SELECT id FROM activities WHERE sublist_id = NEW.id);
+    END
+    """,
+}
+
+FTS_FILL = """
+INSERT INTO activities_fts (rowid, title, sublist_name, list_name)
+SELECT activities.id, activities.title, sublists.name, lists.name
+FROM activities
+JOIN lists ON lists.id = activities.list_id
+LEFT JOIN sublists ON sublists.id = activities.sublist_id
+"""
+
+
+def upgrade():
+    op.execute(FTS_TABLE)
+    op.execute(FTS_FILL)
+    op.execute("INSERT INTO activities_fts (activities_fts) VALUES ('optimize')")
+    for trigger in FTS_TRIGGERS.values():
+        op.execute(trigger)
+
+
+def downgrade():
+    for name in FTS_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS activities_fts")
@@ -0,0 +1,33 @@
+"""Add activities and sublists indexes
+
+Revision ID: b7d41c2e9a10
+Revises: 3942e763ac81
+Create Date: 2026-10-17 03:07:36
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d41c2e9a10'
+down_revision = '3942e763ac81'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_activities_list_sublist_position', 'activities', ['list_id', 'sublist_id', 'position'], unique=False)
+    op.create_index('ix_activities_sublist_id', 'activities', ['sublist_id'], unique=False)
+    op.create_index('ix_activities_due_date_position', 'activities', ['due_date', 'position'], unique=False)
+    op.create_index('ix_activities_open_due_date', 'activities', ['due_date', 'position'], unique=False,
+                    sqlite_where=sa.text('is_completed = 0'))
+    op.create_index('ix_sublists_list_position', 'sublists', ['list_id', 'position'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_sublists_list_position', table_name='sublists')
+    op.drop_index('ix_activities_open_due_date', table_name='activities')
+    op.drop_index('ix_activities_due_date_position', table_name='activities')
+    op.drop_index('ix_activities_sublist_id', table_name='activities')
+    op.drop_index('ix_activities_list_sublist_position', table_name='activities')
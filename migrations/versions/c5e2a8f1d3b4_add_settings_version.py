@@ -0,0 +1,26 @@
+"""Add settings version counter
+
+Revision ID: c5e2a8f1d3b4
+Revises: b7d41c2e9a10
+Create Date: 2026-10-17 03:17:19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e2a8f1d3b4'
+down_revision = 'b7d41c2e9a10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('settings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('settings', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,89 @@
+"""Add list content version counters
+
+Revision ID: c6f1a2d9e8b3
+Revises: b58d0e2f7a16
+Create Date: 2026-10-17 03:52:44
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6f1a2d9e8b3'
+down_revision = 'b58d0e2f7a16'
+branch_labels = None
+depends_on = None
+
+
+def _stamp(list_id, condition='1'):
+    # Même définition que app.models.list_version._stamp
+    return f"""
+        INSERT INTO list_versions (list_id, version) VALUES (0, 1)
+            ON CONFLICT (list_id) DO UPDATE SET version = version + 1;
+        INSERT INTO list_versions (list_id, version)
+            SELECT {list_id}, version FROM list_versions
+            WHERE list_id = 0 AND ({condition})
+              AND EXISTS (SELECT 1 FROM lists WHERE id = {list_id})
+            ON CONFLICT (list_id) DO UPDATE SET version = excluded.version;"""
+
+
+# Mêmes définitions que app.models.list_version.VERSION_TRIGGERS
+VERSION_TRIGGERS = {
+    f'trg_{table}_version_{action}': f"""
+    CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{action}
+    AFTER {action.upper()} ON {table}
+    BEGIN{body}
+    END
+    """
+    for table in ('activities', 'sublists')
+    for action, body in (
+        ('insert', _stamp('NEW.list_id')),
+        ('update', _stamp('NEW.list_id') + _stamp('OLD.list_id', 'OLD.list_id <> NEW.list_id')),
+        ('delete', _stamp('OLD.list_id')),
+    )
+}
+VERSION_TRIGGERS.update({
+    'trg_lists_version_insert': f"""
+    CREATE TRIGGER IF NOT EXISTS trg_lists_version_insert
+    AFTER INSERT ON lists
+    BEGIN{_stamp('NEW.id')}
+    END
+    """,
+    'trg_lists_version_update': f"""
+    CREATE TRIGGER IF NOT EXISTS trg_lists_version_update
+    AFTER UPDATE ON lists
+    BEGIN{_stamp('NEW.id')}
+    END
+    """,
+    'trg_lists_version_delete': """
+    CREATE TRIGGER IF NOT EXISTS trg_lists_version_delete
+    AFTER DELETE ON lists
+    BEGIN
+        INSERT INTO list_versions (list_id, version) VALUES (0, 1)
+            ON CONFLICT (list_id) DO UPDATE SET version = version + 1;
+        DELETE FROM list_versions WHERE list_id = OLD.id;
+    END
+    """,
+})
+
+
+def upgrade():
+    op.create_table('list_versions',
+    sa.Column('list_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('list_id')
+    )
+
+    # Version initiale : compteur global et toutes les listes existantes à 1
+    op.execute("INSERT INTO list_versions (list_id, version) VALUES (0, 1)")
+    op.execute("INSERT INTO list_versions (list_id, version) SELECT id, 1 FROM lists")
+    for trigger in VERSION_TRIGGERS.values():
+        op.execute(trigger)
+
+
+def downgrade():
+    for name in VERSION_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+    op.drop_table('list_versions')
@@ -0,0 +1,24 @@
+"""Add activities list/due date index for paginated listing
+
+Revision ID: d8a3f61c27e5
+Revises: c5e2a8f1d3b4
+Create Date: 2026-10-17 03:25:16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8a3f61c27e5'
+down_revision = 'c5e2a8f1d3b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_activities_list_due_date_position', 'activities', ['list_id', 'due_date', 'position'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_activities_list_due_date_position', table_name='activities')
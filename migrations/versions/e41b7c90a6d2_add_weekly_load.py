@@ -0,0 +1,50 @@
+"""Add weekly load counters
+
+Revision ID: e41b7c90a6d2
+Revises: d8a3f61c27e5
+Create Date: 2026-10-17 03:28:52
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e41b7c90a6d2'
+down_revision = 'd8a3f61c27e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('weekly_load',
+    sa.Column('week_start', sa.Date(), nullable=False),
+    sa.Column('activities_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('total_time_units', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('small_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('medium_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('large_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('completed_count', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('week_start')
+    )
+
+    # Initialisation des compteurs depuis les activités existantes
+    # (même calcul que WeeklyLoad.rebuild : S=1, M=3, L=6 unités)
+    op.execute("""
+        INSERT INTO weekly_load (week_start, activities_count, total_time_units,
+                                 small_count, medium_count, large_count, completed_count)
+        SELECT date(due_date, 'weekday 0', '-6 days'),
+               count(id),
+               sum(CASE duration WHEN 'SMALL' THEN 1 WHEN 'MEDIUM' THEN 3 WHEN 'LARGE' THEN 6 ELSE 0 END),
+               sum(CASE WHEN duration = 'SMALL' THEN 1 ELSE 0 END),
+               sum(CASE WHEN duration = 'MEDIUM' THEN 1 ELSE 0 END),
+               sum(CASE WHEN duration = 'LARGE' THEN 1 ELSE 0 END),
+               sum(CASE WHEN is_completed = 1 THEN 1 ELSE 0 END)
+        FROM activities
+        WHERE due_date IS NOT NULL
+        GROUP BY date(due_date, 'weekday 0', '-6 days')
+    """)
+
+
+def downgrade():
+    op.drop_table('weekly_load')
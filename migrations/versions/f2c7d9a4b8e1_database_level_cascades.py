@@ -0,0 +1,69 @@
+"""Database-level cascade deletes for sublists and activities
+
+Revision ID: f2c7d9a4b8e1
+Revises: e41b7c90a6d2
+Create Date: 2026-10-17 03:34:49
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c7d9a4b8e1'
+down_revision = 'e41b7c90a6d2'
+branch_labels = None
+depends_on = None
+
+# Nom donné à la clé étrangère activities.sublist_id (créée sans nom par la migration initiale)
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+SUBLIST_FK = 'fk_activities_sublist_id_sublists'
+
+# Même définition que app.models.sublist.SUBLIST_DELETE_TRIGGER
+SUBLIST_DELETE_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS trg_sublists_delete_activities
+AFTER DELETE ON sublists
+BEGIN
+    DELETE FROM activities WHERE sublist_id = OLD.id;
+END
+"""
+
+# Recalcul des compteurs hebdomadaires (voir migration e41b7c90a6d2)
+REBUILD_WEEKLY_LOAD = """
+    INSERT INTO weekly_load (week_start, activities_count, total_time_units,
+                             small_count, medium_count, large_count, completed_count)
+    SELECT date(due_date, 'weekday 0', '-6 days'),
+           count(id),
+           sum(CASE duration WHEN 'SMALL' THEN 1 WHEN 'MEDIUM' THEN 3 WHEN 'LARGE' THEN 6 ELSE 0 END),
+           sum(CASE WHEN duration = 'SMALL' THEN 1 ELSE 0 END),
+           sum(CASE WHEN duration = 'MEDIUM' THEN 1 ELSE 0 END),
+           sum(CASE WHEN duration = 'LARGE' THEN 1 ELSE 0 END),
+           sum(CASE WHEN is_completed = 1 THEN 1 ELSE 0 END)
+    FROM activities
+    WHERE due_date IS NOT NULL
+    GROUP BY date(due_date, 'weekday 0', '-6 days')
+"""
+
+
+def upgrade():
+    # Lignes orphelines laissées tant que foreign_keys était désactivé : elles bloqueraient
+    # les contrôles de clés étrangères, et la cascade les aurait supprimées
+    op.execute("DELETE FROM sublists WHERE list_id NOT IN (SELECT id FROM lists)")
+    op.execute("DELETE FROM activities WHERE list_id NOT IN (SELECT id FROM lists)")
+    op.execute("DELETE FROM activities WHERE sublist_id <> 0 "
+               "AND sublist_id NOT IN (SELECT id FROM sublists)")
+    op.execute("DELETE FROM weekly_load")
+    op.execute(REBUILD_WEEKLY_LOAD)
+
+    # La valeur sentinelle 0 (aucune sous-liste) est incompatible avec une clé étrangère active
+    with op.batch_alter_table('activities', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(SUBLIST_FK, type_='foreignkey')
+
+    op.execute(SUBLIST_DELETE_TRIGGER)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS trg_sublists_delete_activities")
+
+    with op.batch_alter_table('activities', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.create_foreign_key(SUBLIST_FK, 'sublists', ['sublist_id'], ['id'], ondelete='SET NULL')
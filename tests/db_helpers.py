@@ -0,0 +1,34 @@
+"""
+File: tests/db_helpers.py
+Role: Outils de test sur les transactions de la base
+Description: Compte les commits de session pour vérifier qu'une action utilisateur
+             n'en fait qu'un
+Input data: Bloc de code exécuté sous le gestionnaire de contexte
+Output data: Sessions validées dans le bloc
+"""
+
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+@contextmanager
+def count_commits():
+    """
+    Enregistre les commits de session effectués dans le bloc
+
+    Chaque commit (synchronisation disque hors WAL) est une session ajoutée à la liste
+    produite : len() donne le nombre de transactions validées par une action.
+
+    Yields:
+        list: Sessions validées, dans l'ordre des commits
+    """
+    commits: List = []
+    listener = commits.append
+    event.listen(Session, 'after_commit', listener)
+    try:
+        yield commits
+    finally:
+        event.remove(Session, 'after_commit', listener)
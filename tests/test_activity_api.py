@@ -2,14 +2,15 @@ import unittest
 import json
 import os
 import sys
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 
 # Ajout du chemin parent au PYTHONPATH pour pouvoir importer l'application
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app import create_app, db
-from app.models import List, Sublist, Activity
+from app.models import List, Sublist, Activity, ArchivedActivity
 from app.models.activity import DurationSize
+from tests.db_helpers import count_commits
 
 
 class ActivityAPITestCase(unittest.TestCase):
@@ -273,6 +274,326 @@ class ActivityAPITestCase(unittest.TestCase):
         response = self.client.get(f'/api/activities/{activity_id}')
         self.assertEqual(response.status_code, 404)
 
+    def test_create_activities_bulk(self):
+        """Test de la création groupée d'activités en une seule transaction"""
+        response = self.client.post(
+            '/activities/bulk',
+            data=json.dumps([
+                {'title': 'Première', 'list_id': self.list_id},
+                {'title': 'Seconde', 'list_id': self.list_id, 'duration': 'M'},
+                {'title': 'Dans la sous-liste', 'list_id': self.list_id, 'sublist_id': self.sublist_id}
+            ]),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 201)
+
+        data = json.loads(response.data)
+        self.assertEqual(data['created'], 3)
+        self.assertEqual(data['failed'], 0)
+        self.assertEqual(data['results'][1]['activity']['duration'], 'M')
+        self.assertEqual(data['results'][2]['activity']['sublist_id'], self.sublist_id)
+
+        # L'ordre du lot est conservé en tête du conteneur
+        activities = Activity.query.filter_by(list_id=self.list_id, sublist_id=0).order_by(Activity.position).all()
+        self.assertEqual([a.title for a in activities], ['Première', 'Seconde'])
+
+    def test_create_activities_bulk_partial_failure(self):
+        """Test du signalement des éléments invalides sans annuler le lot"""
+        other_list = List(name="Autre Liste")
+        db.session.add(other_list)
+        db.session.commit()
+
+        other_sublist = Sublist(name="Autre Sous-liste", list_id=other_list.id)
+        db.session.add(other_sublist)
+        db.session.commit()
+
+        response = self.client.post(
+            '/activities/bulk',
+            data=json.dumps({'activities': [
+                {'title': 'Valide', 'list_id': self.list_id},
+                {'title': 'Sous-liste invalide', 'list_id': self.list_id, 'sublist_id': other_sublist.id},
+                {'title': 'Liste inconnue', 'list_id': 9999},
+                {'title': 'Durée invalide', 'list_id': self.list_id, 'duration': 'XL'},
+                {'list_id': self.list_id}
+            ]}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 207)
+
+        data = json.loads(response.data)
+        self.assertEqual(data['created'], 1)
+        self.assertEqual(data['failed'], 4)
+        self.assertEqual([r['success'] for r in data['results']], [True, False, False, False, False])
+        self.assertEqual(Activity.query.count(), 1)
+
+        response = self.client.post('/activities/bulk', data=json.dumps({}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_create_activities_bulk_invalid_due_date(self):
+        """Test du signalement d'une date d'échéance illisible sans annuler le lot"""
+        response = self.client.post('/activities/bulk', json=[
+            {'title': 'Valide', 'list_id': self.list_id, 'due_date': '2025-03-14'},
+            {'title': 'Date illisible', 'list_id': self.list_id, 'due_date': '14/03/2025'}
+        ])
+        self.assertEqual(response.status_code, 207)
+
+        data = json.loads(response.data)
+        self.assertEqual([r['success'] for r in data['results']], [True, False])
+        self.assertIn("Date d'échéance invalide", data['results'][1]['error'])
+        self.assertEqual(Activity.query.one().due_date, date(2025, 3, 14))
+
+    def test_create_activities_bulk_start_time(self):
+        """Test de la conversion de l'heure de début, et du signalement d'une heure illisible"""
+        response = self.client.post('/activities/bulk', json=[
+            {'title': 'Valide', 'list_id': self.list_id, 'start_time': '14:30'},
+            {'title': 'Heure illisible', 'list_id': self.list_id, 'start_time': 'midi'}
+        ])
+        self.assertEqual(response.status_code, 207)
+
+        data = json.loads(response.data)
+        self.assertEqual([r['success'] for r in data['results']], [True, False])
+        self.assertIn("Heure de début invalide", data['results'][1]['error'])
+        self.assertEqual(Activity.query.one().start_time.strftime('%H:%M'), '14:30')
+
+
+    def test_reorder_activities_across_containers(self):
+        """Test de l'enregistrement d'un glisser-déposer en une seule requête"""
+        other_list = List(name="Autre Liste")
+        db.session.add(other_list)
+        db.session.commit()
+        other_list_id = other_list.id
+
+        activities = [Activity(title=f"Activité {i}", list_id=self.list_id, position=i + 1) for i in range(4)]
+        db.session.add_all(activities)
+        db.session.commit()
+        ids = [activity.id for activity in activities]
+
+        # Inversion dans la liste, passage d'une activité en sous-liste et d'une autre dans une autre liste
+        response = self.client.post(
+            '/activities/reorder',
+            data=json.dumps({'containers': [
+                {'list_id': self.list_id, 'sublist_id': 0, 'activity_ids': [ids[1], ids[0]]},
+                {'list_id': self.list_id, 'sublist_id': self.sublist_id, 'activity_ids': [ids[2]]},
+                {'list_id': other_list_id, 'activity_ids': [ids[3]]}
+            ]}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['list_ids'], sorted([self.list_id, other_list_id]))
+        self.assertEqual(response.headers['HX-Trigger'], ', '.join([
+            f'sublistRefresh-{self.list_id}-0',
+            f'sublistRefresh-{self.list_id}-{self.sublist_id}',
+            f'sublistRefresh-{other_list_id}-0'
+        ]))
+
+        db.session.expire_all()
+        root = Activity.query.filter_by(list_id=self.list_id, sublist_id=0).order_by(Activity.position).all()
+        self.assertEqual([a.id for a in root], [ids[1], ids[0]])
+        self.assertEqual(Activity.get_by_id(ids[2]).sublist_id, self.sublist_id)
+        self.assertEqual(Activity.get_by_id(ids[3]).list_id, other_list_id)
+
+    def test_reorder_activities_rejects_foreign_sublist(self):
+        """Test du rejet complet d'un réordonnancement vers une sous-liste d'une autre liste"""
+        other_list = List(name="Autre Liste")
+        db.session.add(other_list)
+        db.session.commit()
+
+        activity = Activity(title="Activité", list_id=self.list_id)
+        db.session.add(activity)
+        db.session.commit()
+        activity_id = activity.id
+
+        response = self.client.post(
+            '/activities/reorder',
+            data=json.dumps([{'list_id': other_list.id, 'sublist_id': self.sublist_id,
+                              'activity_ids': [activity_id]}]),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+        db.session.expire_all()
+        self.assertEqual(Activity.get_by_id(activity_id).list_id, self.list_id)
+
+    def test_list_activities_keyset_pagination(self):
+        """Test du parcours complet de la liste paginée avec le curseur de continuation"""
+        monday = date(2025, 3, 10)
+        activities = [Activity(title=f"Activité {i}", list_id=self.list_id,
+                               due_date=monday + timedelta(days=i % 3), position=i // 3)
+                      for i in range(7)]
+        for i, activity in enumerate(activities):
+            activity.is_completed = i % 2 == 0
+        activities.append(Activity(title="Sans échéance", list_id=self.list_id, position=0))
+        db.session.add_all(activities)
+        db.session.commit()
+        db.session.execute(db.text("UPDATE activities SET due_date = NULL WHERE title = 'Sans échéance'"))
+        db.session.commit()
+        expected = [a.id for a in Activity.query.order_by(
+            Activity.due_date, Activity.position, Activity.id).all()]
+
+        seen, cursor = [], None
+        while True:
+            url = '/activities?limit=3' + (f'&cursor={cursor}' if cursor else '')
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = json.loads(response.data)
+            self.assertLessEqual(len(data['activities']), 3)
+            seen.extend(a['id'] for a in data['activities'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(seen, expected)
+
+        # Les filtres s'appliquent à chaque page
+        response = self.client.get('/activities?is_completed=false&limit=10')
+        data = json.loads(response.data)
+        self.assertEqual(len(data['activities']), 4)
+        self.assertIsNone(data['next_cursor'])
+
+        self.assertEqual(self.client.get('/activities?cursor=invalide').status_code, 400)
+        self.assertEqual(self.client.get('/activities?limit=0').status_code, 400)
+
+    def test_completed_history_includes_archive_on_request(self):
+        """Test de l'historique des activités terminées, archive comprise sur demande"""
+        now = datetime(2025, 6, 2, 12, 0)
+        for title, completed_at in (("Ancienne", now - timedelta(weeks=10)),
+                                    ("Récente", now - timedelta(days=1))):
+            activity = Activity(title=title, list_id=self.list_id)
+            activity.set_completion(True)
+            activity.completed_at = completed_at
+            db.session.add(activity)
+        db.session.add(Activity(title="En cours", list_id=self.list_id))
+        db.session.commit()
+        self.assertEqual(ArchivedActivity.archive_completed(ArchivedActivity.cutoff(8, now)), 1)
+        
+        data = json.loads(self.client.get('/activities/completed').data)
+        self.assertEqual([entry['title'] for entry in data['activities']], ["Récente"])
+        
+        response = self.client.get(f'/activities/completed?include_archived=true&list_id={self.list_id}')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual([(entry['title'], entry['is_archived']) for entry in data['activities']],
+                         [("Récente", False), ("Ancienne", True)])
+        
+        day = (now - timedelta(weeks=10)).date().isoformat()
+        data = json.loads(self.client.get(
+            f'/activities/completed?include_archived=true&date_from={day}&date_to={day}').data)
+        self.assertEqual([entry['title'] for entry in data['activities']], ["Ancienne"])
+        
+        self.assertEqual(self.client.get('/activities/completed?date_from=hier').status_code, 400)
+        self.assertEqual(self.client.get('/activities/completed?limit=0').status_code, 400)
+
+    def test_search_returns_ranked_fragment(self):
+        """Test du fragment HTMX de recherche des activités"""
+        db.session.add_all([Activity(title="Réviser <le> budget", list_id=self.list_id,
+                                     sublist_id=self.sublist_id),
+                            Activity(title="Budgétiser", list_id=self.list_id),
+                            Activity(title="Courses", list_id=self.list_id)])
+        db.session.commit()
+        
+        response = self.client.get('/activities/search?q=budget')
+        self.assertEqual(response.status_code, 200)
+        html = response.data.decode()
+        self.assertIn("Réviser &lt;le&gt; <mark>budget</mark>", html)
+        self.assertIn("<mark>Budgétiser</mark>", html)
+        self.assertNotIn("Courses", html)
+        
+        self.assertIn("Aucune activité trouvée", self.client.get('/activities/search?q=zzz').data.decode())
+        self.assertNotIn("<li", self.client.get('/activities/search?q=').data.decode())
+        self.assertEqual(self.client.get('/activities/search?q=budget&limit=0').status_code, 400)
+
+    def test_write_routes_commit_once(self):
+        """Test d'un seul commit par action utilisateur sur les routes d'écriture"""
+        activity = Activity(title="Source", list_id=self.list_id, sublist_id=self.sublist_id)
+        db.session.add(activity)
+        db.session.commit()
+        activity_id = activity.id
+
+        requests = [
+            ('post', '/activities', {'title': "Nouvelle", 'list_id': self.list_id,
+                                     'sublist_id': self.sublist_id, 'duration': 'M'}),
+            ('post', f'/activities/{activity_id}/duplicate', None),
+            ('post', f'/activities/{activity_id}/edit_completion', None),
+            ('put', f'/activities/{activity_id}', {'title': "Renommée", 'duration': 'L'}),
+            ('post', f'/activities/{activity_id}/default-date', None),
+            ('delete', f'/activities/{activity_id}', None),
+        ]
+        for method, url, payload in requests:
+            with self.subTest(route=f'{method.upper()} {url}'):
+                kwargs = {'data': json.dumps(payload), 'content_type': 'application/json'} if payload else {}
+                with count_commits() as commits:
+                    response = getattr(self.client, method)(url, **kwargs)
+                self.assertLess(response.status_code, 300)
+                self.assertEqual(len(commits), 1)
+    
+    def test_mutations_refresh_only_their_sublists(self):
+        """Test des événements sublistRefresh et du rendu d'une seule sous-liste"""
+        other = Sublist(name="Autre sous-liste", list_id=self.list_id)
+        db.session.add(other)
+        db.session.add(Activity(title="Hors sous-liste", list_id=self.list_id))
+        db.session.commit()
+        
+        response = self.client.post('/activities', json={
+            'title': 'Nouvelle', 'list_id': self.list_id, 'sublist_id': self.sublist_id})
+        self.assertEqual(response.headers['HX-Trigger'], f'sublistRefresh-{self.list_id}-{self.sublist_id}')
+        activity_id = json.loads(response.data)['id']
+        
+        # Déplacement : sous-listes d'origine et de destination
+        response = self.client.put(f'/activities/{activity_id}', json={
+            'title': 'Nouvelle', 'list_id': self.list_id, 'sublist_id': other.id})
+        self.assertEqual(response.headers['HX-Trigger'], f'sublistRefresh-{self.list_id}-{self.sublist_id}, '
+                                                         f'sublistRefresh-{self.list_id}-{other.id}')
+        
+        response = self.client.get(f'/list/{self.list_id}/sublist/{other.id}')
+        html = response.get_data(as_text=True)
+        self.assertIn(f'id="sublist-{self.list_id}-{other.id}"', html)
+        self.assertIn(f'sublistRefresh-{self.list_id}-{other.id} from:body', html)
+        self.assertIn('Nouvelle', html)
+        self.assertNotIn('Hors sous-liste', html)
+        self.assertIn('Hors sous-liste', self.client.get(f'/list/{self.list_id}/sublist/0').get_data(as_text=True))
+        self.assertEqual(self.client.get(f'/list/{self.list_id}/sublist/{other.id}',
+                                         headers={'If-None-Match': response.headers['ETag']}).status_code, 304)
+        
+        response = self.client.delete(f'/activities/{activity_id}')
+        self.assertEqual(response.headers['HX-Trigger'], f'sublistRefresh-{self.list_id}-{other.id}')
+        self.assertEqual(self.client.get(f'/list/{self.list_id}/sublist/999').status_code, 404)
+
+    def test_htmx_mutations_return_out_of_band_containers(self):
+        """Test des conteneurs hx-swap-oob renvoyés aux requêtes HTMX de création, modification et suppression"""
+        htmx = {'HX-Request': 'true'}
+        other = Sublist(name="Autre sous-liste", list_id=self.list_id)
+        db.session.add(other)
+        db.session.commit()
+        
+        # Création : conteneur de la sous-liste, sans second aller-retour
+        response = self.client.post('/activities', headers=htmx, data={
+            'title': 'Nouvelle', 'list_id': self.list_id, 'sublist_id': self.sublist_id})
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('HX-Trigger', response.headers)
+        html = response.get_data(as_text=True)
+        self.assertIn(f'id="sublist-{self.list_id}-{self.sublist_id}"', html)
+        self.assertIn('Nouvelle', html)
+        # Seul le conteneur est hors bande (pas son en-tête)
+        self.assertEqual(html.count('hx-swap-oob="'), 1)
+        self.assertIn('hx-swap-oob="true"', html)
+        activity_id = Activity.query.filter_by(title='Nouvelle').one().id
+        
+        # Déplacement : conteneurs d'origine (vidé) et de destination
+        response = self.client.post(f'/activities/{activity_id}', headers=htmx, data={
+            'title': 'Déplacée', 'list_id': self.list_id, 'sublist_id': other.id})
+        self.assertEqual(response.status_code, 200)
+        html = response.get_data(as_text=True)
+        self.assertEqual(html.count('hx-swap-oob="true"'), 2)
+        origin, destination = html.split(f'id="sublist-{self.list_id}-{other.id}"')
+        self.assertIn(f'id="sublist-{self.list_id}-{self.sublist_id}"', origin)
+        self.assertNotIn('Déplacée', origin)
+        self.assertIn('Déplacée', destination)
+        
+        # Suppression : conteneur d'origine rendu sans l'activité
+        response = self.client.delete(f'/activities/{activity_id}', headers=htmx)
+        self.assertEqual(response.status_code, 200)
+        html = response.get_data(as_text=True)
+        self.assertIn(f'id="sublist-{self.list_id}-{other.id}"', html)
+        self.assertNotIn('Déplacée', html)
 
 if __name__ == '__main__':
     unittest.main()
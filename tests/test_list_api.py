@@ -3,11 +3,14 @@ import json
 import os
 import sys
 
+from markupsafe import Markup
+
 # Ajout du chemin parent au PYTHONPATH pour pouvoir importer l'application
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app import create_app, db
-from app.models import List
+from app.models import List, Sublist, Activity
+from app.utils.fragment_cache_utils import FragmentCache
 
 
 class ListAPITestCase(unittest.TestCase):
@@ -161,6 +164,120 @@ class ListAPITestCase(unittest.TestCase):
         lists = json.loads(response.data)
         self.assertEqual(len(lists), 0)
 
+    def test_delete_list_reports_removed_rows(self):
+        """Test du nombre de lignes supprimées en cascade renvoyé par la suppression"""
+        list_obj = List(name='Liste pleine')
+        db.session.add(list_obj)
+        db.session.commit()
+        sublist = Sublist(name='Sous-liste', list_id=list_obj.id)
+        db.session.add(sublist)
+        db.session.commit()
+        db.session.add_all([Activity(title=f'Activité {i}', list_id=list_obj.id,
+                                     sublist_id=sublist.id if i % 2 else 0) for i in range(5)])
+        db.session.commit()
+        list_id = list_obj.id
+        
+        response = self.client.delete(f'/lists/{list_id}')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['deleted'], {'lists': 1, 'sublists': 1, 'activities': 5,
+                                           'archived_activities': 0})
+        self.assertEqual(Activity.query.count(), 0)
+        
+        self.assertEqual(self.client.delete(f'/lists/{list_id}').status_code, 404)
+
+    def test_board_renders_all_lists_in_one_response(self):
+        """Test du rendu de toutes les listes et de leur contenu en une seule réponse"""
+        for name in ['Liste A', 'Liste B']:
+            list_obj = List(name=name)
+            db.session.add(list_obj)
+            db.session.commit()
+            db.session.add(Activity(title=f'Activité de {name}', list_id=list_obj.id))
+        db.session.commit()
+        
+        response = self.client.get('/board')
+        self.assertEqual(response.status_code, 200)
+        
+        # Le contenu est rendu directement, sans chargement HTMX par liste
+        self.assertIn('Activité de Liste A', response.get_data(as_text=True))
+        self.assertIn('Activité de Liste B', response.get_data(as_text=True))
+        self.assertNotIn('load once', response.get_data(as_text=True))
+
+    def test_fragments_answer_304_until_content_changes(self):
+        """Test des réponses conditionnelles (ETag) des fragments de listes"""
+        lists = [List(name='Liste A'), List(name='Liste B')]
+        db.session.add_all(lists)
+        db.session.commit()
+        list_a, list_b = (list_obj.id for list_obj in lists)
+        
+        urls = ['/lists', '/board', f'/list/{list_a}', f'/list/{list_b}', '/objectives']
+        etags = {}
+        for url in urls:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+            etags[url] = response.headers['ETag']
+            
+            response = self.client.get(url, headers={'If-None-Match': etags[url]})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.data, b'')
+        
+        # Une activité ajoutée à la liste A : seule la liste B reste inchangée
+        self.client.post('/activities', json={'title': 'Nouvelle', 'list_id': list_a})
+        for url in urls:
+            response = self.client.get(url, headers={'If-None-Match': etags[url]})
+            self.assertEqual(response.status_code, 304 if url == f'/list/{list_b}' else 200, url)
+        
+        # Liste supprimée : pas d'ETag sur la 404
+        self.client.delete(f'/lists/{list_b}')
+        response = self.client.get(f'/list/{list_b}', headers={'If-None-Match': etags[f'/list/{list_b}']})
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response.headers)
+        
+        stats = json.loads(self.client.get('/stats/http-cache').data)
+        self.assertEqual(stats['show_list'], {'hits': 3, 'misses': 3, 'hit_ratio': 0.5})
+        self.assertEqual(stats['show_board'], {'hits': 1, 'misses': 2, 'hit_ratio': 0.333})
+    
+    def test_list_content_served_from_fragment_cache(self):
+        """Test du cache des rendus de listes : réutilisation, invalidation par liste"""
+        lists = [List(name='Liste A'), List(name='Liste B')]
+        db.session.add_all(lists)
+        db.session.commit()
+        list_a, list_b = (list_obj.id for list_obj in lists)
+        
+        board = self.client.get('/board').data
+        self.assertIn(self.client.get(f'/list/{list_a}').data, board)
+        self.assertEqual(self.client.get('/board').data, board)
+        stats = json.loads(self.client.get('/stats/fragment-cache').data)
+        self.assertEqual((stats['entries'], stats['hits'], stats['misses']), (2, 3, 2))
+        
+        # Activité ajoutée à la liste A : son rendu est remplacé, celui de B réutilisé
+        self.client.post('/activities', json={'title': 'Nouvelle activité', 'list_id': list_a})
+        self.assertIn(b'Nouvelle activit', self.client.get('/board').data)
+        self.assertIn(b'Nouvelle activit', self.client.get(f'/list/{list_a}').data)
+        stats = json.loads(self.client.get('/stats/fragment-cache').data)
+        self.assertEqual((stats['entries'], stats['hits'], stats['misses'], stats['invalidations']),
+                         (2, 5, 3, 1))
+    
+    def test_fragment_cache_bounded_in_bytes(self):
+        """Test de l'éviction LRU et de la limite en octets du cache de fragments"""
+        cache = FragmentCache(max_bytes=10)
+        cache.put('a', Markup('aaaa'), group=1)
+        cache.put('b', Markup('bbbb'), group=2)
+        cache.get('a')
+        cache.put('c', Markup('cccc'), group=3)  # 12 octets : 'b', le moins récent, est évincé
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 'aaaa')
+        
+        cache.put('a2', Markup('éé'), group=1)  # nouvelle version du groupe 1
+        self.assertIsNone(cache.get('a'))
+        cache.put('big', Markup('x' * 11))  # plus grand que la limite : ignoré
+        self.assertIsNone(cache.get('big'))
+        
+        stats = cache.stats()
+        self.assertEqual((stats['entries'], stats['bytes'], stats['evictions'], stats['invalidations']),
+                         (2, 8, 1, 1))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,13 +2,18 @@ import unittest
 import os
 import sys
 from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import event
 
 # Ajout du chemin parent au PYTHONPATH pour pouvoir importer l'application
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app import create_app, db
-from app.models import List, Sublist, Activity
-from app.models.activity import DurationSize
+from app.models import List, Sublist, Activity, Settings, WeeklyLoad, ArchivedActivity, ActivitySearch, ListVersion
+from app.models.activity import ActivityCard, DurationSize
+from tests.db_helpers import count_commits
+from app.utils.search_utils import build_match_query, split_search_terms
 
 
 class BaseTestCase(unittest.TestCase):
@@ -70,6 +75,133 @@ class ListModelTestCase(BaseTestCase):
         # Rollback pour nettoyer la session
         db.session.rollback()
 
+    def test_delete_cascades_in_database(self):
+        """Test de la suppression d'une liste en une seule requête DELETE, sans charger son contenu"""
+        list_obj = List(name="Liste pleine")
+        db.session.add(list_obj)
+        db.session.commit()
+        sublist = Sublist(name="Sous-liste", list_id=list_obj.id)
+        db.session.add(sublist)
+        db.session.commit()
+        db.session.add_all([Activity(title=f"Activité {i}", list_id=list_obj.id,
+                                     sublist_id=sublist.id if i % 2 else 0) for i in range(50)])
+        db.session.commit()
+        list_id = list_obj.id
+        db.session.expunge_all()
+        list_obj = List.get_by_id(list_id)
+        self.assertEqual(list_obj.count_content(), {'sublists': 1, 'activities': 50,
+                                                    'archived_activities': 0})
+
+        statements = []
+        listener = lambda *args, **kwargs: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            list_obj.delete()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        deletes = [s for s in statements if s.lstrip().upper().startswith('DELETE')]
+        self.assertEqual(len(deletes), 1)
+        self.assertIn('lists', deletes[0])
+        self.assertFalse([s for s in statements if 'activities.title' in s])
+        self.assertEqual(Sublist.query.count(), 0)
+        self.assertEqual(Activity.query.count(), 0)
+
+    def test_get_with_content_groups_activities(self):
+        """Test du chargement de l'arborescence d'une liste en un nombre fixe de requêtes"""
+        list_obj = List(name="Liste Arborescence")
+        db.session.add(list_obj)
+        db.session.commit()
+
+        sublists = [Sublist(name=f"Sous-liste {i}", list_id=list_obj.id, position=i) for i in range(5)]
+        db.session.add_all(sublists)
+        db.session.commit()
+
+        for sublist in sublists:
+            db.session.add(Activity(title=f"Seconde {sublist.id}", list_id=list_obj.id,
+                                    sublist_id=sublist.id, position=2))
+            db.session.add(Activity(title=f"Première {sublist.id}", list_id=list_obj.id,
+                                    sublist_id=sublist.id, position=1))
+        db.session.add(Activity(title="Sans sous-liste", list_id=list_obj.id))
+        db.session.commit()
+        db.session.expire_all()
+
+        # Compter les requêtes émises pendant le chargement et le parcours de l'arborescence
+        statements = []
+        listener = lambda *args, **kwargs: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            _, tree_sublists, activities = List.get_with_content(list_obj.id)
+            titles = {sublist.id: [a.title for a in sublist.activities] for sublist in tree_sublists}
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        self.assertEqual(len(statements), 3)
+        self.assertEqual(len(activities), 11)
+        # La sous-liste virtuelle est en tête et contient l'activité sans sous-liste
+        self.assertEqual(tree_sublists[0].id, 0)
+        self.assertEqual(titles[0], ["Sans sous-liste"])
+        # Les activités sont triées par position dans chaque sous-liste
+        self.assertEqual(titles[sublists[0].id], [f"Première {sublists[0].id}", f"Seconde {sublists[0].id}"])
+        # Le contenu est une projection en lecture seule, pas des objets ORM
+        self.assertTrue(all(isinstance(activity, ActivityCard) for activity in activities))
+
+
+    def test_reorder_content_renumbers_every_container(self):
+        """Test de la renumérotation groupée des sous-listes et activités d'une liste"""
+        list_obj = List(name="Liste Renumérotation")
+        db.session.add(list_obj)
+        db.session.commit()
+
+        sublists = [Sublist(name=f"Sous-liste {i}", list_id=list_obj.id, position=10 * (3 - i)) for i in range(3)]
+        db.session.add_all(sublists)
+        db.session.commit()
+
+        for sublist_id in [0] + [sublist.id for sublist in sublists]:
+            db.session.add_all([Activity(title=f"{sublist_id}-{p}", list_id=list_obj.id,
+                                         sublist_id=sublist_id, position=p) for p in (7, 3, 5)])
+        db.session.commit()
+
+        self.assertTrue(List.reorder_content(list_obj.id))
+
+        self.assertEqual([s.position for s in sorted(sublists, key=lambda s: s.id)], [3, 2, 1])
+        for sublist_id in [0] + [sublist.id for sublist in sublists]:
+            activities = Activity.query.filter_by(list_id=list_obj.id, sublist_id=sublist_id).order_by(
+                Activity.position).all()
+            self.assertEqual([a.title for a in activities], [f"{sublist_id}-{p}" for p in (3, 5, 7)])
+            self.assertEqual([a.position for a in activities],
+                             [Activity.POSITION_GAP * i for i in (1, 2, 3)])
+
+    def test_catalog_cached_and_invalidated(self):
+        """Test du catalogue listes/sous-listes en cache, invalidé par les modifications"""
+        self.app.config['CATALOG_CACHE_TTL'] = None
+        list_obj = List(name="Liste Catalogue")
+        db.session.add(list_obj)
+        db.session.commit()
+        db.session.add(Activity(title="Activité", list_id=list_obj.id))
+        db.session.commit()
+
+        statements = []
+        listener = lambda *args, **kwargs: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            List.get_catalog()
+            first_load = len(statements)
+            catalog = List.get_catalog()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        self.assertEqual(len(statements), first_load)
+        self.assertFalse([s for s in statements if 'activities' in s])
+        self.assertEqual([sublist.id for sublist in catalog[0].sublists], [0])
+
+        # Une sous-liste créée invalide le catalogue au commit
+        Sublist.create("Nouvelle", list_obj.id)
+        catalog = List.get_catalog()
+        self.assertEqual([sublist.name for sublist in catalog[0].sublists], ["Aucune sous-liste", "Nouvelle"])
+
+        list_obj.update({'name': "Liste Renommée"})
+        self.assertEqual(List.get_catalog()[0].name, "Liste Renommée")
 
 class SublistModelTestCase(BaseTestCase):
     """Tests pour le modèle Sublist"""
@@ -132,6 +264,22 @@ class SublistModelTestCase(BaseTestCase):
         
         self.assertIsNotNone(sublist3.id)
 
+    def test_delete_removes_activities_by_trigger(self):
+        """Test de la suppression des activités d'une sous-liste par le déclencheur"""
+        sublist = Sublist(name="À supprimer", list_id=self.parent_list.id)
+        db.session.add(sublist)
+        db.session.commit()
+        db.session.add_all([Activity(title=f"Activité {i}", list_id=self.parent_list.id,
+                                     sublist_id=sublist.id if i < 3 else 0) for i in range(5)])
+        db.session.commit()
+        self.assertEqual(sublist.count_content()['activities'], 3)
+
+        self.assertTrue(Sublist.delete(sublist.id))
+
+        remaining = Activity.query.all()
+        self.assertEqual(len(remaining), 2)
+        self.assertTrue(all(activity.sublist_id == 0 for activity in remaining))
+
 
 class ActivityModelTestCase(BaseTestCase):
     """Tests pour le modèle Activity"""
@@ -263,6 +411,754 @@ class ActivityModelTestCase(BaseTestCase):
         # Vérifier que la date d'échéance est bien le dimanche 
         self.assertEqual(activity.due_date, expected_date)
 
+    def test_create_activity_writes_single_row(self):
+        """Test de l'insertion en tête sans renumérotation des voisines"""
+        for i in range(5):
+            Activity.create({'title': f"Activité {i}", 'list_id': self.test_list.id})
+
+        statements = []
+        listener = lambda *args, **kwargs: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            activity = Activity.create({'title': "Nouvelle", 'list_id': self.test_list.id})
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        updates = [s for s in statements if s.lstrip().upper().startswith('UPDATE')]
+        self.assertEqual(updates, [])
+        ordered = Activity.query.filter_by(list_id=self.test_list.id).order_by(Activity.position).all()
+        self.assertEqual(ordered[0].id, activity.id)
+
+    def test_create_and_duplicate_commit_once(self):
+        """Test d'un seul commit pour la création et pour la duplication"""
+        Activity.create({'title': "Existante", 'list_id': self.test_list.id})
+
+        with count_commits() as commits:
+            activity = Activity.create({'title': "Nouvelle", 'list_id': self.test_list.id})
+        self.assertEqual(len(commits), 1)
+
+        with count_commits() as commits:
+            copy = Activity.create_duplicate(activity.id)
+        self.assertEqual(len(commits), 1)
+        self.assertLess(copy.position, activity.position)
+
+    def test_apply_orderings_writes_only_moved_activities(self):
+        """Test d'un glisser-déposer d'une carte : seule l'activité déplacée est réécrite"""
+        activities = [Activity(title=f"Activité {i}", list_id=self.test_list.id,
+                               position=(i + 1) * Activity.POSITION_GAP) for i in range(50)]
+        db.session.add_all(activities)
+        db.session.commit()
+        ids = [activity.id for activity in activities]
+
+        # Carte 0 déposée entre les cartes 10 et 11 (ordre complet envoyé par le client)
+        order = ids[1:11] + ids[:1] + ids[11:]
+        self.assertEqual(Activity.apply_orderings(
+            [(self.test_list.id, 0, [db.session.get(Activity, id) for id in order])]), 1)
+
+        ordered = Activity.query.filter_by(list_id=self.test_list.id).order_by(Activity.position).all()
+        self.assertEqual([a.id for a in ordered], order)
+        moved = db.session.get(Activity, ids[0])
+        self.assertEqual(moved.position, 11 * Activity.POSITION_GAP + Activity.POSITION_GAP // 2)
+        self.assertEqual(db.session.get(Activity, ids[1]).position, 2 * Activity.POSITION_GAP)
+
+    def test_apply_orderings_renumbers_when_gap_exhausted(self):
+        """Test de la renumérotation du conteneur quand l'écart entre voisines est épuisé"""
+        activities = [Activity(title=f"Activité {i}", list_id=self.test_list.id, position=i + 1)
+                      for i in range(3)]
+        db.session.add_all(activities)
+        db.session.commit()
+        first, middle, last = [activity.id for activity in activities]
+
+        # Dernière carte déposée entre les positions 1 et 2
+        order = [first, last, middle]
+        Activity.apply_orderings([(self.test_list.id, 0, [db.session.get(Activity, id) for id in order])])
+
+        ordered = Activity.query.filter_by(list_id=self.test_list.id).order_by(Activity.position).all()
+        self.assertEqual([a.id for a in ordered], order)
+        # Les positions ont été réespacées pour laisser de la place aux déplacements suivants
+        self.assertEqual(ordered[0].position, Activity.POSITION_GAP)
+        self.assertEqual(ordered[2].position, 2 * Activity.POSITION_GAP)
+
+    def test_create_keeps_explicit_zero_position(self):
+        """Test de la conservation d'une position explicite à 0 (pas d'insertion en tête)"""
+        Activity.create({'title': "Existante", 'list_id': self.test_list.id, 'position': 5})
+        activity = Activity.create({'title': "Zéro", 'list_id': self.test_list.id, 'position': 0})
+        self.assertEqual(activity.position, 0)
+
+    def test_rebalance_failure_keeps_caller_work(self):
+        """Test de l'échec d'une renumérotation sans commit : seul le point de sauvegarde est annulé"""
+        first = Activity.create({'title': "Première", 'list_id': self.test_list.id, 'position': 1})
+        Activity.create({'title': "Dernière", 'list_id': self.test_list.id, 'position': 2})
+        first_id = first.id
+
+        # Travail en cours de l'appelant, conservé après une renumérotation réussie
+        first.title = "Première modifiée"
+        self.assertTrue(Activity.reorder_positions(self.test_list.id, 0, commit=False))
+        pending = Activity(title="En attente", list_id=self.test_list.id, position=1)
+        db.session.add(pending)
+
+        def failing_renumber(*args, **kwargs):
+            raise RuntimeError("échec simulé")
+
+        with patch('app.models.activity.renumber_positions', failing_renumber):
+            self.assertFalse(Activity.reorder_positions(self.test_list.id, 0, commit=False))
+        db.session.commit()
+
+        self.assertEqual(db.session.get(Activity, first_id).title, "Première modifiée")
+        self.assertIsNotNone(Activity.query.filter_by(title="En attente").first())
+
+    def test_reorder_positions_single_statement(self):
+        """Test de la renumérotation d'un conteneur en une seule requête UPDATE"""
+        db.session.add_all([Activity(title=f"Activité {p}", list_id=self.test_list.id,
+                                     sublist_id=self.test_sublist.id, position=p) for p in (9, 1, 4, 4)])
+        db.session.commit()
+        list_id, sublist_id = self.test_list.id, self.test_sublist.id
+
+        statements = []
+        listener = lambda *args, **kwargs: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            self.assertTrue(Activity.reorder_positions(list_id, sublist_id))
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        self.assertEqual(len(statements), 1)
+        self.assertIn('ROW_NUMBER', statements[0].upper())
+        activities = Activity.query.filter_by(sublist_id=sublist_id).order_by(Activity.position).all()
+        self.assertEqual([a.title for a in activities],
+                         ["Activité 1", "Activité 4", "Activité 4", "Activité 9"])
+        self.assertEqual([a.position for a in activities], [Activity.POSITION_GAP * i for i in range(1, 5)])
+
+    def test_create_many_statement_count(self):
+        """Test de la création groupée sans autre requête que les insertions et un nombre fixe de lectures"""
+        list_id, sublist_id = self.test_list.id, self.test_sublist.id
+        items = [{'title': f"Activité {i}", 'list_id': list_id, 'sublist_id': sublist_id if i % 2 else 0}
+                 for i in range(100)]
+
+        statements = []
+        listener = lambda *args, **kwargs: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            activities = Activity.create_many(items)
+            titles = [activity.title for activity in activities]
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        # Positions de tête, insertions (RETURNING), charge hebdomadaire, rechargement
+        inserts = [statement for statement in statements if statement.startswith('INSERT INTO activities')]
+        self.assertEqual(len(inserts), len(items))
+        self.assertEqual(len(statements) - len(inserts), 3)
+        self.assertEqual(titles, [item['title'] for item in items])
+        self.assertEqual([activity.id for activity in activities], sorted(activity.id for activity in activities))
+        ordered = Activity.query.filter_by(sublist_id=sublist_id).order_by(Activity.position).all()
+        self.assertEqual([a.title for a in ordered], [f"Activité {i}" for i in range(1, 100, 2)])
+
+
+    def test_save_skips_ownership_check_when_unchanged(self):
+        """Test de l'absence de requête sur les sous-listes quand la liste et la sous-liste n'ont pas changé"""
+        activity = Activity(title="Activité", list_id=self.test_list.id, sublist_id=self.test_sublist.id)
+        activity.save()
+        activity_id = activity.id
+        db.session.expire_all()
+        activity = Activity.get_by_id(activity_id)
+
+        statements = []
+        listener = lambda *args, **kwargs: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            activity.set_completion(True)
+            activity.save()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        self.assertFalse([statement for statement in statements if 'FROM sublists' in statement])
+
+        other_list = List(name="Autre Liste")
+        db.session.add(other_list)
+        db.session.commit()
+        activity.list_id = other_list.id
+        with self.assertRaises(ValueError):
+            activity.save()
+        db.session.rollback()
+
+    def test_ownership_validation_costs_one_query(self):
+        """Test de la validation de 1000 activités en une requête"""
+        sublists = [Sublist(name=f"Sous-liste {i}", list_id=self.test_list.id) for i in range(5)]
+        db.session.add_all(sublists)
+        db.session.commit()
+        pairs = [(self.test_list.id, sublists[i % 5].id) for i in range(1000)]
+
+        statements = []
+        listener = lambda *args, **kwargs: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            owners = Sublist.get_owners(sublist_id for _, sublist_id in pairs)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(owners, {sublist.id: self.test_list.id for sublist in sublists})
+        self.assertTrue(all(owners.get(sublist_id) == list_id for list_id, sublist_id in pairs))
+
+        # Sous-liste inconnue ou d'une autre liste
+        self.assertFalse(Activity.validate_sublist_belongs_to_list(self.test_list.id, 9999))
+        self.assertFalse(Activity.validate_sublist_belongs_to_list(self.test_list.id + 1, sublists[0].id))
+
+    def test_ownership_validation_sees_changes_from_other_processes(self):
+        """Test de la validation contre l'état courant de la base (sous-liste créée, déplacée ou supprimée ailleurs)"""
+        sublist_id = self.test_sublist.id
+        self.assertTrue(Activity.validate_sublist_belongs_to_list(self.test_list.id, sublist_id))
+
+        # Écritures d'un autre processus, sans passer par les modèles
+        other_list = List(name="Autre Liste")
+        db.session.add(other_list)
+        db.session.commit()
+        db.session.execute(db.text("INSERT INTO sublists (name, list_id, position) VALUES ('Externe', :list_id, 9)"),
+                           {'list_id': self.test_list.id})
+        external_id = db.session.execute(db.text("SELECT max(id) FROM sublists")).scalar()
+        self.assertTrue(Activity.validate_sublist_belongs_to_list(self.test_list.id, external_id))
+
+        db.session.execute(db.text("UPDATE sublists SET list_id = :list_id WHERE id = :id"),
+                           {'list_id': other_list.id, 'id': sublist_id})
+        self.assertFalse(Activity.validate_sublist_belongs_to_list(self.test_list.id, sublist_id))
+        self.assertTrue(Activity.validate_sublist_belongs_to_list(other_list.id, sublist_id))
+
+        db.session.execute(db.text("DELETE FROM sublists WHERE id = :id"), {'id': external_id})
+        self.assertFalse(Activity.validate_sublist_belongs_to_list(self.test_list.id, external_id))
+        activity = Activity(title="Orpheline", list_id=self.test_list.id, sublist_id=external_id)
+        with self.assertRaises(ValueError):
+            activity.save()
+        db.session.rollback()
+
+    def test_get_week_cards_filters_week_and_projects_columns(self):
+        """Test de la requête des objectifs de la semaine (intervalle d'échéance, colonnes de carte)"""
+        from app.controllers import ctrl_activity
+        monday = datetime(2025, 3, 10).date()
+        self.test_list.color_code = "#123456"
+        for title, due_date, is_priority in (("Avant", monday - timedelta(days=1), True),
+                                             ("Lundi", monday, False),
+                                             ("Dimanche", monday + timedelta(days=6), True),
+                                             ("Mercredi", monday + timedelta(days=2), True),
+                                             ("Après", monday + timedelta(days=7), False)):
+            db.session.add(Activity(title=title, list_id=self.test_list.id, due_date=due_date,
+                                    is_priority=is_priority, duration=DurationSize.LARGE))
+        db.session.commit()
+
+        cards = Activity.get_week_cards(monday, monday + timedelta(days=6))
+        self.assertEqual([card.title for card in cards], ["Lundi", "Mercredi", "Dimanche"])
+        self.assertEqual(cards[0].list_color, "#123456")
+        self.assertEqual(cards[0].duration, DurationSize.LARGE)
+
+        success, week = ctrl_activity.get_week_activities(monday + timedelta(days=3))
+        self.assertTrue(success)
+        self.assertEqual(week["week_start"], monday)
+        self.assertEqual([card.title for card in week["priority"]], ["Mercredi", "Dimanche"])
+        self.assertEqual([card.title for card in week["standard"]], ["Lundi"])
+
+
+    def test_get_stats_matches_python_implementation(self):
+        """Test de parité entre l'agrégation SQL et wip_utils.calculate_activities_stats"""
+        from app.utils.wip_utils import calculate_activities_stats
+        monday = datetime(2025, 3, 10).date()
+        sizes = [DurationSize.SMALL, DurationSize.MEDIUM, DurationSize.LARGE]
+        for i in range(30):
+            activity = Activity(title=f"Activité {i}", list_id=self.test_list.id,
+                                due_date=monday + timedelta(days=i % 10 - 1), duration=sizes[i % 3])
+            activity.is_completed = i % 4 == 0
+            db.session.add(activity)
+        db.session.commit()
+
+        for date_from, date_to in ((monday, monday + timedelta(days=6)),
+                                   (monday - timedelta(days=30), monday + timedelta(days=30)),
+                                   (monday + timedelta(days=100), monday + timedelta(days=106))):
+            activities = Activity.query.filter(Activity.due_date.between(date_from, date_to)).all()
+
+            statements = []
+            listener = lambda *args, **kwargs: statements.append(args[2])
+            event.listen(db.engine, 'before_cursor_execute', listener)
+            try:
+                stats = Activity.get_stats(date_from, date_to)
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', listener)
+
+            self.assertEqual(len(statements), 1)
+            self.assertEqual(stats, calculate_activities_stats(activities))
+
+
+class SettingsCacheTestCase(BaseTestCase):
+    """Tests pour le cache des paramètres"""
+
+    def _count_statements(self, accessor):
+        """Exécute une fonction et retourne (résultat, nombre de requêtes émises)"""
+        statements = []
+        listener = lambda *args, **kwargs: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            result = accessor()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        return result, len(statements)
+
+    def test_cached_read_does_no_sql(self):
+        """Test de la lecture des paramètres sans requête une fois le cache rempli"""
+        self.app.config['SETTINGS_CACHE_TTL'] = None
+        Settings.get_cached()
+
+        snapshot, count = self._count_statements(Settings.get_cached)
+        self.assertEqual(count, 0)
+        self.assertEqual(snapshot.time_unit_minutes, 30)
+
+    def test_update_invalidates_cache(self):
+        """Test de l'invalidation du cache lors d'une mise à jour"""
+        self.app.config['SETTINGS_CACHE_TTL'] = None
+        before = Settings.get_cached()
+
+        self.assertIsNotNone(Settings.update({'wip_limit': 50}))
+
+        after = Settings.get_cached()
+        self.assertEqual(after.wip_limit, 50)
+        self.assertEqual(after.version, before.version + 1)
+
+    def test_external_update_detected_by_version(self):
+        """Test de la revalidation par le compteur de version (mise à jour d'un autre processus)"""
+        self.app.config['SETTINGS_CACHE_TTL'] = 0
+        snapshot = Settings.get_cached()
+
+        # Version inchangée : une seule requête légère sur la colonne version
+        _, count = self._count_statements(Settings.get_cached)
+        self.assertEqual(count, 1)
+
+        db.session.execute(db.text("UPDATE settings SET wip_limit = 42, version = version + 1"))
+        db.session.commit()
+
+        self.assertEqual(Settings.get_cached().wip_limit, 42)
+        self.assertEqual(snapshot.wip_limit, 100)
+
+class WeeklyLoadTestCase(BaseTestCase):
+    """Tests des compteurs de charge hebdomadaire"""
+    
+    def setUp(self):
+        super().setUp()
+        self.test_list = List(name="Liste Charge")
+        db.session.add(self.test_list)
+        db.session.commit()
+        self.monday = datetime(2025, 3, 10).date()
+    
+    def assertConsistent(self):
+        """Vérifie que les compteurs correspondent aux activités"""
+        self.assertEqual(WeeklyLoad.check(), [])
+    
+    def test_counters_follow_activity_writes(self):
+        """Test de la mise à jour des compteurs à chaque écriture d'activité"""
+        list_id = self.test_list.id
+        activity = Activity.create({'title': "Activité", 'list_id': list_id,
+                                    'due_date': self.monday + timedelta(days=2),
+                                    'duration': DurationSize.MEDIUM})
+        self.assertConsistent()
+        self.assertEqual(WeeklyLoad.get_stats(self.monday)['total_time_units'], 3)
+        
+        # Changement de durée, puis d'échéance vers la semaine suivante
+        Activity.update(activity.id, {'duration': DurationSize.LARGE})
+        self.assertConsistent()
+        Activity.update(activity.id, {'due_date': self.monday + timedelta(days=7)})
+        self.assertConsistent()
+        self.assertEqual(WeeklyLoad.get_stats(self.monday)['activities_count'], 0)
+        self.assertEqual(WeeklyLoad.get_stats(self.monday + timedelta(days=9))['total_time_units'], 6)
+        
+        # Complétion sur un objet expiré (ancienne valeur non chargée)
+        db.session.expire_all()
+        activity = Activity.get_by_id(activity.id)
+        activity.is_completed = True
+        db.session.commit()
+        self.assertConsistent()
+        
+        # Création en lot puis suppression
+        Activity.create_many([{'title': f"Lot {i}", 'list_id': list_id,
+                               'due_date': self.monday + timedelta(days=i),
+                               'duration': DurationSize.SMALL} for i in range(10)])
+        self.assertConsistent()
+        self.assertTrue(Activity.delete(activity.id))
+        self.assertConsistent()
+        
+        stats = WeeklyLoad.get_stats(self.monday)
+        self.assertEqual(stats, Activity.get_stats(self.monday, self.monday + timedelta(days=6)))
+        self.assertEqual(stats['activities_count'], 7)
+    
+    def test_counters_follow_list_deletion(self):
+        """Test du retrait des activités supprimées en cascade avec leur liste"""
+        for i in range(3):
+            db.session.add(Activity(title=f"Activité {i}", list_id=self.test_list.id, due_date=self.monday))
+        db.session.commit()
+        self.assertEqual(WeeklyLoad.get_stats(self.monday)['activities_count'], 3)
+        
+        self.assertTrue(self.test_list.delete())
+        self.assertConsistent()
+        self.assertEqual(WeeklyLoad.get_stats(self.monday)['activities_count'], 0)
+    
+    def test_counters_follow_sublist_deletion(self):
+        """Test du retrait des activités supprimées avec leur sous-liste (activités non chargées)"""
+        sublist = Sublist(name="Semaine", list_id=self.test_list.id)
+        db.session.add(sublist)
+        db.session.commit()
+        for i in range(4):
+            db.session.add(Activity(title=f"Activité {i}", list_id=self.test_list.id,
+                                    sublist_id=sublist.id if i % 2 else 0,
+                                    due_date=self.monday + timedelta(days=7 * (i // 2))))
+        db.session.commit()
+        sublist_id = sublist.id
+        db.session.expunge_all()
+        
+        self.assertTrue(Sublist.delete(sublist_id))
+        self.assertConsistent()
+        self.assertEqual(WeeklyLoad.get_stats(self.monday)['activities_count'], 1)
+        self.assertEqual(WeeklyLoad.get_stats(self.monday + timedelta(days=7))['activities_count'], 1)
+    
+    def test_check_and_rebuild(self):
+        """Test de la détection d'écarts et de la reconstruction"""
+        for i in range(5):
+            db.session.add(Activity(title=f"Activité {i}", list_id=self.test_list.id,
+                                    due_date=self.monday + timedelta(days=4 * i)))
+        db.session.commit()
+        
+        db.session.execute(db.text("UPDATE weekly_load SET total_time_units = 99"))
+        db.session.execute(db.text("DELETE FROM weekly_load WHERE week_start = :week"),
+                           {'week': (self.monday + timedelta(days=7)).isoformat()})
+        db.session.commit()
+        self.assertEqual(len(WeeklyLoad.check()), 3)
+        
+        self.assertEqual(WeeklyLoad.rebuild(), 3)
+        self.assertConsistent()
+    
+    def test_get_stats_is_primary_key_lookup(self):
+        """Test de la lecture de la jauge en une seule requête sur clé primaire"""
+        db.session.add(Activity(title="Activité", list_id=self.test_list.id, due_date=self.monday))
+        db.session.commit()
+        db.session.expire_all()
+        
+        statements = []
+        listener = lambda *args, **kwargs: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            stats = WeeklyLoad.get_stats(self.monday + timedelta(days=4))
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        
+        self.assertEqual(len(statements), 1)
+        self.assertIn('weekly_load.week_start = ?', statements[0])
+        self.assertEqual(stats['total_time_units'], 1)
+
+
+class ArchiveTestCase(BaseTestCase):
+    """Tests de l'archivage des activités terminées"""
+    
+    def setUp(self):
+        super().setUp()
+        self.test_list = List(name="Liste Archive")
+        db.session.add(self.test_list)
+        db.session.commit()
+        self.test_sublist = Sublist(name="Sous-liste Archive", list_id=self.test_list.id)
+        db.session.add(self.test_sublist)
+        db.session.commit()
+        self.now = datetime(2025, 6, 2, 12, 0)
+        self.monday = datetime(2025, 3, 10).date()
+        
+        # 5 activités terminées il y a 10 semaines, 1 il y a 1 semaine, 1 en cours
+        activities = []
+        for i, weeks_ago in enumerate([10] * 5 + [1, None]):
+            activity = Activity(title=f"Activité {i}", list_id=self.test_list.id,
+                                sublist_id=self.test_sublist.id if i % 2 else 0,
+                                due_date=self.monday, duration=DurationSize.MEDIUM)
+            if weeks_ago is not None:
+                activity.set_completion(True)
+                activity.completed_at = self.now - timedelta(weeks=weeks_ago, hours=i)
+            activities.append(activity)
+        db.session.add_all(activities)
+        db.session.commit()
+    
+    def test_archive_moves_old_completed_activities_in_batches(self):
+        """Test du déplacement par lots des seules activités terminées avant la limite"""
+        with count_commits() as commits:
+            archived = ArchivedActivity.archive_completed(ArchivedActivity.cutoff(8, self.now), batch_size=2)
+        
+        self.assertEqual(archived, 5)
+        # Une transaction courte par lot
+        self.assertEqual(len(commits), 3)
+        self.assertEqual(Activity.query.count(), 2)
+        self.assertEqual(ArchivedActivity.query.count(), 5)
+        self.assertEqual(ArchivedActivity.query.filter_by(is_completed=True).count(), 5)
+        # La charge hebdomadaire ne compte plus que les activités courantes
+        self.assertEqual(WeeklyLoad.check(), [])
+        self.assertEqual(WeeklyLoad.get_stats(self.monday)['activities_count'], 2)
+        
+        # Relance : plus rien à archiver
+        self.assertEqual(ArchivedActivity.archive_completed(ArchivedActivity.cutoff(8, self.now)), 0)
+    
+    def test_reads_include_archive_only_on_request(self):
+        """Test des lectures limitées aux activités courantes sauf demande explicite"""
+        ArchivedActivity.archive_completed(ArchivedActivity.cutoff(8, self.now))
+        
+        current = Activity.get_completed()
+        self.assertEqual([entry.title for entry in current], ["Activité 5"])
+        
+        history = Activity.get_completed(include_archived=True)
+        self.assertEqual([entry.title for entry in history],
+                         ["Activité 5"] + [f"Activité {i}" for i in range(5)])
+        self.assertEqual([entry.is_archived for entry in history], [False] + [True] * 5)
+        self.assertEqual(len(Activity.get_completed(include_archived=True, limit=2)), 2)
+        
+        week_end = self.monday + timedelta(days=6)
+        self.assertEqual(Activity.get_stats(self.monday, week_end)['activities_count'], 2)
+        stats = Activity.get_stats(self.monday, week_end, include_archived=True)
+        self.assertEqual(stats['activities_count'], 7)
+        self.assertEqual(stats['total_time_units'], 21)
+        self.assertEqual(stats['completed_count'], 6)
+    
+    def test_container_deletion_removes_archived_activities(self):
+        """Test de la suppression en cascade des activités archivées"""
+        ArchivedActivity.archive_completed(ArchivedActivity.cutoff(8, self.now))
+        
+        self.assertEqual(self.test_sublist.count_content(), {'activities': 1, 'archived_activities': 2})
+        self.assertTrue(Sublist.delete(self.test_sublist.id))
+        self.assertEqual(ArchivedActivity.query.count(), 3)
+        
+        self.assertEqual(self.test_list.count_content()['archived_activities'], 3)
+        self.test_list.delete()
+        self.assertEqual(ArchivedActivity.query.count(), 0)
+
+
+class ActivitySearchTestCase(BaseTestCase):
+    """Tests de l'index plein texte des activités"""
+    
+    def setUp(self):
+        super().setUp()
+        self.test_list = List(name="Santé")
+        self.other_list = List(name="Travail")
+        db.session.add_all([self.test_list, self.other_list])
+        db.session.commit()
+        self.test_sublist = Sublist(name="Rendez-vous", list_id=self.test_list.id)
+        db.session.add(self.test_sublist)
+        db.session.commit()
+    
+    def _titles(self, text):
+        return [result.title for result in ActivitySearch.search(text)]
+    
+    def test_index_follows_activity_changes(self):
+        """Test de la synchronisation de l'index par les déclencheurs sur activities"""
+        activity = Activity(title="Appeler le médecin", list_id=self.test_list.id)
+        activity.save()
+        self.assertEqual(self._titles("medec"), ["Appeler le médecin"])
+        
+        Activity.update(activity.id, {'title': "Appeler le dentiste"})
+        self.assertEqual(self._titles("medec"), [])
+        self.assertEqual(self._titles("dent"), ["Appeler le dentiste"])
+        
+        # Changement de conteneur : le contexte indexé suit
+        self.assertEqual(self._titles("rendez"), [])
+        Activity.update(activity.id, {'sublist_id': self.test_sublist.id})
+        result = ActivitySearch.search("rendez")[0]
+        self.assertEqual((result.list_name, result.sublist_name), ("Santé", "Rendez-vous"))
+        
+        Activity.delete(activity.id)
+        self.assertEqual(self._titles("dent"), [])
+        self.assertEqual(db.session.execute(db.text("SELECT count(*) FROM activities_fts")).scalar(), 0)
+    
+    def test_index_follows_container_changes(self):
+        """Test des renommages et suppressions de listes et sous-listes"""
+        Activity(title="Vaccin", list_id=self.test_list.id, sublist_id=self.test_sublist.id).save()
+        
+        Sublist.update(self.test_sublist.id, {'name': "Consultations"})
+        self.test_list.update({'name': "Famille"})
+        self.assertEqual(self._titles("consult famil"), ["Vaccin"])
+        self.assertEqual(self._titles("rendez"), [])
+        
+        # Suppression en cascade (déclencheur trg_sublists_delete_activities)
+        Sublist.delete(self.test_sublist.id)
+        self.assertEqual(self._titles("vaccin"), [])
+    
+    def test_search_ranks_title_matches_first(self):
+        """Test du classement (titre avant liste) et du surlignage échappé"""
+        Activity(title="Bilan annuel", list_id=self.test_list.id).save()
+        Activity(title="Préparer le <bilan> santé", list_id=self.other_list.id).save()
+        
+        results = ActivitySearch.search("sante")
+        self.assertEqual([result.title for result in results],
+                         ["Préparer le <bilan> santé", "Bilan annuel"])
+        self.assertEqual(str(results[0].title_html),
+                         "Préparer le &lt;bilan&gt; <mark>santé</mark>")
+        self.assertEqual(results[1].list_name, "Santé")
+        self.assertIsNone(results[1].sublist_name)
+        self.assertEqual(len(ActivitySearch.search("bilan", limit=1)), 1)
+    
+    def test_search_input_is_not_fts_syntax(self):
+        """Test de la neutralisation de la syntaxe FTS5 dans la saisie"""
+        Activity(title="Rapport NEAR client", list_id=self.test_list.id).save()
+        
+        self.assertEqual(split_search_terms("Rapport  \"client\" OR"), ["rapport", "client", "or"])
+        self.assertEqual(build_match_query(["rapport", "a"]), '"rapport"* "a"')
+        self.assertIsNone(build_match_query(split_search_terms(' "* - () ')))
+        self.assertEqual(ActivitySearch.search(' "* - () '), [])
+        self.assertEqual(self._titles('rapport NEAR "client'), ["Rapport NEAR client"])
+        self.assertEqual(self._titles("title: rapport"), [])
+    
+    def test_rebuild_restores_index(self):
+        """Test de la reconstruction de l'index pour une base existante"""
+        Activity(title="Courses", list_id=self.test_list.id).save()
+        Activity(title="Pharmacie", list_id=self.test_list.id, sublist_id=self.test_sublist.id).save()
+        db.session.execute(db.text("DELETE FROM activities_fts"))
+        db.session.commit()
+        self.assertEqual(self._titles("courses"), [])
+        
+        self.assertEqual(ActivitySearch.rebuild(), 2)
+        self.assertEqual(self._titles("courses"), ["Courses"])
+        self.assertEqual(self._titles("rendez pharma"), ["Pharmacie"])
+
+
+class ListVersionTestCase(BaseTestCase):
+    """Tests des compteurs de version tenus par les déclencheurs SQLite"""
+    
+    def setUp(self):
+        super().setUp()
+        self.list_a = List(name="Liste A")
+        self.list_b = List(name="Liste B")
+        db.session.add_all([self.list_a, self.list_b])
+        db.session.commit()
+    
+    def _versions(self):
+        return (ListVersion.get_global(), ListVersion.get_for_list(self.list_a.id),
+                ListVersion.get_for_list(self.list_b.id))
+    
+    def test_writes_bump_only_their_list(self):
+        """Test des versions après écritures ORM, ensemblistes et déplacements"""
+        global_version, version_a, version_b = self._versions()
+        
+        activity = Activity(title="Activité", list_id=self.list_a.id)
+        activity.save()
+        after_insert = self._versions()
+        self.assertGreater(after_insert[0], global_version)
+        self.assertEqual(after_insert[1], after_insert[0])
+        self.assertEqual(after_insert[2], version_b)
+        
+        # UPDATE ensembliste, sans objet ORM : compté aussi
+        Activity.reorder_positions(self.list_a.id, 0)
+        db.session.execute(db.text("UPDATE activities SET position = 7"))
+        db.session.commit()
+        self.assertGreater(ListVersion.get_for_list(self.list_a.id), after_insert[1])
+        
+        # Déplacement : les deux listes changent
+        before_move = self._versions()
+        Activity.update(activity.id, {'list_id': self.list_b.id})
+        after_move = self._versions()
+        self.assertGreater(after_move[1], before_move[1])
+        self.assertGreater(after_move[2], before_move[2])
+    
+    def test_deleted_list_never_reuses_a_version(self):
+        """Test de la suppression de la version avec la liste, et des versions d'une liste recréée"""
+        sublist = Sublist(name="Sous-liste", list_id=self.list_b.id)
+        db.session.add(sublist)
+        db.session.commit()
+        Activity(title="Activité", list_id=self.list_b.id, sublist_id=sublist.id).save()
+        list_b_id = self.list_b.id
+        version_b = ListVersion.get_for_list(list_b_id)
+        
+        self.list_b.delete()
+        self.assertEqual(ListVersion.get_for_list(list_b_id), 0)
+        self.assertIsNone(db.session.get(ListVersion, list_b_id))
+        
+        recreated = List(name="Liste B")
+        db.session.add(recreated)
+        db.session.commit()
+        self.assertEqual(recreated.id, list_b_id)
+        self.assertGreater(ListVersion.get_for_list(list_b_id), version_b)
+
+
+class ActivityIndexTestCase(BaseTestCase):
+    """Tests de l'utilisation des index par les méthodes d'accès aux activités"""
+    
+    def setUp(self):
+        super().setUp()
+        self.test_list = List(name="Liste Index")
+        db.session.add(self.test_list)
+        db.session.commit()
+        
+        self.test_sublist = Sublist(name="Sous-liste Index", list_id=self.test_list.id)
+        db.session.add(self.test_sublist)
+        db.session.commit()
+    
+    def _query_plans(self, accessor):
+        """Exécute une méthode d'accès et retourne le plan de chacune de ses requêtes SELECT/UPDATE"""
+        statements = []
+        listener = lambda conn, cursor, statement, parameters, context, executemany: \
+            statements.append((statement, parameters))
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            accessor()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        
+        plans = []
+        for statement, parameters in statements:
+            if statement.lstrip().upper().startswith(('SELECT', 'UPDATE')):
+                rows = db.session.connection().exec_driver_sql(
+                    'EXPLAIN QUERY PLAN ' + statement, parameters
+                ).fetchall()
+                plans.append((statement, [row[-1] for row in rows]))
+        return plans
+    
+    def assertUsesIndex(self, accessor, table='activities'):
+        """Vérifie qu'aucune requête de la méthode d'accès ne parcourt la table sans index"""
+        plans = self._query_plans(accessor)
+        self.assertTrue(plans)
+        for statement, details in plans:
+            for detail in details:
+                if detail.startswith(('SCAN', 'SEARCH')) and detail.split()[1] == table:
+                    self.assertIn('USING', detail, f"Parcours complet de {table}: {statement}")
+    
+    def test_get_by_list_id_uses_index(self):
+        self.assertUsesIndex(lambda: Activity.get_by_list_id(self.test_list.id))
+    
+    def test_get_by_sublist_id_uses_index(self):
+        self.assertUsesIndex(lambda: Activity.get_by_sublist_id(self.test_sublist.id))
+    
+    def test_get_filtered_uses_index(self):
+        self.assertUsesIndex(lambda: Activity.get_filtered())
+        self.assertUsesIndex(lambda: Activity.get_filtered(list_id=self.test_list.id))
+        self.assertUsesIndex(lambda: Activity.get_filtered(is_completed=False))
+    
+    def test_reorder_positions_uses_index(self):
+        self.assertUsesIndex(lambda: Activity.reorder_positions(self.test_list.id, self.test_sublist.id))
+    
+    def test_get_week_cards_uses_index(self):
+        today = datetime.now().date()
+        self.assertUsesIndex(lambda: Activity.get_week_cards(today, today + timedelta(days=6)))
+
+    def test_get_page_uses_index(self):
+        after = (datetime.now().date(), 3, 42)
+        self.assertUsesIndex(lambda: Activity.get_page(after=after, limit=10))
+        self.assertUsesIndex(lambda: Activity.get_page(is_completed=False, after=after, limit=10))
+        # L'ordre de l'index suffit : pas de tri de toutes les lignes restantes à chaque page
+        for list_id in (None, self.test_list.id):
+            for _, details in self._query_plans(lambda: Activity.get_page(list_id=list_id, after=after)):
+                self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', details)
+
+    def test_get_stats_uses_index(self):
+        today = datetime.now().date()
+        self.assertUsesIndex(lambda: Activity.get_stats(today, today + timedelta(days=6)))
+
+    def test_archive_reads_use_index(self):
+        cutoff = datetime.now() - timedelta(weeks=8)
+        self.assertUsesIndex(lambda: ArchivedActivity.archive_completed(cutoff))
+        for include_archived in (False, True):
+            for table in ('activities', 'archived_activities'):
+                self.assertUsesIndex(lambda: Activity.get_completed(include_archived=include_archived),
+                                     table=table)
+                self.assertUsesIndex(lambda: Activity.get_completed(list_id=self.test_list.id,
+                                                                    include_archived=include_archived),
+                                     table=table)
+
+    def test_list_content_uses_index(self):
+        self.assertUsesIndex(lambda: List.get_with_content(self.test_list.id))
+        self.assertUsesIndex(lambda: List.get_with_content(self.test_list.id), table='sublists')
+
 
 if __name__ == '__main__':
     unittest.main()
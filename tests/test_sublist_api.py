@@ -7,7 +7,7 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app import create_app, db
-from app.models import List, Sublist
+from app.models import List, Sublist, Activity
 
 
 class SublistAPITestCase(unittest.TestCase):
@@ -222,6 +222,64 @@ class SublistAPITestCase(unittest.TestCase):
         response = self.client.get(f'/api/sublists/{sublist_id}')
         self.assertEqual(response.status_code, 404)
 
+    def test_delete_sublist_reports_removed_rows(self):
+        """Test du nombre d'activités supprimées avec la sous-liste"""
+        sublist = Sublist(name="Sous-liste pleine", list_id=self.parent_list_id)
+        db.session.add(sublist)
+        db.session.commit()
+        db.session.add_all([Activity(title=f"Activité {i}", list_id=self.parent_list_id,
+                                     sublist_id=sublist.id if i < 3 else 0) for i in range(4)])
+        db.session.commit()
+        
+        response = self.client.delete(f'/sublists/{sublist.id}')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['deleted'], {'sublists': 1, 'activities': 3, 'archived_activities': 0})
+        self.assertEqual(Activity.query.count(), 1)
+
+    
+    def test_htmx_mutations_return_out_of_band_fragments(self):
+        """Test des fragments hx-swap-oob renvoyés aux requêtes HTMX de modification"""
+        htmx = {'HX-Request': 'true'}
+        first = Sublist(name="Première", list_id=self.parent_list_id, position=1)
+        db.session.add(first)
+        db.session.commit()
+        db.session.add(Activity(title="Dans la première", list_id=self.parent_list_id,
+                                sublist_id=first.id))
+        db.session.commit()
+        
+        # Création : conteneur inséré après la dernière sous-liste affichée avant lui
+        response = self.client.post('/sublists', headers=htmx, data={
+            'name': 'Seconde', 'list_id': self.parent_list_id, 'position': 2})
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('HX-Trigger', response.headers)
+        second = Sublist.query.filter_by(name='Seconde').one()
+        html = response.get_data(as_text=True)
+        self.assertIn(f'hx-swap-oob="afterend:#sublist-{self.parent_list_id}-{first.id}"', html)
+        self.assertIn(f'id="sublist-{self.parent_list_id}-{second.id}"', html)
+        
+        # Renommage : en-tête seul
+        response = self.client.post(f'/sublists/{second.id}', headers=htmx, data={
+            'name': 'Renommée', 'list_id': self.parent_list_id})
+        html = response.get_data(as_text=True)
+        self.assertIn(f'id="sublist-header-{second.id}"', html)
+        self.assertIn('hx-swap-oob="true"', html)
+        self.assertIn('Renommée', html)
+        self.assertNotIn('sublist-container', html)
+        
+        # Déplacement en fin de liste : conteneur retiré puis réinséré avec ses activités
+        response = self.client.post(f'/sublists/{first.id}', headers=htmx, data={
+            'name': 'Première', 'position': 3})
+        html = response.get_data(as_text=True)
+        self.assertIn(f'id="sublist-{self.parent_list_id}-{first.id}" hx-swap-oob="delete"', html)
+        self.assertIn(f'hx-swap-oob="afterend:#sublist-{self.parent_list_id}-{second.id}"', html)
+        self.assertIn('Dans la première', html)
+        
+        # Suppression : conteneur retiré
+        response = self.client.delete(f'/sublists/{first.id}', headers=htmx)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f'id="sublist-{self.parent_list_id}-{first.id}" hx-swap-oob="delete"',
+                      response.get_data(as_text=True))
 
 if __name__ == '__main__':
     unittest.main()